@@ -0,0 +1,168 @@
+"""Offline batch transcription of recorded sign-language sessions.
+
+Every video in a directory is decoded in a process pool (one MediaPipe Hands
+graph per worker process). Frames are mirrored like the live app, landmarks
+are collected into one (T, 21, 3) array per file and classified in a single
+vectorized pass (awaz_gestures, same rules as awaz_ai.detect_gesture).
+
+Output per video in --out:
+    <name>.<hash8>.jsonl   one line per gesture segment:
+                           {"start": 1.23, "end": 2.10, "gesture": "HELLO", "frames": 27}
+    <name>.<hash8>.npy     the landmark trace (with --keep-landmarks)
+    manifest.json          sha256 of every processed video -> its transcript;
+                           files already in it are skipped on the next run
+
+Videos are hashed before dispatch, so byte-identical copies within one run
+are transcribed once too.
+
+    python awaz_batch.py recordings/ --out transcripts/ --workers 8
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+import numpy as np
+
+import awaz_gestures as gestures
+from awaz_ai import HANDS_OPTIONS
+from vision_kit import models
+
+VIDEO_EXTS = (".mp4", ".avi", ".mov", ".mkv", ".webm")
+MANIFEST = "manifest.json"
+
+_hands = None # One graph per worker process
+
+# ==========================================
+# FILES & MANIFEST
+# ==========================================
+def find_videos(root):
+    found = []
+    for dirpath, _, names in os.walk(root):
+        found += [os.path.join(dirpath, n) for n in names if n.lower().endswith(VIDEO_EXTS)]
+    return sorted(found)
+
+def file_hash(path, block=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(block), b""): h.update(chunk)
+    return h.hexdigest()
+
+def load_manifest(out_dir):
+    path = os.path.join(out_dir, MANIFEST)
+    if not os.path.exists(path): return {}
+    with open(path) as f: return json.load(f)
+
+def save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST)
+    with open(path + ".tmp", "w") as f: json.dump(manifest, f, indent=1)
+    os.replace(path + ".tmp", path)
+
+def write_atomic(path, write):
+    tmp = path + ".tmp"
+    write(tmp)
+    os.replace(tmp, path)
+
+# ==========================================
+# TRANSCRIPTION
+# ==========================================
+def segments(ids, fps):
+    # Runs of the same gesture id -> transcript rows (no hand / "..." are skipped)
+    if not len(ids): return []
+    edges = np.flatnonzero(np.diff(ids)) + 1
+    starts = np.concatenate([[0], edges])
+    ends = np.concatenate([edges, [len(ids)]])
+    return [{"start": round(s / fps, 3), "end": round(e / fps, 3),
+             "gesture": gestures.LABELS[ids[s]], "frames": int(e - s)}
+            for s, e in zip(starts, ends) if ids[s] > 0]
+
+def extract_landmarks(path):
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    rows = []
+    while True:
+        success, img = cap.read()
+        if not success: break
+        img = cv2.flip(img, 1) # Mirror view, as in the live app
+        results = _hands.process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+        if results.multi_hand_landmarks:
+            rows.append(gestures.to_array([results.multi_hand_landmarks[0].landmark])[0])
+        else:
+            rows.append(np.full((21, 3), np.nan, np.float32))
+    cap.release()
+    trace = np.stack(rows) if rows else np.zeros((0, 21, 3), np.float32)
+    return trace, fps
+
+def init_worker():
+    global _hands
+    _hands = models.new("hands", **HANDS_OPTIONS)
+
+def transcribe(path, digest, out_dir, keep_landmarks=False):
+    # digest: file_hash(path), computed by the caller to skip known content
+    t0 = time.perf_counter()
+    trace, fps = extract_landmarks(path)
+    rows = segments(gestures.classify_ids(trace), fps)
+    elapsed = time.perf_counter() - t0
+
+    stem = f"{os.path.splitext(os.path.basename(path))[0]}.{digest[:8]}"
+    def write_jsonl(tmp):
+        with open(tmp, "w") as f:
+            for row in rows: f.write(json.dumps(row) + "\n")
+    write_atomic(os.path.join(out_dir, stem + ".jsonl"), write_jsonl)
+    if keep_landmarks:
+        def write_npy(tmp):
+            with open(tmp, "wb") as f: np.save(f, trace) # np.save(path) would append ".npy"
+        write_atomic(os.path.join(out_dir, stem + ".npy"), write_npy)
+
+    return {"source": path, "hash": digest, "transcript": stem + ".jsonl",
+            "frames": len(trace), "fps": fps, "segments": len(rows),
+            "seconds": elapsed, "pid": os.getpid()}
+
+# ==========================================
+# CLI
+# ==========================================
+def main():
+    ap = argparse.ArgumentParser(description="Transcribe a directory of sign-language videos.")
+    ap.add_argument("videos", help="directory of recordings")
+    ap.add_argument("--out", default="transcripts", help="output directory")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--keep-landmarks", action="store_true", help="also save each landmark trace (.npy)")
+    args = ap.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    manifest = load_manifest(args.out)
+    videos = find_videos(args.videos)
+    print(f"{len(videos)} videos, {len(manifest)} already in the manifest, {args.workers} workers")
+
+    per_worker = {} # pid -> [frames, seconds]
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers, initializer=init_worker) as pool:
+        jobs, seen = [], set(manifest) # Hashes done before or already dispatched in this run
+        for v in videos:
+            digest = file_hash(v)
+            if digest in seen:
+                print(f"skip  {v}")
+                continue
+            seen.add(digest)
+            jobs.append(pool.submit(transcribe, v, digest, args.out, args.keep_landmarks))
+        for job in as_completed(jobs):
+            r = job.result()
+            manifest[r["hash"]] = {k: r[k] for k in ("source", "transcript", "frames", "segments")}
+            save_manifest(args.out, manifest)
+            stat = per_worker.setdefault(r["pid"], [0, 0.0])
+            stat[0] += r["frames"]
+            stat[1] += r["seconds"]
+            print(f"done  {r['source']}: {r['frames']} frames, {r['segments']} segments, "
+                  f"{r['frames'] / max(r['seconds'], 1e-9):.1f} fps")
+
+    wall = time.perf_counter() - start
+    total = sum(f for f, _ in per_worker.values())
+    for pid, (frames, seconds) in sorted(per_worker.items()):
+        print(f"worker {pid:<7} {frames:>8} frames  {frames / max(seconds, 1e-9):7.1f} fps")
+    print(f"total {total} frames in {wall:.1f} s ({total / max(wall, 1e-9):.1f} fps across {len(per_worker)} workers)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Vectorized gesture engine for Awaz AI.
+
+Landmarks for many hands (or many frames) are packed into one contiguous
+float32 array of shape (N, 21, 3). Finger states for the whole batch come
+from a handful of array comparisons, are packed into a 5-bit mask per hand
+(thumb is the high bit, read left to right like the old `fingers` lists)
+and looked up in a precomputed 32-entry table.
+
+    arr = to_array([lms.landmark for lms in results.multi_hand_landmarks])
+    words = classify(arr)
+
+A single live hand is cheaper to classify straight from its landmark objects
+(gesture_id): the same mask and table, without building an array.
+
+Whole recorded sessions (.npy, (T, 21, 3), NaN rows = no hand) are
+classified offline with classify_session().
+"""
+import numpy as np
+
+NO_GESTURE = "..."
+NO_HAND = -1
+
+# Finger states (thumb, index, middle, ring, pinky) -> word, as in detect_gesture
+GESTURES = {
+    (0, 1, 1, 0, 0): "VICTORY / PEACE",
+    (1, 1, 1, 1, 1): "HELLO",
+    (1, 0, 0, 0, 0): "YES / OK",
+    (0, 0, 0, 0, 0): "NO / STOP",
+    (1, 1, 0, 0, 1): "I LOVE YOU", # Rock sign + Thumb
+    (0, 1, 0, 0, 0): "ONE",
+}
+
+TIPS = np.array([4, 8, 12, 16, 20])
+JOINTS = np.array([3, 6, 10, 14, 18]) # Thumb IP, then the PIP joints
+
+def mask_of(fingers):
+    m = 0
+    for f in fingers: m = (m << 1) | int(f)
+    return m
+
+# LABELS[TABLE[mask]] is the word for a finger mask
+LABELS = np.array([NO_GESTURE] + list(GESTURES.values()), dtype=object)
+TABLE = np.zeros(32, np.int8)
+for i, fingers in enumerate(GESTURES, start=1):
+    TABLE[mask_of(fingers)] = i
+TABLE_IDS = tuple(TABLE.tolist()) # Plain ints for the scalar path
+
+# ==========================================
+# LANDMARKS -> ARRAYS
+# ==========================================
+def to_array(hands):
+    # hands: sequence of MediaPipe landmark lists (lms.landmark) -> (N, 21, 3)
+    out = np.empty((len(hands), 21, 3), np.float32)
+    for i, lm in enumerate(hands):
+        out[i] = [(p.x, p.y, p.z) for p in lm]
+    return out
+
+# ==========================================
+# CLASSIFICATION
+# ==========================================
+def gesture_id(lm):
+    # One hand of landmark objects (lms.landmark) -> id into LABELS
+    m = ((lm[4].x < lm[3].x) << 4 | (lm[8].y < lm[6].y) << 3 | (lm[12].y < lm[10].y) << 2
+         | (lm[16].y < lm[14].y) << 1 | (lm[20].y < lm[18].y))
+    return TABLE_IDS[m]
+
+def finger_states(arr):
+    # (N, 21, 3) -> (N, 5) bool, True = finger open
+    tips = arr[:, TIPS]
+    joints = arr[:, JOINTS]
+    states = tips[:, :, 1] < joints[:, :, 1] # Fingers: tip above the PIP joint
+    states[:, 0] = tips[:, 0, 0] < joints[:, 0, 0] # Thumb: simple check for right hand
+    return states
+
+def finger_masks(arr):
+    # (N, 21, 3) -> (N,) uint8 in [0, 31]
+    return np.packbits(finger_states(arr), axis=1, bitorder="big")[:, 0] >> 3
+
+def classify_ids(arr):
+    # Gesture ids into LABELS; NO_HAND where a row is NaN (no hand that frame)
+    ids = TABLE[finger_masks(arr)]
+    missing = np.isnan(arr[:, 0, 0])
+    if missing.any(): ids[missing] = NO_HAND
+    return ids
+
+def classify(arr):
+    ids = classify_ids(arr)
+    words = LABELS[np.maximum(ids, 0)]
+    words[ids == NO_HAND] = None
+    return words
+
+def classify_session(path, chunk=1 << 16):
+    # Gesture ids for a whole recording, streamed through a memory map
+    trace = np.load(path, mmap_mode="r")
+    ids = np.empty(len(trace), np.int8)
+    for start in range(0, len(trace), chunk):
+        ids[start:start + chunk] = classify_ids(np.asarray(trace[start:start + chunk], np.float32))
+    return ids
@@ -0,0 +1,125 @@
+"""Non-blocking speech for Awaz AI.
+
+A Speaker thread owns the pyttsx3 engine (pyttsx3 must be driven from the
+thread that created it). The video loop only calls say(), which enqueues the
+phrase and returns at once, so frame time stays flat while speaking.
+
+- Priorities: SYSTEM messages are spoken before GESTURE words.
+- Dedup: a phrase already queued or being spoken is not queued again.
+- Stale drop: a new gesture replaces any gesture words still waiting.
+- Cache: the fixed gesture vocabulary is synthesised once to .wav files
+  (pyttsx3 save_to_file) and replayed through sounddevice, so repeats have
+  no synthesis latency. Without sounddevice, phrases go through engine.say.
+
+    speaker = Speaker(vocabulary=awaz_gestures.GESTURES.values())
+    speaker.start()
+    speaker.say("HELLO")
+"""
+import hashlib
+import heapq
+import itertools
+import os
+import tempfile
+import threading
+import time
+import wave
+
+import numpy as np
+
+try:
+    import sounddevice
+except (ImportError, OSError): # Optional: cached playback (OSError = no PortAudio)
+    sounddevice = None
+
+SYSTEM, GESTURE = 0, 1 # Lower value = spoken first
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "awaz_tts")
+
+def load_wav(path):
+    with wave.open(path, "rb") as w:
+        data = np.frombuffer(w.readframes(w.getnframes()), np.int16)
+        return data.reshape(-1, w.getnchannels()), w.getframerate()
+
+class Speaker(threading.Thread):
+    def __init__(self, rate=150, vocabulary=(), cache_dir=CACHE_DIR):
+        super().__init__(daemon=True)
+        self.rate = rate
+        self.vocabulary = list(vocabulary)
+        self.cache_dir = cache_dir
+        self.clips = {} # phrase -> (samples, sample_rate)
+        self.queue = [] # heap of (priority, seq, phrase, enqueued_at)
+        self.seq = itertools.count()
+        self.cond = threading.Condition()
+        self.current = None
+        self.running = True
+        self.dropped = 0
+        self.latency_ms = [] # enqueue -> start of playback
+
+    # ---- called from the video loop ----
+    def say(self, phrase, priority=GESTURE, replace=True):
+        with self.cond:
+            if phrase == self.current or any(p == phrase for _, _, p, _ in self.queue):
+                return False
+            if replace and priority == GESTURE:
+                keep = [q for q in self.queue if q[0] != GESTURE]
+                self.dropped += len(self.queue) - len(keep)
+                self.queue = keep
+                heapq.heapify(self.queue)
+            heapq.heappush(self.queue, (priority, next(self.seq), phrase, time.perf_counter()))
+            self.cond.notify()
+            return True
+
+    @property
+    def busy(self):
+        return self.current is not None
+
+    def close(self, timeout=2):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+        self.join(timeout)
+
+    # ---- worker thread ----
+    def _cache_path(self, phrase):
+        key = hashlib.sha1(f"{self.rate}:{phrase}".encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, key + ".wav")
+
+    def _warm_cache(self, engine):
+        # Synthesise missing vocabulary clips in one runAndWait, then load all
+        os.makedirs(self.cache_dir, exist_ok=True)
+        missing = [p for p in self.vocabulary if not os.path.exists(self._cache_path(p))]
+        for phrase in missing: engine.save_to_file(phrase, self._cache_path(phrase))
+        if missing: engine.runAndWait()
+        for phrase in self.vocabulary:
+            try: self.clips[phrase] = load_wav(self._cache_path(phrase))
+            except (OSError, EOFError, wave.Error): pass # Engine wrote another format; fall back to say()
+
+    def run(self):
+        import pyttsx3 # Text to Speech Library
+        engine = pyttsx3.init()
+        engine.setProperty('rate', self.rate) # Speed of speech
+        if sounddevice is not None and self.vocabulary: self._warm_cache(engine)
+
+        while True:
+            with self.cond:
+                while self.running and not self.queue: self.cond.wait()
+                if not self.running: break
+                _, _, phrase, queued_at = heapq.heappop(self.queue)
+                self.current = phrase
+            self.latency_ms.append((time.perf_counter() - queued_at) * 1000)
+
+            clip = self.clips.get(phrase)
+            if clip is not None:
+                sounddevice.play(*clip)
+                sounddevice.wait()
+            else:
+                engine.say(phrase)
+                engine.runAndWait()
+
+            with self.cond: self.current = None
+
+    def stats(self):
+        lat = np.asarray(self.latency_ms)
+        return {
+            "spoken": int(lat.size), "dropped": self.dropped, "cached": len(self.clips),
+            "p50_start_ms": float(np.percentile(lat, 50)) if lat.size else 0.0,
+        }
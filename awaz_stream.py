@@ -0,0 +1,131 @@
+"""Streaming gesture recognizer for Awaz AI.
+
+Per-frame classification flickers between "..." and a real sign. GestureStream
+keeps the last `window` hands (landmark lists as MediaPipe returns them; packed
+into an array only when history() is asked for) in a fixed ring buffer together
+with their gesture ids and a running vote count per id, so each frame only adds
+the new vote and removes the one falling out of the window (O(1) per frame,
+O(1) memory in session length). A word is emitted when a gesture wins a majority of
+the window and differs from the current stable sign.
+
+Multi-frame signs are tracked incrementally from the newest frame only:
+WAVE is an open palm whose wrist changes horizontal direction `wave_reversals`
+times within `wave_span` seconds.
+
+Latency from gesture onset (first frame the sign was seen) to the emitted word
+is recorded for every emission; see stats().
+
+    stream = GestureStream()
+    for word in stream.push(lms.landmark, time.time()): speaker.say(word)
+"""
+from collections import deque
+
+import numpy as np
+
+import awaz_gestures as gestures
+
+WAVE = "WAVE"
+OPEN_PALM = gestures.LABELS.tolist().index("HELLO")
+
+class GestureStream:
+    def __init__(self, window=7, min_votes=None, wave_reversals=3, wave_span=1.5, wave_amp=0.04):
+        self.window = window
+        self.min_votes = min_votes or window // 2 + 1
+        self.hands = [None] * window
+        self.ids = np.full(window, gestures.NO_HAND, np.int8)
+        # One slot per label plus a last slot for NO_HAND (-1 indexes it directly)
+        self.counts = np.zeros(len(gestures.LABELS) + 1, np.int32)
+        self.counts[gestures.NO_HAND] = window
+        self.head = 0
+        self.frames = 0
+        self.stable = gestures.NO_HAND
+        self.onset = {} # gesture id -> time it was first seen in the window
+        self.latency_ms = deque(maxlen=256)
+
+        self.wave_reversals = wave_reversals
+        self.wave_span = wave_span
+        self.wave_amp = wave_amp
+        self._reset_wave()
+
+    @property
+    def word(self):
+        # Current stable sign, or None while no hand / no sign is held
+        return gestures.LABELS[self.stable] if self.stable > 0 else None
+
+    def push(self, hand, now):
+        # hand: landmark list of the tracked hand, or None. Returns emitted words.
+        emitted = []
+        if hand is None:
+            gid = gestures.NO_HAND
+        else:
+            gid = gestures.gesture_id(hand) # Scalar path: one hand per frame
+            if self._update_wave(hand, gid, now): emitted.append(WAVE)
+
+        # 1. Ring buffer + running vote (one vote in, one vote out)
+        old = self.ids[self.head]
+        self.counts[old] -= 1
+        if self.counts[old] == 0: self.onset.pop(int(old), None)
+        self.counts[gid] += 1
+        self.ids[self.head] = gid
+        self.hands[self.head] = hand
+        self.head = (self.head + 1) % self.window
+        self.frames += 1
+        self.onset.setdefault(gid, now)
+
+        # 2. Majority decision
+        winner = int(np.argmax(self.counts))
+        if winner == len(self.counts) - 1: winner = gestures.NO_HAND
+        if self.counts[winner] >= self.min_votes and winner != self.stable:
+            self.stable = winner
+            if winner > 0:
+                emitted.append(gestures.LABELS[winner])
+                self.latency_ms.append((now - self.onset[winner]) * 1000)
+        return emitted
+
+    def history(self):
+        # (window, 21, 3) landmarks, oldest first (NaN rows = no hand)
+        out = np.full((self.window, 21, 3), np.nan, np.float32)
+        for i in range(self.window):
+            hand = self.hands[(self.head + i) % self.window]
+            if hand is not None: out[i] = gestures.to_array([hand])[0]
+        return out
+
+    # ---- motion signs ----
+    def _reset_wave(self):
+        self.wave_anchor = None # Extreme wrist x in the current direction
+        self.wave_dir = 0
+        self.wave_start = None
+        self.wave_turns = deque(maxlen=self.wave_reversals)
+
+    def _update_wave(self, hand, gid, now):
+        if gid != OPEN_PALM:
+            self._reset_wave()
+            return False
+        x = hand[0].x # Wrist
+        if self.wave_anchor is None:
+            self.wave_anchor = x
+            return False
+
+        dx = x - self.wave_anchor
+        if abs(dx) > self.wave_amp and (self.wave_dir == 0 or (dx > 0) != (self.wave_dir > 0)):
+            if self.wave_dir != 0: self.wave_turns.append(now)
+            elif self.wave_start is None: self.wave_start = now
+            self.wave_dir = 1 if dx > 0 else -1
+            self.wave_anchor = x
+        elif self.wave_dir > 0: self.wave_anchor = max(self.wave_anchor, x)
+        elif self.wave_dir < 0: self.wave_anchor = min(self.wave_anchor, x)
+
+        turns = self.wave_turns
+        if len(turns) == turns.maxlen and now - turns[0] <= self.wave_span:
+            self.latency_ms.append((now - self.wave_start) * 1000)
+            self._reset_wave()
+            return True
+        return False
+
+    def stats(self):
+        lat = np.asarray(self.latency_ms)
+        return {
+            "frames": self.frames, "emitted": int(lat.size),
+            "p50_latency_ms": float(np.percentile(lat, 50)) if lat.size else 0.0,
+            "p99_latency_ms": float(np.percentile(lat, 99)) if lat.size else 0.0,
+        }
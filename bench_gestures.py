@@ -0,0 +1,63 @@
+"""Microbenchmark: awaz_ai.detect_gesture vs the vectorized awaz_gestures engine.
+
+Random hands are generated once, both as MediaPipe-style landmark objects
+(for the current per-hand function) and as a (N, 21, 3) array. The engine is
+timed on the packed array alone and with the landmark -> array conversion
+included, and the scalar gesture_id (the live single-hand path) per hand; all
+labels are checked against detect_gesture.
+
+    python bench_gestures.py --hands 20000
+"""
+import argparse
+import time
+from collections import namedtuple
+
+import numpy as np
+
+import awaz_ai
+import awaz_gestures as gestures
+
+Point = namedtuple("Point", "x y z")
+
+def random_hands(n, seed=0):
+    rng = np.random.default_rng(seed)
+    arr = rng.random((n, 21, 3), dtype=np.float32)
+    objs = [[Point(*map(float, p)) for p in hand] for hand in arr]
+    return arr, objs
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--hands", type=int, default=20000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    arr, objs = random_hands(args.hands)
+
+    legacy = [awaz_ai.detect_gesture(lm) for lm in objs]
+    engine = gestures.classify(arr).tolist()
+    scalar = [gestures.LABELS[gestures.gesture_id(lm)] for lm in objs]
+    mismatches = sum(a != b for a, b in zip(legacy, engine)) + sum(a != b for a, b in zip(legacy, scalar))
+
+    t_legacy = best_of(lambda: [awaz_ai.detect_gesture(lm) for lm in objs], args.repeat)
+    t_engine = best_of(lambda: gestures.classify(arr), args.repeat)
+    t_convert = best_of(lambda: gestures.classify(gestures.to_array(objs)), args.repeat)
+    t_scalar = best_of(lambda: [gestures.gesture_id(lm) for lm in objs], args.repeat)
+
+    n = args.hands
+    print(f"{n} hands, best of {args.repeat}")
+    print(f"detect_gesture (per hand)   {t_legacy / n * 1e6:8.3f} us/hand")
+    print(f"classify (packed array)     {t_engine / n * 1e6:8.3f} us/hand  x{t_legacy / t_engine:6.1f}")
+    print(f"to_array + classify         {t_convert / n * 1e6:8.3f} us/hand  x{t_legacy / t_convert:6.1f}")
+    print(f"gesture_id (live, 1 hand)   {t_scalar / n * 1e6:8.3f} us/hand  x{t_legacy / t_scalar:6.1f}")
+    print(f"label mismatches: {mismatches}")
+
+if __name__ == "__main__":
+    main()
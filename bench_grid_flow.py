@@ -0,0 +1,62 @@
+"""grid_flow.Network benchmark at 10, 1k and 10k buses.
+
+Synthetic grids: a ring of buses plus random chords (meshed like a real
+transmission network), a third of the buses generating and the rest loads.
+Reported per size:
+    tick      step() with an unchanged topology (cached factorisation)
+    retopo    step() right after a breaker toggles (islands + refactorisation)
+
+    python bench_grid_flow.py --ticks 200
+"""
+import argparse
+import time
+
+import numpy as np
+
+from grid_flow import Network
+
+def synthetic_grid(n, seed=0):
+    rng = np.random.default_rng(seed)
+    ring = np.stack([np.arange(n), (np.arange(n) + 1) % n], axis=1)
+    chords = rng.integers(0, n, (n // 2, 2))
+    chords = chords[chords[:, 0] != chords[:, 1]]
+    branches = np.concatenate([ring, chords])
+    p = -rng.uniform(5, 50, n)
+    gens = rng.random(n) < 1 / 3
+    gens[0] = True # At least one generator, even at 10 buses
+    p[gens] = rng.uniform(50, 150, gens.sum())
+    p[gens] *= -p[~gens].sum() / p[gens].sum() # Generation matches demand
+    return branches, p
+
+def bench(n, ticks):
+    branches, p = synthetic_grid(n)
+    net = Network(n, branches, rating=500.0, seed=0)
+    on = np.ones(len(branches), bool)
+    net.step(p, on) # First factorisation
+
+    t0 = time.perf_counter()
+    for _ in range(ticks): net.step(p, on)
+    tick = (time.perf_counter() - t0) / ticks
+
+    rng = np.random.default_rng(1)
+    retopo_ticks = max(1, ticks // 10)
+    t0 = time.perf_counter()
+    for _ in range(retopo_ticks):
+        on[rng.integers(len(on))] ^= True
+        net.step(p, on)
+    retopo = (time.perf_counter() - t0) / retopo_ticks
+    return tick, retopo, net
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--ticks", type=int, default=200)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 10000])
+    args = ap.parse_args()
+
+    print(f"{'buses':>7} {'branches':>9} {'tick':>10} {'retopo':>10} {'max tick Hz':>12} {'islands':>8}")
+    for n in args.sizes:
+        tick, retopo, net = bench(n, args.ticks)
+        print(f"{n:>7} {len(net.f):>9} {tick*1e3:>7.3f} ms {retopo*1e3:>7.3f} ms {1/tick:>12.0f} {net.n_islands:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""grid_master node state benchmark: one object per node vs NodeTable arrays.
+
+Builds N nodes both ways and runs the per-tick node work GridMaster does:
+    injections   MW per bus (generation +, demand -, 0 when off)
+    heat         thermal update toward ambient + MW carried
+    colors       colour selection for drawing
+Reported: memory per node (tracemalloc; the name strings are shared by both
+layouts and not counted) and time per tick.
+
+    python bench_grid_nodes.py --nodes 100000 --ticks 20
+"""
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from grid_master import NodeTable, NODE_COLORS, C_LINE_OFF, C_ACCENT, C_LINE_ON, AMBIENT, HEAT_PER_MW, THERMAL_RATE, node_colors
+
+# Reference: the per-instance __dict__ Node that grid_master used before NodeTable
+class ObjectNode:
+    def __init__(self, name, x, y, type, mw, critical=False):
+        self.name = name
+        self.pos = (x, y)
+        self.type = type
+        self.mw = mw
+        self.active = True
+        self.critical = critical
+        self.temp = AMBIENT
+
+def object_tick(nodes):
+    p = [(n.mw if n.type == "GEN" else -n.mw) if n.active else 0 for n in nodes]
+    for n in nodes:
+        target = AMBIENT + HEAT_PER_MW * n.mw * n.active
+        n.temp += (target - n.temp) * THERMAL_RATE
+    cols = []
+    for n in nodes:
+        col = C_LINE_OFF
+        if n.active:
+            col = C_ACCENT if n.type == "GEN" else C_LINE_ON
+            if n.type == "LOAD" and n.critical: col = (255, 50, 255)
+        cols.append(col)
+    return p, cols
+
+def table_tick(table):
+    p = table.injections()
+    table.heat()
+    cols = node_colors(table)
+    return p, cols
+
+def synthetic_rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    gen = rng.random(n) < 1 / 3
+    crit = ~gen & (rng.random(n) < 0.05)
+    xs, ys = rng.integers(0, 1280, n).tolist(), rng.integers(0, 720, n).tolist()
+    mw = rng.integers(10, 150, n).tolist()
+    return [(f"Node {i}", xs[i], ys[i], "GEN" if gen[i] else "LOAD", mw[i], bool(crit[i])) for i in range(n)]
+
+def measure(build):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return obj, size
+
+def timed(fn, arg, ticks):
+    fn(arg)
+    t0 = time.perf_counter()
+    for _ in range(ticks): fn(arg)
+    return (time.perf_counter() - t0) / ticks
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--nodes", type=int, default=100000)
+    ap.add_argument("--ticks", type=int, default=20)
+    args = ap.parse_args()
+
+    rows = synthetic_rows(args.nodes)
+    objects, obj_bytes = measure(lambda: [ObjectNode(*r) for r in rows])
+    table, table_bytes = measure(lambda: NodeTable.from_rows(rows))
+
+    # Same answers both ways
+    p_obj, c_obj = object_tick(objects)
+    p_tab, c_tab = table_tick(table)
+    assert np.allclose(p_obj, p_tab)
+    assert [NODE_COLORS[c] for c in c_tab.tolist()] == c_obj
+    assert np.allclose([n.temp for n in objects], table.temp, atol=1e-3)
+
+    t_obj = timed(object_tick, objects, args.ticks)
+    t_tab = timed(table_tick, table, args.ticks)
+
+    n = args.nodes
+    print(f"{n} nodes")
+    print(f"{'':<10} {'bytes/node':>11} {'tick':>10}")
+    print(f"{'objects':<10} {obj_bytes / n:>11.0f} {t_obj*1e3:>7.2f} ms")
+    print(f"{'NodeTable':<10} {table_bytes / n:>11.0f} {t_tab*1e3:>7.2f} ms   (arrays alone {table.nbytes() / n:.0f} B/node)")
+    print(f"speedup {t_obj / t_tab:.1f}x, memory {obj_bytes / table_bytes:.1f}x smaller")
+
+if __name__ == "__main__":
+    main()
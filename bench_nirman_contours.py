@@ -0,0 +1,108 @@
+"""nirman_ai crack filtering benchmark: per-contour loop vs packed NumPy stats.
+
+Textures (with a few cracks drawn on top):
+    brick    mortar joints and grain noise, ~600 contours per 1280x720 frame
+    stucco   thousands of small dark pits, ~7000 contours per frame
+Compared on the same contours:
+    loop     the original detect_cracks loop (contourArea per contour,
+             boundingRect only above the area limit, one drawContours per crack)
+    packed   nirman_ai.contour_stats + crack_mask + one drawContours call
+The accepted boxes must match exactly.
+
+Measured: packed is within +-10% of the loop on both textures (0.9-1.1x),
+and either way the filter is small next to gray + blur + Canny + findContours
+(15 ms brick, 36 ms stucco), so the frame rate does not change. contour_stats
+is about 2.5x faster than calling contourArea + boundingRect on every
+contour, but the loop skips boundingRect for almost all of them, and packing
+the contours (np.concatenate) costs about as much as the saved calls. The
+packed form is kept because its area and box arrays feed the tiled path
+(nirman_tiles), not for speed.
+
+    python bench_nirman_contours.py --frames 50 --texture stucco
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from nirman_ai import crack_contours, contour_stats, crack_mask, C_RED, WIDTH, HEIGHT
+
+def brick_wall(seed, w=WIDTH, h=HEIGHT):
+    rng = np.random.default_rng(seed)
+    img = rng.normal(150, 25, (h, w, 3)).clip(0, 255).astype(np.uint8) # Grain
+    for row, y in enumerate(range(0, h, 36)):
+        cv2.line(img, (0, y), (w, y), (90, 90, 90), 3) # Bed joints
+        for x in range((row % 2) * 40, w, 80):
+            cv2.line(img, (x, y), (x, y + 36), (90, 90, 90), 3) # Head joints
+    for _ in range(6): # Cracks: long, thin, dark polylines
+        x, y = rng.integers(0, w), rng.integers(0, h)
+        pts = np.cumsum(rng.integers(-6, 7, (60, 2)) + [[0, 8]], axis=0) + [x, y]
+        cv2.polylines(img, [pts.astype(np.int32)], False, (30, 30, 30), int(rng.integers(1, 8)))
+    return img
+
+def stucco(seed, w=WIDTH, h=HEIGHT, pits=6000):
+    rng = np.random.default_rng(seed)
+    img = np.full((h, w, 3), 170, np.uint8)
+    for (x, y), r in zip(rng.integers(0, [w, h], (pits, 2)).tolist(), rng.integers(2, 5, pits).tolist()):
+        cv2.circle(img, (x, y), r, (80, 80, 80), -1)
+    for _ in range(6):
+        x, y = rng.integers(0, w), rng.integers(0, h)
+        pts = np.cumsum(rng.integers(-6, 7, (60, 2)) + [[0, 8]], axis=0) + [x, y]
+        cv2.polylines(img, [pts.astype(np.int32)], False, (30, 30, 30), int(rng.integers(1, 8)))
+    return img
+
+TEXTURES = {"brick": brick_wall, "stucco": stucco}
+
+def loop_filter(contours, img):
+    # Reference: the per-contour loop detect_cracks used before
+    boxes = []
+    for cnt in contours:
+        area = cv2.contourArea(cnt)
+        if area > 100:
+            x, y, w, h = cv2.boundingRect(cnt)
+            aspect_ratio = float(w)/h if h>0 else 0
+            if aspect_ratio < 0.2 or aspect_ratio > 5:
+                cv2.drawContours(img, [cnt], -1, C_RED, 2)
+                boxes.append((x, y, w, h))
+    return boxes
+
+def packed_filter(contours, img):
+    area, boxes = contour_stats(contours)
+    keep = np.flatnonzero(crack_mask(area, boxes))
+    if len(keep): cv2.drawContours(img, [contours[i] for i in keep.tolist()], -1, C_RED, 2)
+    return [tuple(b) for b in boxes[keep].tolist()]
+
+def timed(fn, frames):
+    t = 0.0
+    for contours, img in frames:
+        canvas = img.copy()
+        t0 = time.perf_counter()
+        fn(contours, canvas)
+        t += time.perf_counter() - t0
+    return t / len(frames)
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--frames", type=int, default=50)
+    ap.add_argument("--texture", choices=sorted(TEXTURES), default="brick")
+    args = ap.parse_args()
+
+    imgs = [TEXTURES[args.texture](s) for s in range(args.frames)]
+    t0 = time.perf_counter()
+    frames = [(crack_contours(img), img) for img in imgs]
+    detect = (time.perf_counter() - t0) / len(frames)
+
+    for contours, img in frames:
+        assert loop_filter(contours, img.copy()) == packed_filter(contours, img.copy())
+
+    n = np.mean([len(c) for c, _ in frames])
+    t_loop = timed(loop_filter, frames)
+    t_packed = timed(packed_filter, frames)
+    print(f"{WIDTH}x{HEIGHT} {args.texture} frames, {n:.0f} contours/frame, gray+blur+Canny+findContours {detect*1e3:.2f} ms")
+    print(f"loop    {t_loop*1e3:7.2f} ms/frame   ({(detect + t_loop)*1e3:.2f} ms total)")
+    print(f"packed  {t_packed*1e3:7.2f} ms/frame   ({(detect + t_packed)*1e3:.2f} ms total)")
+    print(f"loop / packed time: filtering {t_loop / t_packed:.2f}x, whole frame {(detect + t_loop) / (detect + t_packed):.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""nirman_tiles check: tiled + stitched cracks vs one full-image pass.
+
+A synthetic facade (grain noise, 2000-2900 px horizontal and vertical cracks
+of 2-12 px, each crossing several tiles, plus two close parallel cracks on a
+tile border whose boxes overlap) is saved as .npy and run through
+nirman_tiles tile by tile (in this process), then compared with
+nirman_ai.find_cracks on the whole image. Every crack box found on the full
+image must come out of the tiled run too (within 2 px: a crack ending on a
+window edge may lose a pixel), whatever the tile size. "extra" cracks are
+ones the full pass drops: an outline left open by the noise there encloses
+no area, while the stitched fragments are sized by their box.
+
+    python bench_nirman_tiles.py --tiles 512 1024 2048
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+import nirman_tiles
+from nirman_ai import find_cracks
+
+def facade(seed=0, h=3000, w=4000, cracks=8):
+    # Even k: horizontal crack in the left 55%, odd k: vertical in the rest (crossing cracks would merge)
+    rng = np.random.default_rng(seed)
+    img = rng.normal(150, 20, (h, w, 3)).clip(0, 255).astype(np.uint8)
+    lanes = cracks // 2 + 1
+    for k in range(cracks):
+        if k % 2 == 0:
+            xs = np.arange(int(rng.integers(50, 300)), int(rng.integers(w // 2, w * 11 // 20)), 40)
+            ys = (k // 2 + 1) * h // lanes + np.cumsum(rng.integers(-3, 4, len(xs)))
+        else:
+            ys = np.arange(int(rng.integers(50, 300)), int(rng.integers(h - 300, h - 50)), 40)
+            xs = w * 3 // 5 + (k // 2 + 1) * (w * 2 // 5) // lanes + np.cumsum(rng.integers(-3, 4, len(ys)))
+        pts = np.stack([xs, ys], axis=1).astype(np.int32)
+        cv2.polylines(img, [pts], False, (30, 30, 30), int(rng.integers(2, 12)))
+    # Two near-parallel cracks ~15 px apart astride x = 1024 (a tile border for tiles up to 1024),
+    # whole in both neighbouring windows: separate, but their boxes overlap in the band
+    for x, width in ((990, 3), (1005, 9)):
+        cv2.line(img, (x, 800), (x + 20, 1000), (30, 30, 30), width)
+    return img
+
+def tiled(path, tile, overlap):
+    nirman_tiles.init_worker(path)
+    H, W = nirman_tiles._image.shape[:2]
+    final, tiles = [], {}
+    for origin in nirman_tiles.tile_grid(H, W, tile):
+        _, f, cands, _ = nirman_tiles.process_tile(origin, tile, overlap)
+        final += f
+        tiles[origin] = cands
+    return final + nirman_tiles.stitch(tiles, tile)
+
+def unmatched(a, b, tol=2):
+    # Boxes of a with no box of b within tol px on every coordinate
+    a, b = np.array(sorted(a)).reshape(-1, 4), np.array(sorted(b)).reshape(-1, 4)
+    near = (np.abs(a[:, None, :] - b[None, :, :]) <= tol).all(axis=2)
+    return a[~near.any(axis=1)].tolist()
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--tiles", type=int, nargs="+", default=[512, 1024, 2048])
+    ap.add_argument("--overlap", type=int, default=64)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    img = facade(args.seed)
+    full = {tuple(b) for _, b, _ in find_cracks(img)} # RETR_TREE reports both edges of a wide crack
+    print(f"{img.shape[1]}x{img.shape[0]} facade, {len(full)} cracks on the full image")
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "facade.npy")
+        np.save(path, img)
+        for tile in args.tiles:
+            t0 = time.perf_counter()
+            found = {tuple(c) for c in tiled(path, tile, args.overlap)}
+            missed, extra = unmatched(full, found), unmatched(found, full)
+            print(f"tile {tile:>5}: {len(found)} cracks, {len(missed)} missed, {len(extra)} extra "
+                  f"({time.perf_counter() - t0:.2f} s)")
+            assert not missed, missed
+        nirman_tiles._image = None # Release the memmap before the directory goes
+
+if __name__ == "__main__":
+    main()
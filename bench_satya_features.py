@@ -0,0 +1,77 @@
+"""Per-frame face feature cost: per-landmark Python access vs satya_features.
+
+Random 478-point meshes are built as MediaPipe-style landmark objects. The
+reference path is the original Biometrics.update / draw_eye_tracking lookups
+(landmarks 159, 145, 386, 374, 468, 473, 33, 133 with math.hypot), once per
+face. Compared with it:
+    array    mesh_to_array + extract: the used landmarks of all faces in one
+             (F, K, 3) array, every feature for all faces at once
+    live     eye_features, the live path: scalar math per face for what the
+             reference computes (lid, iris_l, irises)
+    full     extract_faces, every feature incl. eye aspect ratios and head
+             pose (batch)
+Timings are the best of interleaved rounds, so machine noise hits all alike.
+
+    python bench_satya_features.py --frames 500 --rounds 100
+"""
+import argparse
+import math
+import time
+from collections import namedtuple
+
+import numpy as np
+
+import satya_features
+
+Point = namedtuple("Point", "x y z")
+
+def reference_features(lm):
+    l_dist = math.hypot(lm[159].x - lm[145].x, lm[159].y - lm[145].y)
+    r_dist = math.hypot(lm[386].x - lm[374].x, lm[386].y - lm[374].y)
+    iris_rel = (lm[468].x - lm[33].x) / (lm[133].x - lm[33].x)
+    irises = (lm[468].x, lm[468].y), (lm[473].x, lm[473].y)
+    return (l_dist + r_dist) / 2.0, iris_rel, irises
+
+def random_faces(n, seed=0):
+    rng = np.random.default_rng(seed)
+    arr = rng.random((n, satya_features.N_POINTS, 3), dtype=np.float32)
+    return [[Point(*map(float, p)) for p in face] for face in arr]
+
+def per_frame_us(fns, frames, rounds):
+    # Best per-call time of each fn over `rounds` interleaved runs, so machine noise hits all alike
+    best = [float("inf")] * len(fns)
+    for _ in range(rounds):
+        for i, fn in enumerate(fns):
+            t0 = time.perf_counter()
+            for _ in range(frames): fn()
+            best[i] = min(best[i], time.perf_counter() - t0)
+    return [b / frames * 1e6 for b in best]
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--frames", type=int, default=500, help="calls per timed round")
+    ap.add_argument("--rounds", type=int, default=100)
+    args = ap.parse_args()
+
+    print(f"{'faces':>5}  {'reference':>10}  {'array':>10}  {'live':>10}  {'full':>10}")
+    for n in (1, 4):
+        faces = random_faces(n)
+        ref, array, live, full = per_frame_us([
+            lambda: [reference_features(f) for f in faces],
+            lambda: satya_features.extract(satya_features.mesh_to_array(faces)),
+            lambda: satya_features.eye_features(faces),
+            lambda: satya_features.extract_faces(faces)], args.frames, args.rounds)
+
+        feats = satya_features.extract_faces(faces)
+        eyes = satya_features.eye_features(faces)
+        batched = satya_features.extract(satya_features.mesh_to_array(faces))
+        for i, face in enumerate(faces):
+            lid, iris, _ = reference_features(face)
+            assert np.isclose(feats["lid"][i], lid) and np.isclose(feats["iris_l"][i], iris)
+            assert np.isclose(eyes["lid"][i], lid) and np.isclose(eyes["iris_l"][i], iris)
+            assert eyes["irises"][i] == feats["irises"][i]
+        for k, v in batched.items(): assert np.allclose(np.asarray(feats[k]), v, rtol=1e-3, atol=1e-3), k
+        print(f"{n:>5}  {ref:>7.1f} us  {array:>7.1f} us  {live:>7.1f} us  {full:>7.1f} us")
+
+if __name__ == "__main__":
+    main()
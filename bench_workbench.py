@@ -0,0 +1,47 @@
+"""Workbench throughput suite for CI boxes (no camera, no display).
+
+Replays synthetic frames and a synthetic open-hand trace through the MENU,
+ELEC, PLUMB and game-over screens and prints one report line per case.
+With --mediapipe the hand model runs on every frame instead of the trace.
+
+    python bench_workbench.py --frames 600 --json > bench_output.json
+"""
+import argparse
+import json
+
+import workbench_headless as headless
+
+# (name, scene, elec step, plumb state)
+CASES = [
+    ("MENU", "MENU", 0, None),
+    ("ELEC", "ELEC", 0, None),
+    ("ELEC_OPEN", "ELEC", 4, None),
+    ("PLUMB", "PLUMB", 0, None),
+    ("PLUMB_SAFE", "PLUMB", 0, {"pressure": 0, "valve": 1, "fixed": 0}),
+    ("GAME_OVER", "GAME_OVER", 0, None),
+]
+
+def run_case(scene, step, plumb_state, frames, trace):
+    def setup(session):
+        session.elec["step"] = step
+        if plumb_state: session.plumb.update(plumb_state)
+
+    return headless.replay(headless.synthetic_frames(frames), trace, scene, setup)
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--frames", type=int, default=300)
+    ap.add_argument("--mediapipe", action="store_true", help="run MediaPipe instead of replaying a trace")
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    trace = None if args.mediapipe else headless.synthetic_trace(args.frames)
+    results = {}
+    for name, scene, step, plumb_state in CASES:
+        results[name] = run_case(scene, step, plumb_state, args.frames, trace)
+        if not args.json: print(headless.format_report(name, results[name]))
+
+    if args.json: print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Bounded, indexed event store for GridMaster.
+
+Events are typed records (t, node, kind, mag) in a fixed-capacity NumPy ring
+buffer, never pre-formatted strings. When the ring is full the oldest record
+is appended, as raw bytes, to an optional on-disk log (np.fromfile-readable
+with EVENT_DTYPE), so memory stays bounded however long the session runs.
+
+`node` is the node index, or the line index for BREAKER_* events. Queries are
+vectorized masks over the ring (and, on request, the spilled log):
+
+    surges = log.query(kind=SURGE, node=3, since=now - 5 * 60)
+
+The ring holds only the newest `capacity` records; session-wide totals per
+kind are kept in log.counts (e.g. log.counts[SURGE]) whatever was dropped.
+"""
+import os
+
+import numpy as np
+
+EVENT_DTYPE = np.dtype([("t", "<f8"), ("node", "<i4"), ("kind", "u1"), ("mag", "<f4")])
+
+# Kinds
+SURGE, SWITCH_ON, SWITCH_OFF, REFUSED, BREAKER_OPEN, BREAKER_CLOSE = range(6)
+N_KINDS = 6
+
+class EventLog:
+    def __init__(self, capacity=256, spill_path=None):
+        self.capacity = capacity
+        self.buf = np.zeros(capacity, EVENT_DTYPE)
+        self.total = 0 # Events ever appended (also a cheap change counter)
+        self.counts = np.zeros(N_KINDS, np.int64) # Events ever appended, per kind
+        self.spill_path = spill_path
+        self._spill = open(spill_path, "ab") if spill_path else None
+
+    def __len__(self):
+        return min(self.total, self.capacity)
+
+    def append(self, t, node, kind, mag=0.0):
+        i = self.total % self.capacity
+        if self.total >= self.capacity and self._spill: self._spill.write(self.buf[i].tobytes())
+        self.buf[i] = (t, node, kind, mag)
+        self.total += 1
+        self.counts[kind] += 1
+
+    def recent(self, n):
+        # Newest n records, oldest first
+        n = min(n, len(self))
+        return self.buf[(self.total - n + np.arange(n)) % self.capacity]
+
+    def records(self, spilled=False):
+        # All records in memory (and optionally on disk), oldest first
+        n = len(self)
+        recs = self.buf[:n] if self.total <= self.capacity else np.roll(self.buf, -(self.total % self.capacity))
+        if spilled and self.spill_path:
+            self.flush()
+            if os.path.getsize(self.spill_path):
+                recs = np.concatenate([np.memmap(self.spill_path, EVENT_DTYPE, mode="r"), recs])
+        return recs
+
+    def query(self, kind=None, node=None, since=None, until=None, spilled=False):
+        recs = self.records(spilled)
+        mask = np.ones(len(recs), bool)
+        if kind is not None: mask &= np.isin(recs["kind"], kind)
+        if node is not None: mask &= recs["node"] == node
+        if since is not None: mask &= recs["t"] >= since
+        if until is not None: mask &= recs["t"] < until
+        return recs[mask]
+
+    def flush(self):
+        if self._spill: self._spill.flush()
+
+    def close(self):
+        # Spill what is still in memory too, so the on-disk log is complete
+        if self._spill:
+            self._spill.write(self.records().tobytes())
+            self._spill.close()
+            self._spill = None
+
+def load(path):
+    return np.fromfile(path, EVENT_DTYPE)
@@ -0,0 +1,110 @@
+"""DC power flow and island frequency for GridMaster.
+
+Buses and branches are plain arrays; the network is solved per tick with a
+sparse susceptance (B) matrix. The factorisation only changes when the
+topology does (a breaker opens or closes), so a normal tick is one sparse
+triangular solve plus a few bincounts, which keeps thousands of buses at
+interactive rates.
+
+Measured with bench_grid_flow.py on meshed synthetic grids: 1k buses tick in
+~0.2 ms and refactorise in ~7 ms; 10k buses tick in ~7 ms but a breaker toggle
+costs ~0.6 s (L + U ~2.5M nonzeros), so at that size a toggle stalls one frame.
+
+Per tick, for injections p (MW, generation +, load -) and branch states:
+    islands      connected components of the closed branches (csgraph)
+    flow         DC flow per branch, with each island's imbalance spread
+                 evenly over its buses (distributed slack)
+    loading      |flow| / rating
+    island_freq  one frequency per island, NaN for islands without generation
+
+    net = Network(n_bus, [(0, 2), (1, 3), ...])
+    net.step(p, branch_on)
+"""
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import splu
+
+class Network:
+    def __init__(self, n_bus, branches, x=0.1, rating=150.0, nominal=50.0, inertia=100.0, seed=None):
+        self.n = n_bus
+        br = np.asarray(branches, np.int64).reshape(-1, 2)
+        self.f, self.t = br[:, 0], br[:, 1]
+        self.x = np.broadcast_to(np.asarray(x, np.float64), len(br)).copy() # Reactance (p.u.)
+        self.rating = np.broadcast_to(np.asarray(rating, np.float64), len(br)).copy() # MW
+        self.nominal = nominal
+        self.inertia = inertia # MW of imbalance that moves frequency by 0.1 Hz per tick
+        self.rng = np.random.default_rng(seed)
+        self.bus_freq = np.full(n_bus, nominal)
+        self.factorizations = 0
+        self._topo = None
+
+        # Results of the last step()
+        self.flow = np.zeros(len(br))
+        self.loading = np.zeros(len(br))
+        self.theta = np.zeros(n_bus)
+        self.island_net = np.zeros(0)
+        self.island_gen = np.zeros(0)
+        self.island_freq = np.zeros(0)
+        self.energized = np.zeros(0, bool)
+
+    def _factorize(self, on):
+        n = self.n
+        f, t, b = self.f[on], self.t[on], 1.0 / self.x[on]
+        adj = csr_matrix((np.ones(len(f)), (f, t)), shape=(n, n))
+        self.n_islands, self.labels = connected_components(adj, directed=False)
+        self.sizes = np.bincount(self.labels, minlength=self.n_islands)
+
+        # Laplacian B; grounding one bus per island (the lowest index) makes it invertible
+        rows = np.concatenate([f, t, f, t])
+        cols = np.concatenate([f, t, t, f])
+        B = csr_matrix((np.concatenate([b, b, -b, -b]), (rows, cols)), shape=(n, n))
+        slack = np.full(self.n_islands, n)
+        np.minimum.at(slack, self.labels, np.arange(n))
+        keep = np.ones(n, bool)
+        keep[slack] = False
+        self.solve_idx = np.flatnonzero(keep)
+        # Grounded B is symmetric positive definite: a fill-reducing ordering of B + B^T and
+        # no row pivoting (SuperLU's symmetric mode) keep L + U ~4x sparser than the COLAMD default
+        A = B[self.solve_idx][:, self.solve_idx].tocsc()
+        self.lu = splu(A, permc_spec="MMD_AT_PLUS_A", diag_pivot_thresh=0.0,
+                       options={"SymmetricMode": True}) if len(self.solve_idx) else None
+        self.factorizations += 1
+
+    def step(self, p, on=None):
+        p = np.asarray(p, np.float64)
+        on = np.ones(len(self.f), bool) if on is None else np.asarray(on, bool)
+        key = on.tobytes()
+        if key != self._topo:
+            self._factorize(on)
+            self._topo = key
+        labels, sizes = self.labels, self.sizes
+
+        # 1. Island balance
+        net = np.bincount(labels, weights=p, minlength=self.n_islands)
+        gen = np.bincount(labels, weights=np.maximum(p, 0), minlength=self.n_islands)
+        self.island_net = net
+        self.island_gen = gen
+        self.energized = gen > 0
+
+        # 2. DC power flow: B theta = p (balanced per island)
+        p_bal = p - (net / sizes)[labels]
+        self.theta[:] = 0
+        if self.lu is not None: self.theta[self.solve_idx] = self.lu.solve(p_bal[self.solve_idx])
+        self.flow = np.where(on, (self.theta[self.f] - self.theta[self.t]) / self.x, 0.0)
+        self.loading = np.abs(self.flow) / self.rating
+
+        # 3. Frequency per island (inertia drift, damping, noise)
+        freq = np.bincount(labels, weights=self.bus_freq, minlength=self.n_islands) / sizes
+        freq += (net / self.inertia) * 0.1
+        freq += (self.nominal - freq) * 0.05
+        freq += self.rng.uniform(-0.02, 0.02, self.n_islands)
+        freq = np.where(self.energized, freq, self.nominal) # Dead islands restart at nominal
+        self.bus_freq = freq[labels]
+        self.island_freq = np.where(self.energized, freq, np.nan)
+        return self.island_freq
+
+    def main_island(self):
+        # The energized island with the most generation behind it (-1 = total blackout)
+        if not self.energized.any(): return -1
+        return int(np.argmax(self.island_gen))
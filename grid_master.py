@@ -1,9 +1,13 @@
 import cv2
 import numpy as np
 import time
+import math
 import random
+from collections import deque
 
-from workbench import C_SAFE
+from vision_kit.theme import C_SAFE # Palette only: never starts the workbench
+from grid_flow import Network
+from grid_events import EventLog, SURGE, SWITCH_ON, SWITCH_OFF, REFUSED, BREAKER_OPEN, BREAKER_CLOSE
 
 # ==========================================
 # CONFIGURATION & PHYSICS
@@ -11,6 +15,11 @@ from workbench import C_SAFE
 WIDTH, HEIGHT = 1280, 720
 GAME_STATE = "MENU" # MENU, RUNNING, BLACKOUT
 START_TIME = 0
+SIM_HZ = 30 # Physics ticks per second (independent of the render rate)
+RENDER_HZ = 60 # Upper bound on presented frames per second
+MAX_CATCHUP = 5 # Sim ticks allowed per loop before the backlog is dropped
+EVENT_CAPACITY = 256 # Events kept in memory
+EVENT_LOG = "gridmaster_events.bin" # Older events spill here (grid_events.load reads it)
 
 # COLORS (SCADA Palette)
 C_BG = (10, 10, 15)       # Dark Background
@@ -22,8 +31,12 @@ C_TEXT = (200, 200, 200)
 C_ACCENT = (255, 100, 0)
 
 # GRID PHYSICS
-FREQUENCY = 50.00 # Target: 50.00 Hz
+FREQUENCY = 50.00 # Target: 50.00 Hz (live values are per island, GridSystem.net)
+LINE_RATING = 150 # MW a line carries at 100% loading
 VOLTAGE = 230.00  # Target: 230 kV
+AMBIENT = 50 # Node temperature when idle (C)
+HEAT_PER_MW = 0.2 # Steady-state rise per MW carried (C)
+THERMAL_RATE = 0.02 # Share of the gap to steady state closed per sim tick
 TOTAL_LOAD = 0
 TOTAL_GEN = 0
 STABILITY = 100 # %
@@ -31,57 +44,123 @@ STABILITY = 100 # %
 # ==========================================
 # SYSTEM CLASSES
 # ==========================================
+# Node state is a structure of arrays (NodeTable); Node is a view of one row,
+# so per-tick physics and colour selection run as whole-array NumPy ops.
+GEN, LOAD = 0, 1
+TYPES = ("GEN", "LOAD")
+
+def _column(attr, cast):
+    # Read/write property onto row self.i of a NodeTable array
+    return property(lambda self: cast(getattr(self.table, attr)[self.i]),
+                    lambda self, v: getattr(self.table, attr).__setitem__(self.i, v))
+
 class Node:
-    def __init__(self, name, x, y, type, mw, critical=False):
-        self.name = name
-        self.pos = (x, y)
-        self.type = type # "GEN" (Generator) or "LOAD" (Consumer)
-        self.mw = mw # Megawatts (Capacity for Gen, Demand for Load)
-        self.active = True
-        self.critical = critical # If True, cannot be cut easily
-        self.temp = 50 # Temperature (Overheat simulation)
-
-    def draw(self, img, is_hover):
-        # Color Logic
-        col = C_LINE_OFF
-        if self.active:
-            if self.type == "GEN": col = C_ACCENT # Generators are Orange
-            else: col = C_LINE_ON # Loads are Green
-            
-            if self.type == "LOAD" and self.critical: col = (255, 50, 255) # Hospitals are Purple
+    __slots__ = ("table", "i")
+
+    def __init__(self, table, i):
+        self.table = table
+        self.i = i
+
+    name = property(lambda self: self.table.name[self.i])
+    type = property(lambda self: TYPES[self.table.kind[self.i]]) # "GEN" (Generator) or "LOAD" (Consumer)
+    pos = property(lambda self: (int(self.table.x[self.i]), int(self.table.y[self.i])))
+    mw = _column("mw", float) # Megawatts (Capacity for Gen, Demand for Load)
+    active = _column("active", bool)
+    critical = _column("critical", bool) # If True, cannot be cut easily
+    temp = _column("temp", float) # Temperature (Overheat simulation)
+
+    def info(self):
+        return f"{self.name}: {self.mw:.0f} MW {self.temp:.0f}C"
+
+    def rect(self, is_hover):
+        # Screen area draw() can touch (hover info box included)
+        x, y = self.pos
+        x0, y0, x1, y1 = x-47, y-47, x+47, y+66
+        if is_hover:
+            (tw, th), base = cv2.getTextSize(self.info(), cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
+            x1, y0 = max(x1, x-40 + tw + 2), min(y0, y-50 - th - 2)
+        return (x0, y0, x1, y1)
+
+    def draw(self, img, is_hover, col, ox=0, oy=0):
+        # col: from node_colors(); (ox, oy): top-left of img on screen, when drawing into a clipped region
+        x, y = self.pos[0] - ox, self.pos[1] - oy
         
         # Hover Effect
         radius = 40
         if is_hover: 
-            cv2.circle(img, self.pos, radius+5, (255, 255, 255), 2)
+            cv2.circle(img, (x, y), radius+5, (255, 255, 255), 2)
             # Show Info Box
-            info = f"{self.name}: {self.mw} MW"
-            cv2.putText(img, info, (self.pos[0]-40, self.pos[1]-50), cv2.FONT_HERSHEY_SIMPLEX, 0.6, C_TEXT, 2)
+            cv2.putText(img, self.info(), (x-40, y-50), cv2.FONT_HERSHEY_SIMPLEX, 0.6, C_TEXT, 2)
 
         # Draw Node
-        cv2.circle(img, self.pos, radius, col, -1)
-        cv2.circle(img, self.pos, radius, (200, 200, 200), 2)
+        cv2.circle(img, (x, y), radius, col, -1)
+        cv2.circle(img, (x, y), radius, (200, 200, 200), 2)
         
         # Icon/Text
         label = "G" if self.type == "GEN" else "L"
         if self.critical: label = "H"
-        cv2.putText(img, label, (self.pos[0]-10, self.pos[1]+10), cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,0), 2)
+        cv2.putText(img, label, (x-10, y+10), cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,0), 2)
         
         # Status Text
         status = "ON" if self.active else "OFF"
-        cv2.putText(img, f"{status}", (self.pos[0]-20, self.pos[1]+60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, col, 1)
+        cv2.putText(img, f"{status}", (x-20, y+60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, col, 1)
+
+class NodeTable:
+    # One typed array per field; indexing/iterating yields Node views
+    def __init__(self, name, x, y, kind, mw, critical):
+        self.name = list(name)
+        self.x = np.asarray(x, np.int32)
+        self.y = np.asarray(y, np.int32)
+        self.kind = np.asarray(kind, np.uint8) # GEN / LOAD
+        self.mw = np.asarray(mw, np.float32)
+        self.critical = np.asarray(critical, bool)
+        self.active = np.ones(len(self.name), bool)
+        self.temp = np.full(len(self.name), AMBIENT, np.float32)
+
+    @classmethod
+    def from_rows(cls, rows):
+        # rows: (name, x, y, "GEN"/"LOAD", mw[, critical])
+        rows = [(*r, False) if len(r) == 5 else r for r in rows]
+        name, x, y, kind, mw, critical = zip(*rows)
+        return cls(name, x, y, [TYPES.index(k) for k in kind], mw, critical)
+
+    def __len__(self):
+        return len(self.name)
+
+    def __getitem__(self, i):
+        if not -len(self) <= i < len(self): raise IndexError(i)
+        return Node(self, i % len(self))
+
+    def __iter__(self):
+        return (Node(self, i) for i in range(len(self)))
+
+    def nbytes(self):
+        # Array storage (names excluded)
+        return sum(a.nbytes for a in (self.x, self.y, self.kind, self.mw, self.critical, self.active, self.temp))
+
+    def injections(self):
+        # MW per bus: generation +, demand -, 0 when switched off
+        return np.where(self.active, np.where(self.kind == GEN, self.mw, -self.mw), 0).astype(np.float64)
+
+    def heat(self, rate=THERMAL_RATE):
+        # Temperatures relax toward ambient + HEAT_PER_MW * MW carried (0 when off)
+        target = AMBIENT + HEAT_PER_MW * self.mw * self.active
+        self.temp += (target - self.temp) * rate
 
 class GridSystem:
-    def __init__(self):
+    def __init__(self, clock=time.time, seed=None, event_path=None):
+        # clock / seed: simulated time and reproducible events for headless runs (grid_sim)
+        self.clock = clock
+        self.rng = random.Random(seed)
         # Define the Nepal Grid Map
-        self.nodes = [
-            Node("Marsyangdi Hydro", 200, 360, "GEN", 120),
-            Node("Kulekhani Hydro", 200, 550, "GEN", 80),
-            Node("Kathmandu City", 600, 360, "LOAD", 100), # Residential
-            Node("Hetauda Ind.", 600, 550, "LOAD", 90),    # Industrial
-            Node("Teaching Hospital", 900, 360, "LOAD", 20, critical=True),
-            Node("Baneshwor Sub", 900, 550, "LOAD", 40)
-        ]
+        self.nodes = NodeTable.from_rows([
+            ("Marsyangdi Hydro", 200, 360, "GEN", 120),
+            ("Kulekhani Hydro", 200, 550, "GEN", 80),
+            ("Kathmandu City", 600, 360, "LOAD", 100), # Residential
+            ("Hetauda Ind.", 600, 550, "LOAD", 90),    # Industrial
+            ("Teaching Hospital", 900, 360, "LOAD", 20, True),
+            ("Baneshwor Sub", 900, 550, "LOAD", 40)
+        ])
         # Define Connections (Lines)
         self.lines = [
             (0, 2), # Marsyangdi -> Ktm
@@ -90,43 +169,40 @@ class GridSystem:
             (2, 5), # Ktm -> Baneshwor
             (3, 5)  # Hetauda -> Baneshwor (Ring Main)
         ]
-        self.events = []
-        self.last_event = time.time()
+        self.line_active = [True] * len(self.lines) # Breakers (operator can open a line)
+        self.hits = HitIndex(self.nodes, self.lines)
+        self.net = Network(len(self.nodes), self.lines, rating=LINE_RATING, nominal=FREQUENCY, seed=self.rng.getrandbits(32))
+        self.frequency = FREQUENCY # Of the main island (the one with most generation)
+        self.net.step(self.injections(), self.line_active)
+        self.blackout = False
+        self.events = EventLog(EVENT_CAPACITY, event_path)
+        self.last_event = clock()
+
+    def injections(self):
+        return self.nodes.injections()
 
     def update(self):
-        global FREQUENCY, STABILITY, GAME_STATE
-        
-        # 1. Calculate Supply vs Demand
-        supply = sum(n.mw for n in self.nodes if n.type == "GEN" and n.active)
-        demand = sum(n.mw for n in self.nodes if n.type == "LOAD" and n.active)
+        # 1 + 2. Physics Engine: DC power flow and frequency per island
+        # If Supply > Demand in an island, its Freq rises. If Supply < Demand, it drops.
+        freq = self.net.step(self.injections(), self.line_active)
+        self.nodes.heat()
+        main = self.net.main_island()
+        self.frequency = float(freq[main]) if main >= 0 else 0.0
         
-        # 2. Physics Engine
-        net = supply - demand
-        
-        # Frequency Drift (Real physics: Inertia)
-        # If Supply > Demand, Freq rises. If Supply < Demand, Freq drops.
-        drift = (net / 100.0) * 0.1 
-        FREQUENCY += drift
-        
-        # Natural damping (Grid tries to stabilize)
-        FREQUENCY += (50.0 - FREQUENCY) * 0.05
-        
-        # Random Fluctuations (Noise)
-        FREQUENCY += random.uniform(-0.02, 0.02)
-        
-        # 3. Fail Conditions
-        if FREQUENCY < 48.5 or FREQUENCY > 51.5:
-            GAME_STATE = "BLACKOUT"
+        # 3. Fail Conditions (any island that still has generation)
+        live = freq[self.net.energized]
+        if main < 0 or (live < 48.5).any() or (live > 51.5).any():
+            self.blackout = True
         
         # 4. Random Events (The "Hard" Part)
-        if time.time() - self.last_event > 5: # Every 5 seconds
-            event_roll = random.randint(0, 100)
+        if self.clock() - self.last_event > 5: # Every 5 seconds
+            event_roll = self.rng.randint(0, 100)
             if event_roll > 70: # 30% chance
-                target = random.choice([n for n in self.nodes if n.type=="LOAD"])
-                surge = random.randint(10, 30)
-                target.mw += surge
-                self.events.append(f"SURGE: {target.name} +{surge}MW Demand!")
-                self.last_event = time.time()
+                target = self.rng.choice(np.flatnonzero(self.nodes.kind == LOAD).tolist())
+                surge = self.rng.randint(10, 30)
+                self.nodes.mw[target] += surge
+                self.log(SURGE, target, surge)
+                self.last_event = self.clock()
 
     def toggle_node(self, idx):
         # Operator Logic: Cannot turn off Generators easily (Ramp down takes time)
@@ -134,110 +210,372 @@ class GridSystem:
         node = self.nodes[idx]
         if node.type == "LOAD":
             node.active = not node.active
-            return f"SWITCHED {node.name}: {'ON' if node.active else 'OFF'}"
-        return "CANNOT TRIP GENERATOR MANUALLY"
+            self.log(SWITCH_ON if node.active else SWITCH_OFF, idx, node.mw)
+            return True
+        self.log(REFUSED, idx)
+        return False
+
+    def toggle_line(self, li):
+        self.line_active[li] = not self.line_active[li]
+        self.log(BREAKER_CLOSE if self.line_active[li] else BREAKER_OPEN, li)
+        return True
+
+    def click(self, pos):
+        # Operator click on a node or a line; returns what was hit (or None)
+        hit = self.hits.query(pos)
+        if hit is None: return None
+        kind, i = hit
+        if kind == "node": self.toggle_node(i)
+        else: self.toggle_line(i)
+        return hit
+
+    # ---- event log (records only; text is made when an entry is drawn) ----
+    def log(self, kind, subject, mag=0):
+        self.events.append(self.clock(), subject, kind, mag)
+
+    def describe(self, rec):
+        kind, i = rec["kind"], int(rec["node"])
+        if kind == SURGE: return f"SURGE: {self.nodes[i].name} +{rec['mag']:.0f}MW Demand!"
+        if kind in (SWITCH_ON, SWITCH_OFF): return f"SWITCHED {self.nodes[i].name}: {'ON' if kind == SWITCH_ON else 'OFF'}"
+        if kind == REFUSED: return "CANNOT TRIP GENERATOR MANUALLY"
+        a, b = self.lines[i]
+        return f"BREAKER {self.nodes[a].name} - {self.nodes[b].name}: {'CLOSED' if kind == BREAKER_CLOSE else 'OPEN'}"
+
+# ==========================================
+# HIT TESTING (Uniform Grid Spatial Index)
+# ==========================================
+class HitIndex:
+    # Buckets nodes (circles) and lines (segments) into square cells, so a
+    # hover/click query only checks the few items in the cursor's cell.
+    def __init__(self, nodes, lines, cell=64, node_radius=40, line_tol=8):
+        self.cell = cell
+        self.node_radius = node_radius
+        self.line_tol = line_tol
+        self.nodes = nodes
+        self.lines = lines
+        self.rebuild()
+
+    def _cells(self, x0, y0, x1, y1):
+        c = self.cell
+        for cx in range(int(x0 // c), int(x1 // c) + 1):
+            for cy in range(int(y0 // c), int(y1 // c) + 1):
+                yield cx, cy
+
+    def rebuild(self):
+        # Call after nodes move or lines change
+        self.buckets = {}
+        r = self.node_radius
+        for i, node in enumerate(self.nodes):
+            x, y = node.pos
+            for key in self._cells(x-r, y-r, x+r, y+r):
+                self.buckets.setdefault(key, []).append(("node", i))
+        t = self.line_tol
+        for li, (a, b) in enumerate(self.lines):
+            (x0, y0), (x1, y1) = self.nodes[a].pos, self.nodes[b].pos
+            # Walk the segment in half-cell steps, padding each sample by the tolerance
+            steps = max(1, int(math.hypot(x1 - x0, y1 - y0) / (self.cell / 2)))
+            cells = set()
+            for k in range(steps + 1):
+                px, py = x0 + (x1 - x0) * k / steps, y0 + (y1 - y0) * k / steps
+                cells.update(self._cells(px - t - self.cell / 2, py - t - self.cell / 2,
+                                         px + t + self.cell / 2, py + t + self.cell / 2))
+            for key in cells: self.buckets.setdefault(key, []).append(("line", li))
+
+    def query(self, pos):
+        # ("node", i), ("line", li) or None. Nodes win over the lines beneath them.
+        x, y = pos
+        best_node, best_line = None, None
+        for kind, i in self.buckets.get((int(x // self.cell), int(y // self.cell)), ()):
+            if kind == "node":
+                nx, ny = self.nodes[i].pos
+                d = math.hypot(x - nx, y - ny)
+                if d < self.node_radius and (best_node is None or d < best_node[0]): best_node = (d, i)
+            else:
+                a, b = self.lines[i]
+                d = segment_dist(pos, self.nodes[a].pos, self.nodes[b].pos)
+                if d <= self.line_tol and (best_line is None or d < best_line[0]): best_line = (d, i)
+        if best_node: return ("node", best_node[1])
+        if best_line: return ("line", best_line[1])
+        return None
+
+def segment_dist(p, a, b):
+    ax, ay = a
+    dx, dy = b[0] - ax, b[1] - ay
+    L2 = dx * dx + dy * dy
+    t = 0.0 if L2 == 0 else max(0.0, min(1.0, ((p[0] - ax) * dx + (p[1] - ay) * dy) / L2))
+    return math.hypot(p[0] - (ax + t * dx), p[1] - (ay + t * dy))
 
 # ==========================================
 # GRAPHICS ENGINE
 # ==========================================
-def draw_dashboard(img, grid, mouse_pos):
+# Every on-screen element is an item: (id, rect, key, paint). rect is the
+# screen area paint() may touch, key is everything its pixels depend on, and
+# paint(img, ox, oy) draws it into img whose top-left is (ox, oy) on screen.
+def node_at(grid, pos):
+    hit = grid.hits.query(pos)
+    return hit[1] if hit and hit[0] == "node" else -1
+
+NODE_COLORS = (C_LINE_OFF, C_ACCENT, C_LINE_ON, (255, 50, 255)) # Off, Generator (Orange), Load (Green), Hospital (Purple)
+
+def node_colors(nodes):
+    # Index into NODE_COLORS for every node at once
+    code = np.where(nodes.kind == GEN, 1, np.where(nodes.critical, 3, 2))
+    return np.where(nodes.active, code, 0)
+
+def draw_line(img, ox, oy, p1, p2, col, thickness):
+    cv2.line(img, (p1[0]-ox, p1[1]-oy), (p2[0]-ox, p2[1]-oy), col, thickness)
+
+def draw_freq(img, ox, oy, text, col, islands):
+    cv2.rectangle(img, (20-ox, 20-oy), (300-ox, 150-oy), (20, 20, 25), -1)
+    cv2.rectangle(img, (20-ox, 20-oy), (300-ox, 150-oy), C_TEXT, 2)
+    cv2.putText(img, "GRID FREQUENCY", (40-ox, 50-oy), cv2.FONT_HERSHEY_SIMPLEX, 0.7, C_TEXT, 1)
+    cv2.putText(img, text, (40-ox, 100-oy), cv2.FONT_HERSHEY_SIMPLEX, 1.5, col, 3)
+    cv2.putText(img, islands, (40-ox, 135-oy), cv2.FONT_HERSHEY_SIMPLEX, 0.45, C_TEXT, 1)
+
+def draw_logs(img, ox, oy, events):
+    cv2.rectangle(img, (900-ox, 20-oy), (1260-ox, 200-oy), (20, 20, 25), -1)
+    cv2.putText(img, "SYSTEM LOGS", (920-ox, 50-oy), cv2.FONT_HERSHEY_SIMPLEX, 0.6, C_ACCENT, 1)
+    y = 80
+    for event in events: # Show last 4
+        cv2.putText(img, event, (920-ox, y-oy), cv2.FONT_HERSHEY_SIMPLEX, 0.5, C_TEXT, 1)
+        y += 25
+
+def draw_texts(img, ox, oy, texts):
+    for text, (x, y), scale, col, thickness in texts:
+        cv2.putText(img, text, (x-ox, y-oy), cv2.FONT_HERSHEY_SIMPLEX, scale, col, thickness)
+
+def dashboard_items(grid, mouse_pos, now):
+    items = []
+    hover = grid.hits.query(mouse_pos)
     # 1. Draw Connections (Lines)
-    for start_idx, end_idx in grid.lines:
+    flow = int(now * 10) % 2 == 0 # Simulation: Current Flow animation
+    for li, (start_idx, end_idx) in enumerate(grid.lines):
         n1 = grid.nodes[start_idx]
         n2 = grid.nodes[end_idx]
         
         # Line Physics
         col = C_LINE_OFF
         thickness = 2
-        if n1.active and n2.active:
-            col = C_LINE_ON # Powered
+        island = grid.net.labels[start_idx]
+        if n1.active and n2.active and grid.line_active[li] and grid.net.energized[island]:
+            col = (100, 255, 100) if flow else C_LINE_ON # Powered
             thickness = 4
-            # Simulation: Current Flow animation
-            if int(time.time() * 10) % 2 == 0: col = (100, 255, 100)
-            
-        cv2.line(img, n1.pos, n2.pos, col, thickness)
+            loading = grid.net.loading[li]
+            if loading > 0.8: col = C_WARN # Heavily loaded
+            if loading > 1.0: col = C_DANGER # Overloaded
+        if hover == ("line", li): thickness += 4 # Hovered breaker
+        rect = (min(n1.pos[0], n2.pos[0]) - 6, min(n1.pos[1], n2.pos[1]) - 6,
+                max(n1.pos[0], n2.pos[0]) + 7, max(n1.pos[1], n2.pos[1]) + 7)
+        items.append((("line", li), rect, (col, thickness),
+                      lambda img, ox, oy, a=n1.pos, b=n2.pos, c=col, t=thickness: draw_line(img, ox, oy, a, b, c, t)))
 
     # 2. Draw Nodes
-    hover_idx = -1
+    colors = node_colors(grid.nodes).tolist()
     for i, node in enumerate(grid.nodes):
-        dist = np.linalg.norm(np.array(node.pos) - np.array(mouse_pos))
-        is_hover = dist < 40
-        if is_hover: hover_idx = i
-        node.draw(img, is_hover)
+        is_hover = hover == ("node", i)
+        col = NODE_COLORS[colors[i]]
+        info = node.info() if is_hover else None # Hover box text (MW, temperature)
+        items.append((("node", i), node.rect(is_hover), (col, node.active, is_hover, info),
+                      lambda img, ox, oy, n=node, h=is_hover, c=col: n.draw(img, h, c, ox, oy)))
 
     # 3. Draw HUD (Heads Up Display)
     # Frequency Gauge (The most critical metric)
-    cv2.rectangle(img, (20, 20), (300, 150), (20, 20, 25), -1)
-    cv2.rectangle(img, (20, 20), (300, 150), C_TEXT, 2)
-    
     col = C_SAFE
-    if abs(50 - FREQUENCY) > 0.5: col = C_WARN
-    if abs(50 - FREQUENCY) > 1.0: col = C_DANGER
-    
-    cv2.putText(img, "GRID FREQUENCY", (40, 50), cv2.FONT_HERSHEY_SIMPLEX, 0.7, C_TEXT, 1)
-    cv2.putText(img, f"{FREQUENCY:.2f} Hz", (40, 100), cv2.FONT_HERSHEY_SIMPLEX, 1.5, col, 3)
+    if abs(50 - grid.frequency) > 0.5: col = C_WARN
+    if abs(50 - grid.frequency) > 1.0: col = C_DANGER
+    text = f"{grid.frequency:.2f} Hz"
+    islands = f"ISLANDS: {grid.net.n_islands}  MAX LOAD: {grid.net.loading.max(initial=0):.0%}"
+    items.append(("freq", (18, 18, 303, 153), (text, col, islands),
+                  lambda img, ox, oy, t=text, c=col, i=islands: draw_freq(img, ox, oy, t, c, i)))
 
     # Alerts Log
-    cv2.rectangle(img, (900, 20), (1260, 200), (20, 20, 25), -1)
-    cv2.putText(img, "SYSTEM LOGS", (920, 50), cv2.FONT_HERSHEY_SIMPLEX, 0.6, C_ACCENT, 1)
-    y = 80
-    for event in grid.events[-4:]: # Show last 4
-        cv2.putText(img, event, (920, y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, C_TEXT, 1)
-        y += 25
+    # Key: number of events so far; the last 4 are only formatted when repainted
+    items.append(("logs", (900, 20, WIDTH, 205), grid.events.total,
+                  lambda img, ox, oy, g=grid: draw_logs(img, ox, oy, [g.describe(r) for r in g.events.recent(4)])))
 
-    return hover_idx
+    # Instructions
+    texts = (("INSTRUCTIONS: Click Green Nodes (Loads) to Shed Power, Lines to Open Breakers. Keep Freq at 50Hz.", (20, 680), 0.6, C_TEXT, 1),)
+    items.append(("help", (0, 655, WIDTH, HEIGHT), texts, lambda img, ox, oy, t=texts: draw_texts(img, ox, oy, t)))
+    return items
+
+def screen_items(grid):
+    # Full-screen MENU / BLACKOUT pages
+    if GAME_STATE == "MENU":
+        texts = (("GRIDMASTER AI", (350, 300), 2, C_ACCENT, 4),
+                 ("National Load Dispatch Simulator", (380, 360), 0.8, C_TEXT, 1),
+                 ("Press [SPACE] to Initialize Grid", (400, 500), 0.8, C_WARN, 2))
+    else:
+        texts = (("GRID COLLAPSE", (350, 300), 2, C_DANGER, 4),
+                 (f"Final Freq: {grid.frequency:.2f} Hz", (480, 380), 1, C_TEXT, 2),
+                 ("Press [R] to Reboot System", (450, 500), 0.8, C_WARN, 2))
+    return [("screen", (0, 0, WIDTH, HEIGHT), texts, lambda img, ox, oy, t=texts: draw_texts(img, ox, oy, t))]
+
+def draw_dashboard(img, grid, mouse_pos):
+    # Immediate mode: paint every item onto img
+    for _, _, _, paint in dashboard_items(grid, mouse_pos, time.time()): paint(img, 0, 0)
+    return node_at(grid, mouse_pos)
+
+# ==========================================
+# RETAINED RENDERER (Dirty Rectangles)
+# ==========================================
+def overlaps(a, b):
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+def merge_rects(rects):
+    # Union overlapping rectangles until none overlap
+    rects = list(rects)
+    merged = True
+    while merged:
+        merged = False
+        out = []
+        for r in rects:
+            for i, o in enumerate(out):
+                if overlaps(r, o):
+                    out[i] = (min(r[0], o[0]), min(r[1], o[1]), max(r[2], o[2]), max(r[3], o[3]))
+                    merged = True
+                    break
+            else:
+                out.append(r)
+        rects = out
+    return rects
+
+class Renderer:
+    # Persistent canvas; only items whose rect or key changed are repainted
+    def __init__(self, w, h, full_share=0.6):
+        self.w, self.h = w, h
+        self.canvas = np.zeros((h, w, 3), np.uint8)
+        self.items = {} # id -> (rect, key) as last painted
+        self.dirty = [(0, 0, w, h)]
+        self.full_share = full_share # Beyond this dirty share, repaint the whole frame
+        self.painted_px = 0 # Pixels repainted by the last frame()
+
+    def invalidate(self):
+        self.dirty = [(0, 0, self.w, self.h)]
+
+    def frame(self, items):
+        # Returns True when the canvas changed (and needs presenting)
+        seen = {}
+        for iid, rect, key, _ in items:
+            prev = self.items.get(iid)
+            if prev != (rect, key):
+                self.dirty.append(rect)
+                if prev is not None and prev[0] != rect: self.dirty.append(prev[0])
+            seen[iid] = (rect, key)
+        for iid, (rect, _) in self.items.items():
+            if iid not in seen: self.dirty.append(rect) # Removed item
+        self.items = seen
+        self.painted_px = 0
+        if not self.dirty: return False
+
+        rects = [(max(0, x0), max(0, y0), min(self.w, x1), min(self.h, y1)) for x0, y0, x1, y1 in self.dirty]
+        rects = merge_rects(r for r in rects if r[0] < r[2] and r[1] < r[3])
+        if sum((x1-x0) * (y1-y0) for x0, y0, x1, y1 in rects) > self.full_share * self.w * self.h:
+            rects = [(0, 0, self.w, self.h)]
+        self.dirty = []
+
+        for r in rects:
+            x0, y0, x1, y1 = r
+            roi = self.canvas[y0:y1, x0:x1] # View: drawing is clipped to the region
+            roi[:] = 0
+            for _, rect, _, paint in items:
+                if overlaps(rect, r): paint(roi, x0, y0)
+            self.painted_px += (x1-x0) * (y1-y0)
+        return True
+
+class FramePacing:
+    # Present intervals, render work and repaint share over the last frames
+    def __init__(self, n=600):
+        self.intervals = deque(maxlen=n)
+        self.work_ms = deque(maxlen=n)
+        self.painted = deque(maxlen=n)
+        self.last = None
+        self.loops = 0
+        self.frames = 0
+        self.ticks = 0
+
+    def record(self, presented, work_s, painted_share):
+        self.loops += 1
+        self.work_ms.append(work_s * 1000)
+        if not presented: return
+        now = time.perf_counter()
+        if self.last is not None: self.intervals.append((now - self.last) * 1000)
+        self.last = now
+        self.frames += 1
+        self.painted.append(painted_share)
+
+    def report(self):
+        iv = np.asarray(self.intervals)
+        work = np.asarray(self.work_ms)
+        if not iv.size: return "no frames presented"
+        return (f"{self.frames} frames / {self.loops} loops, {self.ticks} sim ticks | "
+                f"present interval p50 {np.percentile(iv, 50):.1f} ms, p99 {np.percentile(iv, 99):.1f} ms, "
+                f"max {iv.max():.1f} ms | render work p50 {np.percentile(work, 50):.2f} ms | "
+                f"repainted {np.mean(self.painted):.1%} of the screen per frame")
 
 # ==========================================
 # MAIN APP
 # ==========================================
-cv2.namedWindow("GridMaster AI")
-grid = GridSystem()
+grid = None
 mouse_pos = (0, 0)
 
 def mouse_callback(event, x, y, flags, param):
     global mouse_pos
     mouse_pos = (x, y)
-    if event == cv2.EVENT_LBUTTONDOWN:
-        # Check clicks
-        idx = draw_dashboard(np.zeros((HEIGHT, WIDTH, 3), np.uint8), grid, (x,y))
-        if idx != -1:
-            log = grid.toggle_node(idx)
-            grid.events.append(log)
-
-cv2.setMouseCallback("GridMaster AI", mouse_callback)
-
-while True:
-    img = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
-    
-    if GAME_STATE == "MENU":
-        cv2.putText(img, "GRIDMASTER AI", (350, 300), cv2.FONT_HERSHEY_SIMPLEX, 2, C_ACCENT, 4)
-        cv2.putText(img, "National Load Dispatch Simulator", (380, 360), cv2.FONT_HERSHEY_SIMPLEX, 0.8, C_TEXT, 1)
-        cv2.putText(img, "Press [SPACE] to Initialize Grid", (400, 500), cv2.FONT_HERSHEY_SIMPLEX, 0.8, C_WARN, 2)
-        
-        key = cv2.waitKey(1)
-        if key == 32: # Space
-            GAME_STATE = "RUNNING"
-            grid = GridSystem()
+    if event == cv2.EVENT_LBUTTONDOWN and GAME_STATE == "RUNNING":
+        # Check clicks (nodes, then lines)
+        grid.click((x, y))
 
-    elif GAME_STATE == "RUNNING":
-        grid.update()
-        draw_dashboard(img, grid, mouse_pos)
-        
-        # Instructions
-        cv2.putText(img, "INSTRUCTIONS: Click Green Nodes (Loads) to Shed Power. Keep Freq at 50Hz.", (20, 680), cv2.FONT_HERSHEY_SIMPLEX, 0.6, C_TEXT, 1)
-
-    elif GAME_STATE == "BLACKOUT":
-        cv2.rectangle(img, (0,0), (WIDTH, HEIGHT), (0,0,0), -1)
-        cv2.putText(img, "GRID COLLAPSE", (350, 300), cv2.FONT_HERSHEY_SIMPLEX, 2, C_DANGER, 4)
-        cv2.putText(img, f"Final Freq: {FREQUENCY:.2f} Hz", (480, 380), cv2.FONT_HERSHEY_SIMPLEX, 1, C_TEXT, 2)
-        cv2.putText(img, "Press [R] to Reboot System", (450, 500), cv2.FONT_HERSHEY_SIMPLEX, 0.8, C_WARN, 2)
-        
-        key = cv2.waitKey(1)
-        if key == ord('r'):
+def main():
+    global grid, GAME_STATE
+    cv2.namedWindow("GridMaster AI")
+    grid = GridSystem()
+    cv2.setMouseCallback("GridMaster AI", mouse_callback)
+
+    renderer = Renderer(WIDTH, HEIGHT)
+    pacing = FramePacing()
+    dt = 1.0 / SIM_HZ
+    next_tick = time.perf_counter()
+    next_frame = next_tick
+
+    while True:
+        now = time.perf_counter()
+
+        # 1. Simulation: fixed timestep, independent of how often we render
+        steps = 0
+        while GAME_STATE == "RUNNING" and now >= next_tick and steps < MAX_CATCHUP:
+            grid.update()
+            if grid.blackout: GAME_STATE = "BLACKOUT"
+            next_tick += dt
+            steps += 1
+        pacing.ticks += steps
+        if GAME_STATE != "RUNNING" or now >= next_tick: next_tick = max(next_tick, now) # Drop backlog
+
+        # 2. Render: repaint dirty regions only, present only on change
+        if now >= next_frame:
+            next_frame = now + 1.0 / RENDER_HZ
+            t0 = time.perf_counter()
+            if GAME_STATE == "RUNNING": items = dashboard_items(grid, mouse_pos, time.time())
+            else: items = screen_items(grid)
+            changed = renderer.frame(items)
+            if changed: cv2.imshow("GridMaster AI", renderer.canvas)
+            pacing.record(changed, time.perf_counter() - t0, renderer.painted_px / (WIDTH * HEIGHT))
+
+        # 3. Input: the only waitKey, sleeping until the next tick or frame is due
+        deadline = min(next_frame, next_tick) if GAME_STATE == "RUNNING" else next_frame
+        key = cv2.waitKey(max(1, int((deadline - time.perf_counter()) * 1000))) & 0xFF
+        if key == ord('q'): break
+
+        if GAME_STATE == "MENU" and key == 32: # Space
+            GAME_STATE = "RUNNING"
+            grid.events.close()
+            grid = GridSystem(event_path=EVENT_LOG)
+            next_tick = time.perf_counter()
+        elif GAME_STATE == "BLACKOUT" and key == ord('r'):
             GAME_STATE = "MENU"
-            FREQUENCY = 50.00
 
-    cv2.imshow("GridMaster AI", img)
-    if cv2.waitKey(1) & 0xFF == ord('q'): break
+    cv2.destroyAllWindows()
+    grid.events.close()
+    print(pacing.report())
 
-cv2.destroyAllWindows()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
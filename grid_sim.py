@@ -0,0 +1,138 @@
+"""Headless, faster-than-real-time GridMaster simulation and Monte Carlo runs.
+
+An episode drives one GridSystem on a simulated clock (SIM_HZ ticks per
+simulated second) with a seeded RNG, so surge events and frequency noise are
+reproducible. A load-shedding policy plays the operator: it is called before
+every tick and may toggle nodes and lines through the same GridSystem methods
+the mouse uses.
+
+Episodes are spread over a process pool; per policy we report survival rate,
+time to blackout and energy unserved (MWh of demand shed or left in dead
+islands).
+
+    python grid_sim.py --policy none frequency balance --episodes 2000 --minutes 10
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from grid_master import GridSystem, SIM_HZ, LOAD
+from grid_events import SURGE
+
+class SimClock:
+    def __init__(self):
+        self.t = 0.0
+    def __call__(self):
+        return self.t
+
+# ==========================================
+# LOAD-SHEDDING POLICIES
+# ==========================================
+# policy(grid, t) runs before each tick; it acts through grid.toggle_node / toggle_line.
+def sheddable(grid):
+    return [i for i, n in enumerate(grid.nodes) if n.type == "LOAD" and not n.critical]
+
+def policy_none(grid, t):
+    pass
+
+def policy_frequency(grid, t, low=49.4, high=50.2):
+    # Under-frequency relay: shed the biggest load below `low`, restore the smallest above `high`
+    if grid.frequency < low:
+        on = [i for i in sheddable(grid) if grid.nodes[i].active]
+        if on: grid.toggle_node(max(on, key=lambda i: grid.nodes[i].mw))
+    elif grid.frequency > high:
+        off = [i for i in sheddable(grid) if not grid.nodes[i].active]
+        if off: grid.toggle_node(min(off, key=lambda i: grid.nodes[i].mw))
+
+def policy_balance(grid, t):
+    # Dispatcher: keep demand within generation, serving the largest loads that fit
+    supply = sum(n.mw for n in grid.nodes if n.type == "GEN" and n.active)
+    budget = supply - sum(n.mw for n in grid.nodes if n.type == "LOAD" and n.critical and n.active)
+    for i in sorted(sheddable(grid), key=lambda i: -grid.nodes[i].mw):
+        fits = grid.nodes[i].mw <= budget
+        if fits: budget -= grid.nodes[i].mw
+        if grid.nodes[i].active != fits: grid.toggle_node(i)
+
+POLICIES = {"none": policy_none, "frequency": policy_frequency, "balance": policy_balance}
+
+# ==========================================
+# EPISODES
+# ==========================================
+def unserved_mw(grid):
+    # Demand that is switched off or sits in an island without generation
+    nodes = grid.nodes
+    live = grid.net.energized[grid.net.labels]
+    return float(nodes.mw[(nodes.kind == LOAD) & ~(nodes.active & live)].sum())
+
+def run_episode(policy, seed, seconds=600.0, sim_hz=SIM_HZ):
+    clock = SimClock()
+    grid = GridSystem(clock=clock, seed=seed)
+    act = POLICIES[policy] if isinstance(policy, str) else policy
+    dt = 1.0 / sim_hz
+    unserved_mwh = 0.0
+    ticks = int(seconds * sim_hz)
+    for _ in range(ticks):
+        clock.t += dt
+        act(grid, clock.t)
+        grid.update()
+        unserved_mwh += unserved_mw(grid) * dt / 3600
+        if grid.blackout: break
+    return {"seed": seed, "blackout": grid.blackout,
+            "time_s": clock.t, "unserved_mwh": unserved_mwh, "surges": int(grid.events.counts[SURGE])}
+
+def run_batch(policy, seeds, seconds):
+    return [run_episode(policy, s, seconds) for s in seeds]
+
+def monte_carlo(policy, episodes, seconds, workers, seed=0, batch=50):
+    seeds = list(range(seed, seed + episodes))
+    batches = [seeds[i:i + batch] for i in range(0, len(seeds), batch)]
+    with ProcessPoolExecutor(workers) as pool:
+        results = [r for rs in pool.map(run_batch, [policy] * len(batches), batches, [seconds] * len(batches)) for r in rs]
+    return results
+
+def summarize(results, seconds):
+    t = np.array([r["time_s"] for r in results])
+    out = np.array([r["blackout"] for r in results])
+    mwh = np.array([r["unserved_mwh"] for r in results])
+    tb = t[out]
+    return {
+        "episodes": len(results), "survival": float(1 - out.mean()) if len(out) else 0.0,
+        "blackout_p10_s": float(np.percentile(tb, 10)) if tb.size else None,
+        "blackout_p50_s": float(np.percentile(tb, 50)) if tb.size else None,
+        "unserved_mwh_mean": float(mwh.mean()) if mwh.size else 0.0,
+        "unserved_mwh_p90": float(np.percentile(mwh, 90)) if mwh.size else 0.0,
+        "horizon_s": seconds,
+    }
+
+def main():
+    ap = argparse.ArgumentParser(description="Evaluate load-shedding policies headlessly.")
+    ap.add_argument("--policy", nargs="+", choices=sorted(POLICIES), default=["none", "frequency", "balance"])
+    ap.add_argument("--episodes", type=int, default=1000)
+    ap.add_argument("--minutes", type=float, default=10, help="simulated minutes per episode")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--json", action="store_true")
+    args = ap.parse_args()
+
+    seconds = args.minutes * 60
+    report = {}
+    for policy in args.policy:
+        t0 = time.perf_counter()
+        results = monte_carlo(policy, args.episodes, seconds, args.workers, args.seed)
+        report[policy] = summarize(results, seconds)
+        report[policy]["wall_s"] = time.perf_counter() - t0
+        if not args.json:
+            r = report[policy]
+            p50 = f"{r['blackout_p50_s']:.0f} s" if r["blackout_p50_s"] is not None else "-"
+            speed = sum(x["time_s"] for x in results) / r["wall_s"]
+            print(f"{policy:<10} survival {r['survival']:6.1%}  blackout p50 {p50:>7}  "
+                  f"unserved {r['unserved_mwh_mean']:7.2f} MWh (p90 {r['unserved_mwh_p90']:.2f})  "
+                  f"{speed:,.0f}x real time")
+    if args.json: print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,14 @@ import cv2
 import numpy as np
 import math
 
+from nirman_vertical import VerticalityEngine
+
 # --- CONFIGURATION ---
 WIDTH, HEIGHT = 1280, 720
 CURRENT_MODE = "MENU"
 REPORT = {"Cracks": "N/A", "Verticality": "N/A"}
+TRACK_CRACKS = True # CRACK mode: track cracks across frames (nirman_track) instead of detecting every frame
+VERTICALITY_ENGINE = True # VERT mode: ROI + probabilistic Hough engine (nirman_vertical) instead of check_verticality
 
 # --- COLORS ---
 C_RED = (0, 0, 255)    # Danger
@@ -27,9 +31,16 @@ def draw_ui(img, title, instruction):
     # Mode Title
     cv2.putText(img, f"MODE: {title}", (WIDTH-300, 50), cv2.FONT_HERSHEY_SIMPLEX, 0.8, C_GREEN, 2)
 
-def detect_cracks(img):
+# --- CRACK DETECTION ---
+CRACK_MIN_AREA = 100 # Ignore small noise
+CRACK_ASPECT = 5 # Long and thin: w/h above this (or below its inverse)
+HAIRLINE_WIDTH = 5 # px; wider cracks are structural
+SEVERITY = ("NO CRACKS", "HAIRLINE (PLASTER ONLY)", "STRUCTURAL FAILURE (EVACUATE)")
+SEVERITY_COLORS = (C_GREEN, C_YELLOW, C_RED)
+
+def crack_contours(img):
     # 1. Convert to Gray
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
     
     # 2. Blur to remove noise
     blur = cv2.GaussianBlur(gray, (5, 5), 0)
@@ -39,39 +50,65 @@ def detect_cracks(img):
     
     # 4. Find Contours
     contours, _ = cv2.findContours(edges, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
-    
-    crack_severity = "SAFE"
-    max_width = 0
-    
-    for cnt in contours:
-        area = cv2.contourArea(cnt)
-        if area > 100: # Ignore small noise
-            x, y, w, h = cv2.boundingRect(cnt)
-            
-            # Logic: If it's long and thin, it's a crack
-            aspect_ratio = float(w)/h if h>0 else 0
-            if aspect_ratio < 0.2 or aspect_ratio > 5:
-                # Draw the crack
-                cv2.drawContours(img, [cnt], -1, C_RED, 2)
-                
-                # Measure "width" (approximation)
-                current_width = min(w, h)
-                if current_width > max_width: max_width = current_width
-    
-    # Civil Engineering Logic
-    if max_width == 0:
-        crack_severity = "NO CRACKS"
-        col = C_GREEN
-    elif max_width < 5:
-        crack_severity = "HAIRLINE (PLASTER ONLY)"
-        col = C_YELLOW
-    else:
-        crack_severity = "STRUCTURAL FAILURE (EVACUATE)"
-        col = C_RED
-        
-    cv2.putText(img, f"STATUS: {crack_severity}", (50, 200), cv2.FONT_HERSHEY_SIMPLEX, 1, col, 3)
+    return contours
+
+def contour_stats(contours):
+    # Area (as cv2.contourArea) and bounding box (as cv2.boundingRect) of every
+    # contour at once: points are packed into one array and reduced per contour
+    if not len(contours): return np.zeros(0), np.zeros((0, 4), np.int64)
+    lengths = np.fromiter((len(c) for c in contours), np.int64, len(contours))
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    pts = np.concatenate(contours).reshape(-1, 2).astype(np.int64)
+    x, y = pts[:, 0], pts[:, 1]
+
+    # Shoelace: next point wraps to the contour's first
+    nxt = np.arange(1, len(pts) + 1)
+    nxt[starts + lengths - 1] = starts
+    area = np.abs(np.add.reduceat(x * y[nxt] - x[nxt] * y, starts)) / 2
+
+    x0, y0 = np.minimum.reduceat(x, starts), np.minimum.reduceat(y, starts)
+    x1, y1 = np.maximum.reduceat(x, starts), np.maximum.reduceat(y, starts)
+    return area, np.stack([x0, y0, x1 - x0 + 1, y1 - y0 + 1], axis=1)
+
+def crack_mask(area, boxes):
+    # Ignore small noise; long and thin is a crack
+    w, h = boxes[:, 2].astype(np.float64), boxes[:, 3]
+    aspect = w / h
+    return (area > CRACK_MIN_AREA) & ((aspect < 1 / CRACK_ASPECT) | (aspect > CRACK_ASPECT))
+
+def find_cracks(img):
+    # Pure detector (img is not modified): [(contour, (x, y, w, h), width), ...]
+    contours = crack_contours(img)
+    area, boxes = contour_stats(contours)
+    keep = np.flatnonzero(crack_mask(area, boxes))
+    # Measure "width" (approximation)
+    widths = boxes[keep, 2:].min(axis=1)
+    return [(contours[i], tuple(boxes[i].tolist()), int(wd)) for i, wd in zip(keep.tolist(), widths.tolist())]
+
+def severity(max_width):
+    # Civil Engineering Logic: index into SEVERITY
+    if max_width == 0: return 0
+    return 1 if max_width < HAIRLINE_WIDTH else 2
+
+def draw_cracks(img, contours, level):
+    # Draw the cracks
+    if contours: cv2.drawContours(img, contours, -1, C_RED, 2)
+    crack_severity = SEVERITY[level]
+    cv2.putText(img, f"STATUS: {crack_severity}", (50, 200), cv2.FONT_HERSHEY_SIMPLEX, 1, SEVERITY_COLORS[level], 3)
     return crack_severity
 
+def detect_cracks(img):
+    cracks = find_cracks(img)
+    return draw_cracks(img, [c[0] for c in cracks], severity(max((c[2] for c in cracks), default=0)))
+
+def track_cracks(img, tracker):
+    # One record per physical crack: fused width and id next to each
+    tracks = tracker.process(img)
+    for t in tracks:
+        x, y = np.round(t.predicted_box()[:2]).astype(int)
+        cv2.putText(img, f"#{t.id} {t.width():.0f}px", (int(x), int(y) - 5), cv2.FONT_HERSHEY_SIMPLEX, 0.5, C_YELLOW, 1)
+    return draw_cracks(img, [t.drawable() for t in tracks], tracker.level)
+
 def check_verticality(img):
     # This simulates a "Plumb Bob" using image lines
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
@@ -123,52 +160,96 @@ def check_verticality(img):
     cv2.putText(img, status, (50, 200), cv2.FONT_HERSHEY_SIMPLEX, 1, col, 3)
     return status
 
+def measure_verticality(img, engine):
+    r = engine.process(img)
+    x, y, w, h = r.roi
+    cv2.rectangle(img, (x, y), (x+w, y+h), (255, 255, 0), 1)
+    if len(r.lines): cv2.polylines(img, r.lines.round().astype(np.int32).reshape(-1, 2, 2), False, (255, 0, 0), 2)
+    
+    # Visual Plumb Line (Reference), through the ROI
+    cv2.line(img, (x + w//2, y), (x + w//2, y + h), C_GREEN, 1)
+    
+    if r.deviation is None or r.confidence < 0.15:
+        status, col = "SEARCHING FOR PILLAR...", C_WHITE
+    else:
+        # Civil Engineering Tolerance: 90 degrees +/- 1 degree
+        deviation = abs(r.deviation)
+        if deviation < 2: status, col = f"PERFECTLY VERTICAL (Dev: {r.deviation:+.1f} deg)", C_GREEN
+        elif deviation < 5: status, col = f"WARNING: LEANING (Dev: {r.deviation:+.1f} deg)", C_YELLOW
+        else: status, col = f"DANGER: UNSTABLE (Dev: {r.deviation:+.1f} deg)", C_RED
+    cv2.putText(img, status, (50, 200), cv2.FONT_HERSHEY_SIMPLEX, 1, col, 3)
+    mean, p95 = engine.timing()
+    cv2.putText(img, f"CONFIDENCE {r.confidence:.0%} | {len(r.lines)} LINES | {mean:.1f} ms/frame (p95 {p95:.1f})",
+                (50, 240), cv2.FONT_HERSHEY_SIMPLEX, 0.6, C_WHITE, 1)
+    return status
+
 # ==========================================
 # MAIN LOOP
 # ==========================================
-cap = cv2.VideoCapture(0)
-cap.set(3, WIDTH)
-cap.set(4, HEIGHT)
+def main():
+    global CURRENT_MODE
+    from nirman_track import CrackTracker # Imports this module's detector
+    tracker = None
+    engine = VerticalityEngine()
+    cap = cv2.VideoCapture(0)
+    cap.set(3, WIDTH)
+    cap.set(4, HEIGHT)
 
-while True:
-    success, img = cap.read()
-    if not success: continue
+    while True:
+        success, img = cap.read()
+        if not success: continue
     
-    # Mode Selector
-    if CURRENT_MODE == "MENU":
-        cv2.rectangle(img, (0,0), (WIDTH, HEIGHT), C_BLACK, -1)
-        cv2.putText(img, "NIRMAN AI", (450, 200), cv2.FONT_HERSHEY_SIMPLEX, 2, C_WHITE, 4)
-        cv2.putText(img, "Sustainable Infrastructure Audit", (380, 250), cv2.FONT_HERSHEY_SIMPLEX, 0.8, C_GREEN, 1)
+        # Mode Selector
+        if CURRENT_MODE == "MENU":
+            cv2.rectangle(img, (0,0), (WIDTH, HEIGHT), C_BLACK, -1)
+            cv2.putText(img, "NIRMAN AI", (450, 200), cv2.FONT_HERSHEY_SIMPLEX, 2, C_WHITE, 4)
+            cv2.putText(img, "Sustainable Infrastructure Audit", (380, 250), cv2.FONT_HERSHEY_SIMPLEX, 0.8, C_GREEN, 1)
         
-        cv2.rectangle(img, (200, 400), (500, 500), (50, 50, 50), -1)
-        cv2.putText(img, "1. CRACK CHECK", (230, 460), cv2.FONT_HERSHEY_SIMPLEX, 0.7, C_WHITE, 2)
+            cv2.rectangle(img, (200, 400), (500, 500), (50, 50, 50), -1)
+            cv2.putText(img, "1. CRACK CHECK", (230, 460), cv2.FONT_HERSHEY_SIMPLEX, 0.7, C_WHITE, 2)
         
-        cv2.rectangle(img, (700, 400), (1000, 500), (50, 50, 50), -1)
-        cv2.putText(img, "2. VERTICALITY", (730, 460), cv2.FONT_HERSHEY_SIMPLEX, 0.7, C_WHITE, 2)
+            cv2.rectangle(img, (700, 400), (1000, 500), (50, 50, 50), -1)
+            cv2.putText(img, "2. VERTICALITY", (730, 460), cv2.FONT_HERSHEY_SIMPLEX, 0.7, C_WHITE, 2)
         
-        cv2.putText(img, "Press [1] or [2] on Keyboard", (450, 600), cv2.FONT_HERSHEY_SIMPLEX, 0.8, C_YELLOW, 2)
+            cv2.putText(img, "Press [1] or [2] on Keyboard", (450, 600), cv2.FONT_HERSHEY_SIMPLEX, 0.8, C_YELLOW, 2)
         
-        key = cv2.waitKey(1)
-        if key == ord('1'): CURRENT_MODE = "CRACK"
-        if key == ord('2'): CURRENT_MODE = "VERT"
+            key = cv2.waitKey(1)
+            if key == ord('1'):
+                CURRENT_MODE = "CRACK"
+                tracker = CrackTracker() # Fresh tracks per inspection
+            if key == ord('2'):
+                CURRENT_MODE = "VERT"
+                engine = VerticalityEngine()
 
-    elif CURRENT_MODE == "CRACK":
-        result = detect_cracks(img)
-        draw_ui(img, "CRACK DETECTOR", "Point at a wall. 'Q' to Quit, 'M' for Menu.")
+        elif CURRENT_MODE == "CRACK":
+            if TRACK_CRACKS: track_cracks(img, tracker)
+            else: detect_cracks(img)
+            draw_ui(img, "CRACK DETECTOR", "Point at a wall. 'Q' to Quit, 'M' for Menu.")
         
-        key = cv2.waitKey(1)
-        if key == ord('q'): break
-        if key == ord('m'): CURRENT_MODE = "MENU"
+            key = cv2.waitKey(1)
+            if key == ord('q'): break
+            if key == ord('m'): CURRENT_MODE = "MENU"
 
-    elif CURRENT_MODE == "VERT":
-        result = check_verticality(img)
-        draw_ui(img, "DIGITAL PLUMB BOB", "Align pillar with screen center. 'Q' to Quit.")
+        elif CURRENT_MODE == "VERT":
+            if VERTICALITY_ENGINE:
+                frame = img.copy() # Clean frame for ROI selection
+                measure_verticality(img, engine)
+                draw_ui(img, "DIGITAL PLUMB BOB", "'R' select pillar, 'A' auto pillar. 'Q' to Quit.")
+            else:
+                check_verticality(img)
+                draw_ui(img, "DIGITAL PLUMB BOB", "Align pillar with screen center. 'Q' to Quit.")
         
-        key = cv2.waitKey(1)
-        if key == ord('q'): break
-        if key == ord('m'): CURRENT_MODE = "MENU"
+            key = cv2.waitKey(1)
+            if key == ord('q'): break
+            if key == ord('m'): CURRENT_MODE = "MENU"
+            if VERTICALITY_ENGINE and key == ord('r'):
+                engine.select_roi(cv2.selectROI("Nirman AI - Hult Prize", frame, showCrosshair=False))
+            if VERTICALITY_ENGINE and key == ord('a'): engine.select_roi(None)
+
+        cv2.imshow("Nirman AI - Hult Prize", img)
 
-    cv2.imshow("Nirman AI - Hult Prize", img)
+    cap.release()
+    cv2.destroyAllWindows()
 
-cap.release()
-cv2.destroyAllWindows()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
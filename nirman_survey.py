@@ -0,0 +1,147 @@
+"""Batch crack survey over archives of wall photos and inspection videos.
+
+Images (and sampled video frames) are run through nirman_ai.find_cracks in a
+process pool: grayscale, blur, Canny, contours, long-and-thin filter. Every
+image gets one compact record in an append-only JSONL index:
+
+    {"key": "3f9c...", "src": "site4/wall_012.jpg", "size": [1280, 720],
+     "sev": 1, "max_w": 4, "cracks": [[x, y, w, h, width, sev], ...]}
+
+sev indexes nirman_ai.SEVERITY (0 no cracks, 1 hairline, 2 structural), per
+crack and for the image (its widest crack). Video frames are stored with
+"frame": n. key is the sha256 of the image file (video: "<sha256>@<frame>"),
+so on a re-run only content not yet in the index (including renamed or
+copied photos from earlier runs) is decoded. Copies met within one run are
+hashed in different workers, so they may all be analysed, but only the first
+is written to the index.
+
+    python nirman_survey.py site4/ site5/walkthrough.mp4 --index survey.jsonl --workers 8
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+
+from nirman_ai import find_cracks, severity, SEVERITY
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp")
+VIDEO_EXTS = (".mp4", ".avi", ".mov", ".mkv")
+
+_known = frozenset() # Keys already in the index (set once per worker)
+
+# ==========================================
+# FILES & INDEX
+# ==========================================
+def find_sources(paths):
+    found = []
+    for p in paths:
+        if os.path.isfile(p):
+            found.append(p)
+            continue
+        for dirpath, _, names in os.walk(p):
+            found += [os.path.join(dirpath, n) for n in names if n.lower().endswith(IMAGE_EXTS + VIDEO_EXTS)]
+    return sorted(found)
+
+def file_hash(path, block=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(block), b""): h.update(chunk)
+    return h.hexdigest()
+
+def load_index(path):
+    # Keys already surveyed; a torn last line (interrupted run) is ignored
+    keys = set()
+    if not os.path.exists(path): return keys
+    with open(path) as f:
+        for line in f:
+            try: keys.add(json.loads(line)["key"])
+            except (ValueError, KeyError): pass
+    return keys
+
+# ==========================================
+# SURVEY (worker side)
+# ==========================================
+def init_worker(known):
+    global _known
+    _known = known
+    cv2.setNumThreads(1) # One core per worker; the pool provides the parallelism
+
+def record(key, src, img):
+    cracks = [[*box, int(width), severity(width)] for _, box, width in find_cracks(img)]
+    max_w = max((c[4] for c in cracks), default=0)
+    h, w = img.shape[:2]
+    return {"key": key, "src": src, "size": [w, h], "sev": severity(max_w), "max_w": max_w, "cracks": cracks}
+
+def survey(path, every=30):
+    # -> (records, images analysed, busy seconds, pid)
+    t0 = time.perf_counter()
+    digest = file_hash(path)
+    rows = []
+    if path.lower().endswith(VIDEO_EXTS):
+        cap = cv2.VideoCapture(path)
+        frame = 0
+        while cap.grab():
+            key = f"{digest}@{frame}"
+            if frame % every == 0 and key not in _known:
+                success, img = cap.retrieve() # Decode sampled frames only
+                if success:
+                    rows.append(record(key, path, img))
+                    rows[-1]["frame"] = frame
+            frame += 1
+        cap.release()
+    elif digest not in _known:
+        img = cv2.imread(path)
+        if img is not None: rows.append(record(digest, path, img))
+    return rows, len(rows), time.perf_counter() - t0, os.getpid()
+
+# ==========================================
+# CLI
+# ==========================================
+def main():
+    ap = argparse.ArgumentParser(description="Survey image folders and videos for cracks.")
+    ap.add_argument("sources", nargs="+", help="image folders, image files or videos")
+    ap.add_argument("--index", default="crack_index.jsonl", help="JSONL index (appended to)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--every", type=int, default=30, help="analyse every Nth video frame")
+    args = ap.parse_args()
+
+    known = frozenset(load_index(args.index))
+    sources = find_sources(args.sources)
+    print(f"{len(sources)} files, {len(known)} images already indexed, {args.workers} workers")
+
+    per_worker = {} # pid -> [images, seconds]
+    counts = [0] * len(SEVERITY)
+    seen = set(known) # Plus keys written in this run (workers only know the index at start)
+    dupes = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(args.workers, initializer=init_worker, initargs=(known,)) as pool, \
+         open(args.index, "a") as index:
+        results = pool.map(survey, sources, [args.every] * len(sources), chunksize=8)
+        for path, (rows, n, seconds, pid) in zip(sources, results):
+            for row in rows:
+                if row["key"] in seen:
+                    dupes += 1
+                    continue
+                seen.add(row["key"])
+                index.write(json.dumps(row, separators=(",", ":")) + "\n")
+                counts[row["sev"]] += 1
+            index.flush()
+            stat = per_worker.setdefault(pid, [0, 0.0])
+            stat[0] += n
+            stat[1] += seconds
+
+    wall = time.perf_counter() - start
+    total = sum(n for n, _ in per_worker.values())
+    for pid, (n, seconds) in sorted(per_worker.items()):
+        print(f"worker {pid:<7} {n:>7} images  {n / max(seconds, 1e-9):7.1f} images/s")
+    print(f"total {total} new images in {wall:.1f} s: {total / max(wall, 1e-9):.1f} images/s, "
+          f"{total / max(wall, 1e-9) / max(len(per_worker), 1):.1f} images/s per core"
+          + (f" ({dupes} duplicate copies not indexed)" if dupes else ""))
+    for label, n in zip(SEVERITY, counts): print(f"  {label:<32} {n}")
+
+if __name__ == "__main__":
+    main()
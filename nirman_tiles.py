@@ -0,0 +1,196 @@
+"""Tiled crack detection for facade orthomosaics too large to hold in memory.
+
+The image is opened without loading it (.npy via np.load(mmap_mode="r"),
+uncompressed TIFF via tifffile.memmap, tiled/compressed TIFF via tifffile +
+zarr windows) and cut into tiles with an overlap margin. Each worker reads
+only its tile window and runs the nirman_ai crack pipeline on it, so peak
+memory is about workers x (tile + 2 overlap)^2 pixels whatever the facade size.
+
+Cracks crossing tile borders are stitched. A contour whose box stays inside
+its tile's core (away from the overlap band) is complete and final. Contours
+in the band are kept as candidates; candidates of neighbouring tiles whose
+boxes intersect are joined (connected components). In each group every
+complete (interior) contour is a crack, once: tiles sharing the band see the
+same contour, so near-identical boxes are kept only once, while separate
+cracks whose boxes merely overlap stay separate. Fragments inside such a
+crack's box are parts of it; the remaining fragments are joined into one
+crack, the union of their boxes. A crack cut by a window edge leaves open Canny curves
+with almost no enclosed area, so a union of fragments is sized by its box
+(length x width) rather than by the fragments' summed area. The nirman_ai
+rules (area, aspect, width = min(w, h), severity) are applied to the stitched
+crack, and max width / severity are aggregated over the whole facade.
+
+    python nirman_tiles.py facade.npy --tile 2048 --overlap 64 --workers 8 --out facade_cracks.json
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from nirman_ai import crack_contours, contour_stats, crack_mask, severity, SEVERITY
+
+try:
+    import tifffile
+except ImportError:
+    tifffile = None
+
+try:
+    import resource # Peak RSS per worker (not on Windows)
+except ImportError:
+    resource = None
+
+_image = None # Per worker: the lazily-read facade
+
+# ==========================================
+# WINDOWED IMAGE ACCESS
+# ==========================================
+def open_image(path):
+    # Array-like supporting img[y0:y1, x0:x1] that reads only that window
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".npy": return np.load(path, mmap_mode="r")
+    if ext in (".tif", ".tiff"):
+        if tifffile is None: raise ValueError("reading TIFF needs tifffile (pip install tifffile)")
+        try:
+            return tifffile.memmap(path, mode="r") # Uncompressed, contiguous
+        except ValueError:
+            import zarr # Tiled / compressed: decode only the TIFF tiles a window touches
+            return zarr.open(tifffile.imread(path, aszarr=True), mode="r")
+    raise ValueError(f"{ext} cannot be read in windows; convert to .npy or an uncompressed TIFF")
+
+def tile_grid(h, w, tile):
+    return [(y, x) for y in range(0, h, tile) for x in range(0, w, tile)]
+
+# ==========================================
+# PER TILE (worker side)
+# ==========================================
+def init_worker(path):
+    global _image
+    cv2.setNumThreads(1)
+    _image = open_image(path)
+
+def process_tile(origin, tile, overlap):
+    # -> (origin, final cracks [[x, y, w, h]], candidates (k, 6): x, y, w, h, area, interior), peak KB
+    y, x = origin
+    H, W = _image.shape[:2]
+    wy0, wx0 = max(0, y - overlap), max(0, x - overlap)
+    wy1, wx1 = min(H, y + tile + overlap), min(W, x + tile + overlap)
+    window = np.ascontiguousarray(_image[wy0:wy1, wx0:wx1])
+
+    # Band: within `overlap` of the core edge (image edges have no neighbour)
+    by0 = y + overlap if y > 0 else -1
+    bx0 = x + overlap if x > 0 else -1
+    by1 = y + tile - overlap if y + tile < H else H + 1
+    bx1 = x + tile - overlap if x + tile < W else W + 1
+
+    area, boxes = contour_stats(crack_contours(window))
+    gx, gy, cw, ch = boxes[:, 0] + wx0, boxes[:, 1] + wy0, boxes[:, 2], boxes[:, 3]
+    gboxes = np.stack([gx, gy, cw, ch], axis=1)
+    interior = ((gx > wx0) | (wx0 == 0)) & ((gy > wy0) | (wy0 == 0)) & \
+               ((gx + cw < wx1) | (wx1 == W)) & ((gy + ch < wy1) | (wy1 == H))
+    # Complete and in this tile's core only: no other tile sees it whole
+    core = interior & (gx >= bx0) & (gy >= by0) & (gx + cw <= bx1) & (gy + ch <= by1)
+    final = gboxes[core & crack_mask(area, boxes)].tolist()
+    # Band or cut by the window edge: resolved in stitch()
+    cand = ~core & (gx < x + tile) & (gy < y + tile) & (gx + cw > x) & (gy + ch > y)
+    cands = np.column_stack([gboxes[cand], area[cand], interior[cand]]).astype(np.float64)
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else 0
+    return origin, final, cands, peak
+
+# ==========================================
+# STITCHING
+# ==========================================
+def stitch(tiles, tile, dup_px=2):
+    # tiles: {(y, x): candidates}; candidates of neighbouring tiles with intersecting boxes are joined.
+    # Complete contours whose boxes differ by <= dup_px on every side are one crack.
+    keys = list(tiles)
+    offsets = np.cumsum([0] + [len(tiles[k]) for k in keys])
+    start = dict(zip(keys, offsets[:-1]))
+    allc = np.concatenate([tiles[k] for k in keys]) if keys else np.zeros((0, 6))
+    rows, cols = [], []
+    for (y, x) in keys:
+        a = tiles[(y, x)]
+        for dy, dx in ((0, tile), (tile, -tile), (tile, 0), (tile, tile)):
+            b = tiles.get((y + dy, x + dx))
+            if b is None or not len(a) or not len(b): continue
+            hit = (a[:, None, 0] <= b[None, :, 0] + b[None, :, 2]) & (b[None, :, 0] <= a[:, None, 0] + a[:, None, 2]) & \
+                  (a[:, None, 1] <= b[None, :, 1] + b[None, :, 3]) & (b[None, :, 1] <= a[:, None, 1] + a[:, None, 3])
+            i, j = np.nonzero(hit)
+            rows.append(i + start[(y, x)])
+            cols.append(j + start[(y + dy, x + dx)])
+    n = len(allc)
+    if not n: return []
+    i = np.concatenate(rows) if rows else np.zeros(0, int)
+    j = np.concatenate(cols) if cols else np.zeros(0, int)
+    _, labels = connected_components(coo_matrix((np.ones(len(i)), (i, j)), shape=(n, n)), directed=False)
+
+    merged = []
+    order = np.argsort(labels, kind="stable")
+    bounds = np.flatnonzero(np.diff(labels[order])) + 1
+    for group in np.split(order, bounds):
+        g = allc[group]
+        whole = g[g[:, 5] > 0]
+        kept = []
+        for c in whole[np.argsort(-whole[:, 4], kind="stable")]: # Largest first
+            if not any((np.abs(c[:4] - k[:4]) <= dup_px).all() for k in kept): kept.append(c[:5])
+        merged += kept
+        frag = g[g[:, 5] == 0]
+        if kept and len(frag): # Drop fragments lying inside a complete crack's box
+            k = np.array(kept)
+            inside = (frag[:, None, 0] >= k[None, :, 0] - dup_px) & (frag[:, None, 1] >= k[None, :, 1] - dup_px) & \
+                     (frag[:, None, 0] + frag[:, None, 2] <= k[None, :, 0] + k[None, :, 2] + dup_px) & \
+                     (frag[:, None, 1] + frag[:, None, 3] <= k[None, :, 1] + k[None, :, 3] + dup_px)
+            frag = frag[~inside.any(axis=1)]
+        if len(frag):
+            x0, y0 = frag[:, 0].min(), frag[:, 1].min()
+            x1, y1 = (frag[:, 0] + frag[:, 2]).max(), (frag[:, 1] + frag[:, 3]).max()
+            merged.append([x0, y0, x1 - x0, y1 - y0, (x1 - x0) * (y1 - y0)]) # Cut fragments enclose ~0 area: use the box
+    merged = np.array(merged).reshape(-1, 5)
+    return merged[crack_mask(merged[:, 4], merged[:, :4]), :4].astype(int).tolist()
+
+# ==========================================
+# CLI
+# ==========================================
+def main():
+    ap = argparse.ArgumentParser(description="Tiled crack detection for very large facade images.")
+    ap.add_argument("image", help=".npy or .tif facade orthomosaic")
+    ap.add_argument("--tile", type=int, default=2048)
+    ap.add_argument("--overlap", type=int, default=64, help="px read around each tile (> widest crack)")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--out", default=None, help="write the crack list and summary as JSON")
+    args = ap.parse_args()
+
+    H, W = open_image(args.image).shape[:2]
+    origins = tile_grid(H, W, args.tile)
+    print(f"{W}x{H} px, {len(origins)} tiles of {args.tile} px (+{args.overlap} overlap), {args.workers} workers")
+
+    t0 = time.perf_counter()
+    final, tiles, peak = [], {}, 0
+    with ProcessPoolExecutor(args.workers, initializer=init_worker, initargs=(args.image,)) as pool:
+        n = len(origins)
+        for origin, f, cands, kb in pool.map(process_tile, origins, [args.tile] * n, [args.overlap] * n, chunksize=4):
+            final += f
+            tiles[origin] = cands
+            peak = max(peak, kb)
+    stitched = stitch(tiles, args.tile)
+    cracks = [[*c, min(c[2], c[3]), severity(min(c[2], c[3]))] for c in final + stitched]
+    wall = time.perf_counter() - t0
+
+    max_w = max((c[4] for c in cracks), default=0)
+    level = severity(max_w)
+    counts = np.bincount([c[5] for c in cracks], minlength=len(SEVERITY)) if cracks else np.zeros(len(SEVERITY), int)
+    print(f"{len(cracks)} cracks ({len(stitched)} stitched across tiles), max width {max_w} px -> {SEVERITY[level]}")
+    for label, k in zip(SEVERITY[1:], counts[1:]): print(f"  {label:<32} {k}")
+    print(f"{wall:.1f} s, {H * W / 1e6 / wall:.1f} Mpx/s" + (f", peak worker RSS {peak / 1024:.0f} MB" if peak else ""))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"image": args.image, "size": [W, H], "tile": args.tile, "overlap": args.overlap,
+                       "max_w": max_w, "sev": level, "cracks": cracks}, f)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Temporal crack tracking for NIRMAN AI's CRACK mode.
+
+Full detection (nirman_ai.find_cracks) runs only on keyframes. Between them,
+camera motion is measured with sparse Lucas-Kanade optical flow (a few dozen
+corners, small window, 2 pyramid levels) on a quarter-size grayscale frame,
+and every tracked crack is shifted by the median flow. A new keyframe is taken
+when
+
+    - it is the first frame                                -> "start"
+    - the camera's net shift since the last keyframe
+      exceeds motion_thresh px (jitter cancels out)        -> "motion"
+    - too few flow points survived (blur, occlusion)       -> "lost"
+    - keyframe_every frames passed                         -> "refresh"
+
+On a keyframe, detections are matched to the (flow-predicted) tracks by box
+IoU. Each track keeps the widths measured at its keyframes, and its fused
+width is their median, so one physical crack becomes one stable record with a
+severity that does not flicker frame to frame.
+
+Compare with per-frame detection on recorded footage:
+
+    python nirman_track.py walkthrough.mp4
+"""
+import argparse
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from nirman_ai import find_cracks, severity, SEVERITY
+
+class CrackTrack:
+    __slots__ = ("id", "contour", "box", "offset", "widths", "hits", "missed", "first_frame")
+
+    def __init__(self, tid, contour, box, width, frame, evidence):
+        self.id = tid
+        self.contour = contour # As detected at the last keyframe
+        self.box = np.array(box, np.float64) # x, y, w, h at the last keyframe
+        self.offset = np.zeros(2) # Camera motion since then
+        self.widths = deque([width], maxlen=evidence)
+        self.hits = 1
+        self.missed = 0
+        self.first_frame = frame
+
+    def width(self):
+        # Fused width: median of the keyframe measurements
+        return float(np.median(self.widths))
+
+    def predicted_box(self):
+        return self.box + [self.offset[0], self.offset[1], 0, 0]
+
+    def drawable(self):
+        return self.contour + np.round(self.offset).astype(self.contour.dtype)
+
+def iou_matrix(a, b, pad=4):
+    # Box IoU, (n, 4) x (m, 4) xywh; thin boxes padded so a 1 px shift still overlaps
+    a0, a1 = a[:, None, :2] - pad, a[:, None, :2] + a[:, None, 2:] + pad
+    b0, b1 = b[None, :, :2] - pad, b[None, :, :2] + b[None, :, 2:] + pad
+    inter = np.clip(np.minimum(a1, b1) - np.maximum(a0, b0), 0, None).prod(axis=2)
+    area_a, area_b = (a1 - a0).prod(axis=2), (b1 - b0).prod(axis=2)
+    return inter / (area_a + area_b - inter)
+
+class CrackTracker:
+    def __init__(self, keyframe_every=15, motion_thresh=12.0, iou_match=0.2, min_hits=2, max_missed=3,
+                 evidence=15, flow_scale=0.25, flow_points=60, min_points=20):
+        self.keyframe_every = keyframe_every
+        self.motion_thresh = motion_thresh # px of camera motion since the last keyframe
+        self.iou_match = iou_match
+        self.min_hits = min_hits # Keyframes a crack must be seen on before it is reported
+        self.max_missed = max_missed # Keyframes a crack may go unseen before it is dropped
+        self.evidence = evidence # Width measurements kept per track
+        self.flow_scale = flow_scale
+        self.flow_points = flow_points # Corners seeded per keyframe
+        self.min_points = min_points
+        self.tracks = []
+        self.next_id = 1
+        self.prev = None # Small gray frame and its flow points
+        self.pts = None
+        self.shift = np.zeros(2) # Net camera motion since the last keyframe
+        self.since_key = 0
+        self.frames = 0
+        self.keyframes = 0
+        self.reasons = {"start": 0, "motion": 0, "lost": 0, "refresh": 0}
+        self.busy = 0.0
+
+    def _small_gray(self, img):
+        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY) if img.ndim == 3 else img
+        return cv2.resize(gray, None, fx=self.flow_scale, fy=self.flow_scale, interpolation=cv2.INTER_AREA)
+
+    def _flow(self, small):
+        # Median camera shift (full-res px) since the previous frame, or None when tracking is lost
+        if self.pts is None or len(self.pts) < self.min_points: return None
+        nxt, status, _ = cv2.calcOpticalFlowPyrLK(self.prev, small, self.pts, None, winSize=(15, 15), maxLevel=2)
+        ok = status.ravel() == 1
+        if ok.sum() < self.min_points: return None
+        d = np.median(nxt[ok] - self.pts[ok], axis=0).ravel() / self.flow_scale
+        self.pts = nxt[ok].reshape(-1, 1, 2)
+        return d
+
+    def _keyframe(self, img, small, frame):
+        dets = find_cracks(img)
+        boxes = np.array([b for _, b, _ in dets], np.float64).reshape(-1, 4)
+        pred = np.array([t.predicted_box() for t in self.tracks]).reshape(-1, 4)
+
+        # Greedy IoU association, best pairs first
+        matched_t, matched_d = set(), set()
+        if len(pred) and len(boxes):
+            iou = iou_matrix(pred, boxes)
+            for k in np.argsort(iou, axis=None)[::-1]:
+                ti, di = np.unravel_index(k, iou.shape)
+                if iou[ti, di] < self.iou_match: break
+                if ti in matched_t or di in matched_d: continue
+                matched_t.add(ti)
+                matched_d.add(di)
+                t = self.tracks[ti]
+                t.contour, t.box, t.offset = dets[di][0], boxes[di], np.zeros(2)
+                t.widths.append(dets[di][2])
+                t.hits += 1
+                t.missed = 0
+        for ti, t in enumerate(self.tracks):
+            if ti not in matched_t: t.missed += 1
+        self.tracks = [t for t in self.tracks if t.missed <= self.max_missed]
+        for di, (cnt, box, width) in enumerate(dets):
+            if di in matched_d: continue
+            self.tracks.append(CrackTrack(self.next_id, cnt, box, width, frame, self.evidence))
+            self.next_id += 1
+
+        self.pts = cv2.goodFeaturesToTrack(small, self.flow_points, 0.01, 8)
+        self.shift = np.zeros(2)
+        self.since_key = 0
+        self.keyframes += 1
+
+    def process(self, img):
+        # -> confirmed tracks for this frame
+        t0 = time.perf_counter()
+        small = self._small_gray(img)
+        reason = None
+        d = self._flow(small) if self.prev is not None else None
+        if self.prev is None: reason = "start"
+        elif d is None: reason = "lost"
+        else:
+            self.shift += d
+            for t in self.tracks: t.offset += d
+            if np.hypot(*self.shift) > self.motion_thresh: reason = "motion"
+            elif self.since_key >= self.keyframe_every: reason = "refresh"
+        if reason:
+            self.reasons[reason] += 1
+            self._keyframe(img, small, self.frames)
+        self.prev = small
+        self.since_key += 1
+        self.frames += 1
+        self.busy += time.perf_counter() - t0
+        return self.confirmed()
+
+    def confirmed(self):
+        return [t for t in self.tracks if t.hits >= self.min_hits]
+
+    @property
+    def level(self):
+        # Severity index of the widest confirmed crack (fused widths)
+        return severity(max((t.width() for t in self.confirmed()), default=0))
+
+    def stats(self):
+        n = max(self.frames, 1)
+        return {"frames": self.frames, "keyframes": self.keyframes, "keyframe_share": self.keyframes / n,
+                "reasons": dict(self.reasons), "tracks": self.next_id - 1, "confirmed": len(self.confirmed()),
+                "ms_per_frame": self.busy / n * 1000}
+
+# ==========================================
+# EVALUATION
+# ==========================================
+def evaluate(path, **options):
+    # Per-frame detection vs tracker: CPU per frame and label changes
+    cap = cv2.VideoCapture(path)
+    tracker = CrackTracker(**options)
+    base_ms, base_flips, track_flips = 0.0, 0, 0
+    base_prev = track_prev = None
+    while True:
+        success, img = cap.read()
+        if not success: break
+        t0 = time.perf_counter()
+        level = severity(max((w for _, _, w in find_cracks(img)), default=0))
+        base_ms += (time.perf_counter() - t0) * 1000
+        base_flips += base_prev is not None and level != base_prev
+        base_prev = level
+        tracker.process(img)
+        track_flips += track_prev is not None and tracker.level != track_prev
+        track_prev = tracker.level
+    cap.release()
+    s = tracker.stats()
+    n = max(s["frames"], 1)
+    print(f"{path}: {s['frames']} frames")
+    print(f"  per-frame  {base_ms / n:6.2f} ms/frame  {base_flips:>5} severity changes")
+    print(f"  tracked    {s['ms_per_frame']:6.2f} ms/frame  {track_flips:>5} severity changes  "
+          f"(keyframes {s['keyframe_share']:.0%}: {s['reasons']}, {s['confirmed']} cracks, final {SEVERITY[tracker.level]})")
+
+def main():
+    ap = argparse.ArgumentParser(description="Compare tracked and per-frame crack detection on videos.")
+    ap.add_argument("videos", nargs="+")
+    ap.add_argument("--keyframe-every", type=int, default=15)
+    ap.add_argument("--motion", type=float, default=12.0, help="px of camera motion that forces a keyframe")
+    args = ap.parse_args()
+    for path in args.videos: evaluate(path, keyframe_every=args.keyframe_every, motion_thresh=args.motion)
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,11 @@
+from vision_kit import startup # First, so import-to-first-frame covers everything below
 import cv2
-import mediapipe as mp
-import numpy as np
 import time
-import math
+
+from vision_kit import models
+from satya_series import SeriesStore
+import satya_features
+from satya_scheduler import AdaptiveMesh
 
 # ==========================================
 # CONFIGURATION
@@ -10,6 +13,8 @@ import math
 WIDTH, HEIGHT = 1280, 720
 STRESS_THRESHOLD = 65 # Score above this = LIE
 SESSION_TIME = 30 # Seconds to survive the interrogation
+HISTORY_LEN = 5 * 60 * 30 # Samples kept per signal (5 minutes at 30 FPS)
+GRAPH_POINTS = 100 # Samples shown in the stress graph
 
 # COLORS (Cyberpunk Palette)
 C_BG = (10, 10, 20)
@@ -19,65 +24,61 @@ C_RED = (0, 0, 255) # Danger
 C_GREEN = (0, 255, 0) # Safe
 C_WHITE = (200, 200, 200)
 
-# AI SETUP
-mp_face_mesh = mp.solutions.face_mesh
-face_mesh = mp_face_mesh.FaceMesh(
+# AI SETUP (Built on first use by vision_kit.models, never at import)
+FACE_MESH_OPTIONS = dict(
     max_num_faces=1,
     refine_landmarks=True,
     min_detection_confidence=0.8,
     min_tracking_confidence=0.8
 )
+ADAPTIVE_MESH = True # Run the mesh only on eye motion / near-blinks (satya_scheduler)
 
 # ==========================================
 # BIOMETRIC ENGINE (The Deep Math)
 # ==========================================
 class Biometrics:
-    def __init__(self):
+    def __init__(self, clock=time.time):
+        self.clock = clock # Video time in batch analysis (satya_batch)
         self.blinks = 0
         self.last_blink_time = 0
         self.blink_rate = 0 # Blinks per minute
         self.gaze_deviations = 0 # How often eyes shift
         self.stress_score = 0
-        self.start_time = time.time()
+        self.start_time = clock()
         self.eye_closed = False
-        self.history = [] # For graphing
+        # Ring-buffer time series (for graphing and rolling stats)
+        self.series = SeriesStore(("stress", "blink_rate", "ear", "iris"), HISTORY_LEN)
+
+    @property
+    def history(self):
+        # Stress samples shown in the graph, oldest first (a view, not a copy)
+        return self.series.window_view("stress", GRAPH_POINTS)
 
     def update(self, landmarks, img_w, img_h):
-        # 1. BLINK DETECTION (EAR Logic)
-        # Left Eye indices
-        l_top = landmarks[159]
-        l_bot = landmarks[145]
-        l_dist = math.hypot(l_top.x - l_bot.x, l_top.y - l_bot.y)
-        
-        # Right Eye indices
-        r_top = landmarks[386]
-        r_bot = landmarks[374]
-        r_dist = math.hypot(r_top.x - r_bot.x, r_top.y - r_bot.y)
-        
-        avg_dist = (l_dist + r_dist) / 2.0
+        # Single face from raw MediaPipe landmarks
+        self.update_features(satya_features.eye_features([landmarks]))
+
+    def update_features(self, feats, face=0):
+        # feats: satya_features.extract() / extract_faces() / eye_features() output for a batch of faces
+        # 1. BLINK DETECTION (EAR Logic) - mean eyelid gap of both eyes
+        avg_dist = float(feats["lid"][face])
 
         if avg_dist < 0.012: # Eyes closed
             if not self.eye_closed:
                 self.blinks += 1
-                self.last_blink_time = time.time()
+                self.last_blink_time = self.clock()
                 self.eye_closed = True
         else:
             self.eye_closed = False
 
         # Calculate BPM (Blinks Per Minute) - Moving Average
-        elapsed = time.time() - self.start_time
+        elapsed = self.clock() - self.start_time
         if elapsed > 0:
             self.blink_rate = (self.blinks / elapsed) * 60
 
         # 2. GAZE TRACKING (Iris vs Eye Center)
-        # Left Iris Center (468) vs Eye Corners (33, 133)
-        iris = landmarks[468]
-        eye_left = landmarks[33]
-        eye_right = landmarks[133]
-        
-        # Horizontal ratio
-        eye_width = eye_right.x - eye_left.x
-        iris_rel = (iris.x - eye_left.x) / eye_width
+        # Left Iris Center (468) vs Eye Corners (33, 133), horizontal ratio
+        iris_rel = float(feats["iris_l"][face])
         
         # Normal gaze is 0.45 - 0.55. Anything else is "Shifty"
         gaze_stress = 0
@@ -92,8 +93,7 @@ class Biometrics:
         # Combine metrics
         raw_score = blink_stress + gaze_stress + (self.gaze_deviations * 0.5)
         self.stress_score = min(100, int(raw_score))
-        self.history.append(self.stress_score)
-        if len(self.history) > 100: self.history.pop(0)
+        self.series.append(stress=self.stress_score, blink_rate=self.blink_rate, ear=avg_dist, iris=iris_rel)
 
 # ==========================================
 # VISUALIZATION ENGINE (The HUD)
@@ -126,14 +126,9 @@ def draw_hud(img, bio):
     cv2.rectangle(img, (300, 600), (980, 700), C_GRID, 1)
     cv2.putText(img, "LIVE STRESS TENSOR", (310, 620), cv2.FONT_HERSHEY_SIMPLEX, 0.5, C_CYAN, 1)
     
-    if len(bio.history) > 1:
-        points = []
-        for i, val in enumerate(bio.history):
-            x = 300 + int(i * (680 / 100))
-            y = 700 - val
-            points.append((x, y))
-        
-        cv2.polylines(img, [np.array(points)], False, C_CYAN, 2)
+    if len(bio.series) > 1:
+        points = bio.series.polyline("stress", GRAPH_POINTS, 300, 980, 700)
+        cv2.polylines(img, [points], False, C_CYAN, 2)
 
     # 4. VERDICT (Top Center)
     elapsed = int(time.time() - bio.start_time)
@@ -148,14 +143,10 @@ def draw_hud(img, bio):
         cv2.rectangle(img, (w//2 - 100, 80), (w//2 + 100, 130), C_GREEN, -1)
         cv2.putText(img, "TRUTHFUL", (w//2 - 80, 120), cv2.FONT_HERSHEY_SIMPLEX, 1, (0,0,0), 2)
 
-def draw_eye_tracking(img, landmarks):
+def draw_eye_tracking(img, irises):
     h, w, c = img.shape
-    # Draw digital circles on eyes
-    left_iris = landmarks[468]
-    right_iris = landmarks[473]
-    
-    lx, ly = int(left_iris.x * w), int(left_iris.y * h)
-    rx, ry = int(right_iris.x * w), int(right_iris.y * h)
+    # Draw digital circles on eyes (irises: (2, 2) normalised centres, 468 then 473)
+    (lx, ly), (rx, ry) = [(int(x * w), int(y * h)) for x, y in irises]
     
     # Sci-fi crosshairs
     cv2.circle(img, (lx, ly), 5, C_RED, -1)
@@ -170,56 +161,74 @@ def draw_eye_tracking(img, landmarks):
 # ==========================================
 # MAIN LOOP
 # ==========================================
-cap = cv2.VideoCapture(0)
-cap.set(3, WIDTH)
-cap.set(4, HEIGHT)
+def main():
+    startup.mark("imports")
+    cap = cv2.VideoCapture(0)
+    cap.set(3, WIDTH)
+    cap.set(4, HEIGHT)
+    startup.mark("camera")
+
+    face_mesh = models.face_mesh(**FACE_MESH_OPTIONS)
+    scheduler = AdaptiveMesh(face_mesh) if ADAPTIVE_MESH else None
+    startup.mark("models")
 
-bio = Biometrics()
+    bio = Biometrics()
 
-print("SATYA AI INITIALIZED. INTERROGATION STARTING.")
+    print("SATYA AI INITIALIZED. INTERROGATION STARTING.")
 
-while True:
-    success, img = cap.read()
-    if not success: continue
+    while True:
+        success, img = cap.read()
+        if not success: continue
     
-    # Mirror image for user comfort
-    img = cv2.flip(img, 1)
+        # Mirror image for user comfort
+        img = cv2.flip(img, 1)
     
-    # Face Mesh
-    img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-    results = face_mesh.process(img_rgb)
+        # Face Mesh (every frame, or only when the eye region needs it)
+        if scheduler is not None:
+            feats = scheduler.feats if scheduler.process(img) is not None else None
+        else:
+            results = face_mesh.process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+            feats = None
+            if results.multi_face_landmarks:
+                feats = satya_features.eye_features([f.landmark for f in results.multi_face_landmarks])
     
-    if results.multi_face_landmarks:
-        for face_landmarks in results.multi_face_landmarks:
-            lms = face_landmarks.landmark
+        if feats is not None:
+            # Features for every face, computed once per mesh run
+            for face in range(len(feats["lid"])):
+                # Update Biometrics
+                bio.update_features(feats, face)
             
-            # Update Biometrics
-            bio.update(lms, WIDTH, HEIGHT)
+                # Draw Graphics
+                draw_eye_tracking(img, feats["irises"][face])
+                draw_hud(img, bio)
             
-            # Draw Graphics
-            draw_eye_tracking(img, lms)
-            draw_hud(img, bio)
-            
-    # Final Result Screen
-    if time.time() - bio.start_time > SESSION_TIME:
-        cv2.rectangle(img, (0,0), (WIDTH, HEIGHT), C_BG, -1)
+        # Final Result Screen
+        if time.time() - bio.start_time > SESSION_TIME:
+            cv2.rectangle(img, (0,0), (WIDTH, HEIGHT), C_BG, -1)
         
-        final_verdict = "SUBJECT TRUTHFUL"
-        col = C_GREEN
-        if bio.stress_score > 50: 
-            final_verdict = "SUBJECT DECEPTIVE"
-            col = C_RED
+            final_verdict = "SUBJECT TRUTHFUL"
+            col = C_GREEN
+            if bio.stress_score > 50: 
+                final_verdict = "SUBJECT DECEPTIVE"
+                col = C_RED
             
-        cv2.putText(img, "INTERROGATION COMPLETE", (300, 300), cv2.FONT_HERSHEY_SIMPLEX, 1.5, C_WHITE, 2)
-        cv2.putText(img, final_verdict, (350, 450), cv2.FONT_HERSHEY_SIMPLEX, 2, col, 4)
+            cv2.putText(img, "INTERROGATION COMPLETE", (300, 300), cv2.FONT_HERSHEY_SIMPLEX, 1.5, C_WHITE, 2)
+            cv2.putText(img, final_verdict, (350, 450), cv2.FONT_HERSHEY_SIMPLEX, 2, col, 4)
         
-        cv2.putText(img, "Press 'R' to Reset", (500, 600), cv2.FONT_HERSHEY_SIMPLEX, 1, C_WHITE, 1)
+            cv2.putText(img, "Press 'R' to Reset", (500, 600), cv2.FONT_HERSHEY_SIMPLEX, 1, C_WHITE, 1)
         
-        if cv2.waitKey(1) & 0xFF == ord('r'):
-            bio = Biometrics()
+            if cv2.waitKey(1) & 0xFF == ord('r'):
+                bio = Biometrics()
+
+        if scheduler is not None:
+            cv2.putText(img, f"MESH {scheduler.stats()['inference_hz']:.0f} Hz", (WIDTH-160, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.5, C_WHITE, 1)
+
+        cv2.imshow("SATYA AI - Polygraph", img)
+        startup.first_frame("satya")
+        if cv2.waitKey(1) & 0xFF == ord('q'): break
 
-    cv2.imshow("SATYA AI - Polygraph", img)
-    if cv2.waitKey(1) & 0xFF == ord('q'): break
+    cap.release()
+    cv2.destroyAllWindows()
 
-cap.release()
-cv2.destroyAllWindows()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+"""Offline batch analysis of archived SATYA AI interview recordings.
+
+Videos are scored in a process pool, one FaceMesh graph per worker process.
+Each file streams frame by frame through satya_features and Biometrics, with
+the Biometrics clock driven by video time, so a recording of any length is
+analysed as one session (SESSION_TIME does not apply).
+
+Memory is fixed: per-frame rows go into a preallocated chunk that is flushed
+to a columnar part file every --chunk frames. After each part, progress.json
+records the frames done and the Biometrics counters, so an interrupted file
+resumes from its last part instead of frame 0.
+
+Output per video in --out/<name>.<hash8>/ (hash8: start of the file's
+sha256, so same-named recordings in different folders do not collide):
+    part-00000.npz ...   columns: frame, t, face, lid, ear_l, ear_r, iris_l,
+                         iris_r, roll, yaw, pitch, stress, blink_rate, blinks,
+                         gaze_deviations (NaN features on frames without a face)
+    progress.json        resume point (removed files are re-analysed)
+    session.json         summary: blink rate, gaze deviations, stress timeline
+                         (mean per second), verdict; files with one are skipped
+
+    python satya_batch.py interviews/ --out analysis/ --workers 4
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import cv2
+import numpy as np
+
+import satya_features
+from satya_ai import Biometrics, FACE_MESH_OPTIONS
+from vision_kit import models
+
+VIDEO_EXTS = (".mp4", ".avi", ".mov", ".mkv", ".webm")
+FEATURES = ("lid", "ear_l", "ear_r", "iris_l", "iris_r", "roll", "yaw", "pitch")
+BIO_COLUMNS = ("stress", "blink_rate", "blinks", "gaze_deviations")
+BIO_STATE = ("blinks", "last_blink_time", "blink_rate", "gaze_deviations", "stress_score", "eye_closed")
+DECEPTIVE_SCORE = 50 # Same cut-off as the live final verdict
+
+_face_mesh = None # One graph per worker process
+
+class VideoClock:
+    # Biometrics clock that reads the current frame's timestamp
+    def __init__(self):
+        self.t = 0.0
+    def __call__(self):
+        return self.t
+
+# ==========================================
+# COLUMNAR CHUNKS
+# ==========================================
+class Chunk:
+    def __init__(self, size):
+        self.size = size
+        self.cols = {"frame": np.zeros(size, np.int64), "t": np.zeros(size, np.float64),
+                     "face": np.zeros(size, bool)}
+        for name in FEATURES + BIO_COLUMNS: self.cols[name] = np.zeros(size, np.float32)
+        self.n = 0
+
+    def add(self, frame, t, feats, bio):
+        i = self.n
+        c = self.cols
+        c["frame"][i], c["t"][i], c["face"][i] = frame, t, feats is not None
+        for name in FEATURES: c[name][i] = feats[name][0] if feats is not None else np.nan
+        c["stress"][i], c["blink_rate"][i] = bio.stress_score, bio.blink_rate
+        c["blinks"][i], c["gaze_deviations"][i] = bio.blinks, bio.gaze_deviations
+        self.n += 1
+        return self.n == self.size
+
+    def flush(self, path):
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, **{k: v[:self.n] for k, v in self.cols.items()})
+        os.replace(tmp, path)
+        self.n = 0
+
+# ==========================================
+# PER-VIDEO ANALYSIS
+# ==========================================
+def write_json(path, data):
+    with open(path + ".tmp", "w") as f: json.dump(data, f, indent=1)
+    os.replace(path + ".tmp", path)
+
+def file_hash(path, block=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(block), b""): h.update(chunk)
+    return h.hexdigest()
+
+def source_id(path):
+    st = os.stat(path)
+    return {"source": os.path.abspath(path), "size": st.st_size, "mtime": st.st_mtime}
+
+def open_at(path, frame):
+    # Capture positioned at `frame`; frame-exact even where seeking is not
+    cap = cv2.VideoCapture(path)
+    if frame and not (cap.set(cv2.CAP_PROP_POS_FRAMES, frame) and int(cap.get(cv2.CAP_PROP_POS_FRAMES)) == frame):
+        cap.release()
+        cap = cv2.VideoCapture(path)
+        for _ in range(frame): cap.grab()
+    return cap
+
+def init_worker():
+    global _face_mesh
+    _face_mesh = models.new("face_mesh", **FACE_MESH_OPTIONS)
+
+def analyse(path, out_root, chunk_size=3000):
+    out = os.path.join(out_root, f"{os.path.splitext(os.path.basename(path))[0]}.{file_hash(path)[:8]}")
+    os.makedirs(out, exist_ok=True)
+    if os.path.exists(os.path.join(out, "session.json")): return {"source": path, "skipped": True}
+
+    # Resume from the last completed part of this same file
+    ident = source_id(path)
+    progress_path = os.path.join(out, "progress.json")
+    progress = {"frames": 0, "parts": 0, "bio": None}
+    if os.path.exists(progress_path):
+        with open(progress_path) as f: saved = json.load(f)
+        if saved.get("id") == ident: progress = saved
+    if not progress["frames"]: # Starting over: parts of another run would be summarised too
+        for p in glob.glob(os.path.join(out, "part-*.npz")): os.remove(p)
+
+    clock = VideoClock()
+    bio = Biometrics(clock)
+    if progress["bio"]:
+        for k, v in progress["bio"].items(): setattr(bio, k, v)
+
+    cap = open_at(path, progress["frames"])
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    chunk = Chunk(chunk_size)
+    frame, parts = progress["frames"], progress["parts"]
+    t0 = time.perf_counter()
+    done = 0
+
+    def flush():
+        nonlocal parts
+        chunk.flush(os.path.join(out, f"part-{parts:05d}.npz"))
+        parts += 1
+        write_json(progress_path, {"id": ident, "frames": frame, "parts": parts,
+                                   "bio": {k: getattr(bio, k) for k in BIO_STATE}})
+
+    while True:
+        success, img = cap.read()
+        if not success: break
+        clock.t = frame / fps
+        img = cv2.flip(img, 1) # Mirror view, as in the live app
+        results = _face_mesh.process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+        feats = None
+        if results.multi_face_landmarks:
+            feats = satya_features.extract_faces([results.multi_face_landmarks[0].landmark])
+            bio.update_features(feats)
+        full = chunk.add(frame, clock.t, feats, bio)
+        frame += 1
+        done += 1
+        if full: flush()
+    cap.release()
+    if chunk.n: flush()
+
+    summary = summarize(out, ident, fps)
+    write_json(os.path.join(out, "session.json"), summary)
+    return {"source": path, "skipped": False, "frames": done, "seconds": time.perf_counter() - t0,
+            "pid": os.getpid(), "verdict": summary["verdict"]}
+
+def summarize(out, ident, fps):
+    # Reads back only the columns needed for the timeline
+    parts = sorted(glob.glob(os.path.join(out, "part-*.npz")))
+    t, stress, face = [], [], []
+    last = None
+    for p in parts:
+        with np.load(p) as z:
+            t.append(z["t"]); stress.append(z["stress"]); face.append(z["face"])
+            if len(z["t"]): last = {k: float(z[k][-1]) for k in BIO_COLUMNS}
+    t = np.concatenate(t) if t else np.zeros(0)
+    stress = np.concatenate(stress) if stress else np.zeros(0, np.float32)
+    face = np.concatenate(face) if face else np.zeros(0, bool)
+    last = last or dict.fromkeys(BIO_COLUMNS, 0.0)
+
+    sec = t.astype(np.int64)
+    counts = np.bincount(sec, minlength=1)
+    timeline = np.bincount(sec, weights=stress, minlength=1) / np.maximum(counts, 1)
+    return {
+        **ident,
+        "frames": int(len(t)), "fps": fps, "duration_s": float(len(t) / fps),
+        "face_share": float(face.mean()) if len(face) else 0.0,
+        "blinks": int(last["blinks"]), "blink_rate": last["blink_rate"],
+        "gaze_deviations": int(last["gaze_deviations"]),
+        "final_stress": last["stress"], "max_stress": float(stress.max()) if len(stress) else 0.0,
+        "stress_per_second": np.round(timeline, 2).tolist(),
+        "verdict": "SUBJECT DECEPTIVE" if last["stress"] > DECEPTIVE_SCORE else "SUBJECT TRUTHFUL",
+    }
+
+# ==========================================
+# CLI
+# ==========================================
+def main():
+    ap = argparse.ArgumentParser(description="Score archived interview recordings.")
+    ap.add_argument("videos", help="directory of recordings")
+    ap.add_argument("--out", default="analysis", help="output directory")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--chunk", type=int, default=3000, help="frames per columnar part")
+    args = ap.parse_args()
+
+    videos = sorted(os.path.join(d, n) for d, _, names in os.walk(args.videos)
+                    for n in names if n.lower().endswith(VIDEO_EXTS))
+    print(f"{len(videos)} videos, {args.workers} workers")
+
+    with ProcessPoolExecutor(args.workers, initializer=init_worker) as pool:
+        jobs = [pool.submit(analyse, v, args.out, args.chunk) for v in videos]
+        for job in as_completed(jobs):
+            r = job.result()
+            if r["skipped"]:
+                print(f"skip  {r['source']}")
+            else:
+                print(f"done  {r['source']}: {r['frames']} frames, "
+                      f"{r['frames'] / max(r['seconds'], 1e-9):.1f} fps (pid {r['pid']})  {r['verdict']}")
+
+if __name__ == "__main__":
+    main()
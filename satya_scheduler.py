@@ -0,0 +1,166 @@
+"""Adaptive FaceMesh scheduling for SATYA AI.
+
+The refined face mesh is the dominant per-frame cost, but blinks only need
+high temporal resolution around eye events. AdaptiveMesh runs a cheap change
+detector every frame: the eye region of the last mesh, cropped from a
+grayscale frame and shrunk to a few hundred pixels, compared with the same
+crop at the last full run. The full mesh runs only when
+
+    - there is no mesh yet (or the face was lost),
+    - the eye region changed (head motion, lids moving)  -> "motion"
+    - the last eyelid gap is near the blink threshold    -> "eyes"
+    - max_skip frames passed without a run               -> "refresh"
+
+and the last landmarks are reused on every other frame.
+
+Blink counts must stay within max(1, 5%) of running the mesh on every frame.
+Check on recorded footage with:
+
+    python satya_scheduler.py --evaluate interviews/*.mp4
+"""
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+import satya_features
+
+EYE_POINTS = np.unique(np.concatenate([satya_features.LIDS.ravel(), satya_features.CORNERS.ravel(),
+                                       satya_features.IRIS]))
+BLINK_LID = 0.012 # Biometrics closed-eye threshold
+BLINK_TOLERANCE = 0.05 # Relative blink-count error allowed vs every-frame
+
+class AdaptiveMesh:
+    def __init__(self, face_mesh, max_skip=4, diff_thresh=4.0, near_blink=1.6, pad=0.6, probe=(64, 16)):
+        self.face_mesh = face_mesh
+        self.max_skip = max_skip
+        self.diff_thresh = diff_thresh # Mean abs gray difference (0-255) that counts as motion
+        self.near_blink = near_blink # Run every frame while lid gap < near_blink * BLINK_LID
+        self.pad = pad # Eye box padding, relative to its size
+        self.probe = probe # Size the eye box is shrunk to before comparing
+        self.mesh = None
+        self.feats = None # satya_features output for self.mesh
+        self.lid = 0.0 # Eyelid gap at the last full run
+        self.box = None
+        self.ref = None # Eye probe at the last full run
+        self.skipped = 0
+        self.frames = 0
+        self.runs = 0
+        self.reasons = {"start": 0, "motion": 0, "eyes": 0, "refresh": 0}
+        self.t0 = time.perf_counter()
+
+    def _eye_box(self, mesh, w, h):
+        pts = mesh[0, EYE_POINTS, :2] * (w, h)
+        (x0, y0), (x1, y1) = pts.min(axis=0), pts.max(axis=0)
+        px, py = (x1 - x0) * self.pad, (y1 - y0) * self.pad + 4
+        x0, y0 = max(0, int(x0 - px)), max(0, int(y0 - py))
+        x1, y1 = min(w, int(x1 + px) + 1), min(h, int(y1 + py) + 1)
+        return (x0, y0, x1, y1) if x1 - x0 > 4 and y1 - y0 > 4 else None
+
+    def _probe(self, img):
+        x0, y0, x1, y1 = self.box
+        roi = cv2.cvtColor(img[y0:y1, x0:x1], cv2.COLOR_BGR2GRAY)
+        return cv2.resize(roi, self.probe, interpolation=cv2.INTER_AREA).astype(np.int16)
+
+    def _reason(self, img):
+        if self.mesh is None or self.box is None: return "start"
+        if self.skipped >= self.max_skip: return "refresh"
+        if self.lid < BLINK_LID * self.near_blink: return "eyes"
+        if np.abs(self._probe(img) - self.ref).mean() > self.diff_thresh: return "motion"
+        return None
+
+    def process(self, img):
+        # BGR frame -> compact (F, len(POINTS), 3) mesh (fresh or reused), or None without a face
+        self.frames += 1
+        reason = self._reason(img)
+        if reason is None:
+            self.skipped += 1
+            return self.mesh
+
+        self.runs += 1
+        self.reasons[reason] += 1
+        self.skipped = 0
+        results = self.face_mesh.process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+        if not results.multi_face_landmarks:
+            self.mesh = self.feats = self.box = self.ref = None
+            return None
+        faces = [f.landmark for f in results.multi_face_landmarks]
+        self.mesh = satya_features.mesh_to_array(faces)
+        self.feats = satya_features.eye_features(faces) # Reused with the mesh on skipped frames
+        self.lid = float(self.feats["lid"][0])
+        h, w = img.shape[:2]
+        self.box = self._eye_box(self.mesh, w, h)
+        if self.box is not None: self.ref = self._probe(img)
+        return self.mesh
+
+    def stats(self, fps=None):
+        # Effective mesh rate: per second of wall time, or of video time at `fps`
+        seconds = self.frames / fps if fps else time.perf_counter() - self.t0
+        return {"frames": self.frames, "runs": self.runs,
+                "run_share": self.runs / max(self.frames, 1),
+                "inference_hz": self.runs / seconds if seconds > 0 else 0.0,
+                **self.reasons}
+
+# ==========================================
+# EVALUATION (every-frame baseline vs adaptive)
+# ==========================================
+def evaluate(path, options):
+    from satya_ai import Biometrics
+    from satya_batch import VideoClock
+    from vision_kit import models
+
+    # Two private graphs: FaceMesh keeps tracking state per stream
+    base_mesh = models.new("face_mesh", **options)
+    adaptive = AdaptiveMesh(models.new("face_mesh", **options))
+    clock = VideoClock()
+    base_bio, fast_bio = Biometrics(clock), Biometrics(clock)
+
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    frame = 0
+    t_base = t_fast = 0.0
+    while True:
+        success, img = cap.read()
+        if not success: break
+        img = cv2.flip(img, 1)
+        clock.t = frame / fps
+        frame += 1
+
+        t0 = time.perf_counter()
+        results = base_mesh.process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+        if results.multi_face_landmarks:
+            base_bio.update_features(satya_features.eye_features([results.multi_face_landmarks[0].landmark]))
+        t1 = time.perf_counter()
+        mesh = adaptive.process(img)
+        if mesh is not None: fast_bio.update_features(adaptive.feats)
+        t2 = time.perf_counter()
+        t_base += t1 - t0
+        t_fast += t2 - t1
+    cap.release()
+
+    allowed = max(1, round(BLINK_TOLERANCE * base_bio.blinks))
+    return {"source": path, "frames": frame,
+            "blinks_baseline": base_bio.blinks, "blinks_adaptive": fast_bio.blinks,
+            "allowed_error": allowed, "ok": abs(base_bio.blinks - fast_bio.blinks) <= allowed,
+            "baseline_ms": t_base / max(frame, 1) * 1000, "adaptive_ms": t_fast / max(frame, 1) * 1000,
+            **adaptive.stats(fps)}
+
+def main():
+    from satya_ai import FACE_MESH_OPTIONS
+
+    ap = argparse.ArgumentParser(description="Check adaptive FaceMesh blink accuracy on recordings.")
+    ap.add_argument("--evaluate", nargs="+", metavar="VIDEO", required=True)
+    args = ap.parse_args()
+
+    failed = 0
+    for path in args.evaluate:
+        r = evaluate(path, FACE_MESH_OPTIONS)
+        failed += not r["ok"]
+        print(f"{'PASS' if r['ok'] else 'FAIL'}  {path}: blinks {r['blinks_baseline']} -> {r['blinks_adaptive']} "
+              f"(allowed +-{r['allowed_error']}), mesh on {r['run_share']:.0%} of frames "
+              f"({r['inference_hz']:.1f} Hz), {r['baseline_ms']:.1f} -> {r['adaptive_ms']:.1f} ms/frame")
+    raise SystemExit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
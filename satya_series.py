@@ -0,0 +1,91 @@
+"""Preallocated ring-buffer time series for SATYA AI biometrics.
+
+Every channel lives in one float32 array of 2 * capacity columns. Each sample
+is written twice (slot i and slot i + capacity), so the newest n samples are
+always a contiguous slice: windows, graphs and statistics are views, never
+copies, and append is O(channels) whatever the history length.
+
+Running sums over a fixed `window` give O(1) rolling mean / variance per
+frame; window_view() returns a view for any other statistic.
+
+    series = SeriesStore(("stress", "ear"), capacity=5 * 60 * 30)
+    series.append(stress=42, ear=0.02)
+    series.mean("stress"), series.var("ear")
+    cv2.polylines(img, [series.polyline("stress", 100, 300, 980, 700)], False, col, 2)
+"""
+import numpy as np
+
+class SeriesStore:
+    def __init__(self, channels, capacity=5 * 60 * 30, window=30):
+        self.channels = tuple(channels)
+        self.index = {name: i for i, name in enumerate(self.channels)}
+        self.capacity = capacity
+        self.window = min(window, capacity)
+        self.buf = np.zeros((len(self.channels), 2 * capacity), np.float32)
+        self.head = 0 # Next slot to write, in [0, capacity)
+        self.size = 0
+        self.sums = np.zeros(len(self.channels), np.float64) # Over the last `window` samples
+        self.sqsums = np.zeros(len(self.channels), np.float64)
+        self._row = np.zeros(len(self.channels), np.float32)
+        self._graphs = {} # (n, x0, x1) -> preallocated (n, 1, 2) int32 points
+
+    def __len__(self):
+        return self.size
+
+    def append(self, **values):
+        row = self._row
+        for name, v in values.items(): row[self.index[name]] = v
+
+        if self.size >= self.window: # Sample leaving the rolling window
+            old = self.buf[:, self.head + self.capacity - self.window].astype(np.float64)
+            self.sums -= old
+            self.sqsums -= old * old
+        self.sums += row
+        self.sqsums += row.astype(np.float64) ** 2
+
+        self.buf[:, self.head] = row
+        self.buf[:, self.head + self.capacity] = row
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        if self.head == 0: self._resync() # Once per lap, so float error never builds up
+
+    def _resync(self):
+        end = self.head + self.capacity
+        win = self.buf[:, end - min(self.size, self.window):end].astype(np.float64)
+        self.sums = win.sum(axis=1)
+        self.sqsums = (win * win).sum(axis=1)
+
+    def window_view(self, channel, n=None):
+        # The newest n samples of a channel, oldest first (a view into the buffer)
+        n = self.size if n is None else min(n, self.size)
+        end = self.head + self.capacity
+        return self.buf[self.index[channel], end - n:end]
+
+    def last(self, channel):
+        return float(self.buf[self.index[channel], self.head + self.capacity - 1]) if self.size else 0.0
+
+    # ---- rolling statistics over `window` samples, O(1) ----
+    def mean(self, channel):
+        n = min(self.size, self.window)
+        return float(self.sums[self.index[channel]] / n) if n else 0.0
+
+    def var(self, channel):
+        n = min(self.size, self.window)
+        if not n: return 0.0
+        i = self.index[channel]
+        m = self.sums[i] / n
+        return float(max(0.0, self.sqsums[i] / n - m * m))
+
+    # ---- graphing ----
+    def polyline(self, channel, n, x0, x1, y0, scale=1.0):
+        # Points for cv2.polylines: the newest n samples spread over n slots
+        # from x0 to x1, growing from the left until the graph is full.
+        key = (n, x0, x1)
+        pts = self._graphs.get(key)
+        if pts is None:
+            pts = self._graphs[key] = np.empty((n, 1, 2), np.int32)
+            pts[:, 0, 0] = x0 + (np.arange(n) * ((x1 - x0) / n)).astype(np.int32)
+        vals = self.window_view(channel, n)
+        out = pts[:len(vals)]
+        np.subtract(y0, vals * scale, out=out[:, 0, 1], casting="unsafe")
+        return out
@@ -0,0 +1,9 @@
+"""Shared, import-cheap pieces of the vision apps.
+
+theme    colour palettes (pure constants, safe to import anywhere)
+models   lazily built MediaPipe models
+startup  import-to-first-frame timing
+
+Importing this package never opens a camera or loads a model.
+Run an app with:  python -m vision_kit <app>
+"""
@@ -0,0 +1,46 @@
+"""App launcher.
+
+    python -m vision_kit <app>       run an app
+    python -m vision_kit --imports   time importing every app; fails if an
+                                     import loads mediapipe or builds a model
+"""
+import importlib
+import sys
+import time
+
+from vision_kit import models
+
+APPS = {
+    "workbench": "workbench",    # Dakshya Enterprise certification
+    "awaz": "awaz_ai",           # Sign language translator
+    "satya": "satya_ai",         # Polygraph HUD
+    "auracraft": "hult",         # AR pickle making
+    "grid": "grid_master",       # National load dispatch simulator
+    "nirman": "nirman_ai",       # Structural auditor
+}
+
+def check_imports():
+    ok = True
+    for app, module in APPS.items():
+        t0 = time.perf_counter()
+        try:
+            importlib.import_module(module)
+        except ImportError as e:
+            print(f"{app:<10} skipped ({e})")
+            continue
+        ms = (time.perf_counter() - t0) * 1000
+        heavy = "mediapipe" in sys.modules or models.LOAD_TIMES
+        ok = ok and not heavy
+        print(f"{app:<10} {ms:7.1f} ms  {'LOADED MODELS' if heavy else 'ok'}")
+    return 0 if ok else 1
+
+def main(argv):
+    if argv == ["--imports"]: return check_imports()
+    if len(argv) != 1 or argv[0] not in APPS:
+        print(f"usage: python -m vision_kit {{{','.join(APPS)}}} | --imports")
+        return 2
+    importlib.import_module(APPS[argv[0]]).main()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
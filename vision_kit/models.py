@@ -0,0 +1,54 @@
+"""Lazily initialised MediaPipe model registry.
+
+mediapipe is imported and a graph is built only when a model is first
+requested. get() returns one shared instance per (kind, options); new()
+builds a private one for callers that need their own tracking state, such
+as one instance per camera stream.
+"""
+import threading
+import time
+
+_lock = threading.Lock()
+_shared = {}
+LOAD_TIMES = {} # "kind(options)" -> seconds spent building
+
+def _mediapipe():
+    import mediapipe as mp
+    return mp
+
+FACTORIES = {
+    "hands": lambda **o: _mediapipe().solutions.hands.Hands(**o),
+    "face_mesh": lambda **o: _mediapipe().solutions.face_mesh.FaceMesh(**o),
+}
+
+def register(kind, factory):
+    FACTORIES[kind] = factory
+
+def _label(kind, options):
+    return f"{kind}({', '.join(f'{k}={v}' for k, v in sorted(options.items()))})"
+
+def new(kind, **options):
+    t0 = time.perf_counter()
+    model = FACTORIES[kind](**options)
+    LOAD_TIMES[_label(kind, options)] = time.perf_counter() - t0
+    return model
+
+def get(kind, **options):
+    key = (kind, tuple(sorted(options.items())))
+    model = _shared.get(key)
+    if model is None:
+        with _lock:
+            model = _shared.get(key)
+            if model is None:
+                model = _shared[key] = new(kind, **options)
+    return model
+
+def hands(**options):
+    return get("hands", **options)
+
+def face_mesh(**options):
+    return get("face_mesh", **options)
+
+def solutions():
+    # Drawing utils and connection tables (imports mediapipe, builds nothing)
+    return _mediapipe().solutions
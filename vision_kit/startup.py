@@ -0,0 +1,25 @@
+"""Import-to-first-frame timing.
+
+Apps import this module before anything heavy, so T0 is close to process
+start. first_frame() prints, once, how long it took to get a frame on screen
+and how much of that went into imports, opening the camera and building models.
+"""
+import time
+
+from vision_kit import models
+
+T0 = time.perf_counter()
+MARKS = []
+_reported = set()
+
+def mark(label):
+    MARKS.append((label, time.perf_counter() - T0))
+
+def first_frame(app):
+    if app in _reported: return None
+    _reported.add(app)
+    total = time.perf_counter() - T0
+    steps = "  ".join(f"{label} @{t * 1000:.0f}ms" for label, t in MARKS)
+    loads = "  ".join(f"{name} {t * 1000:.0f}ms" for name, t in models.LOAD_TIMES.items())
+    print(f"[{app}] import-to-first-frame {total * 1000:.0f} ms | {steps} | models: {loads or 'none'}")
+    return total
@@ -0,0 +1,12 @@
+# ==========================================
+# COLORS (Industrial Palette)
+# ==========================================
+# Shared by the workbench and the grid dashboard. Pure constants: importing
+# this module must never pull in cv2, mediapipe or a camera.
+C_BG = (30, 30, 30)
+C_PANEL = (50, 60, 70)
+C_DANGER = (0, 0, 200)   # Red
+C_SAFE = (0, 200, 0)     # Green
+C_WARN = (0, 200, 255)   # Yellow
+C_TEXT = (255, 255, 255)
+C_ACCENT = (255, 100, 0) # Orange
@@ -1,66 +1,166 @@
+from vision_kit import startup # First, so import-to-first-frame covers everything below
 import cv2
 import time
 import math
-import mediapipe as mp
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 
+from vision_kit import models
+from vision_kit.theme import C_PANEL, C_DANGER, C_SAFE, C_WARN, C_TEXT, C_ACCENT
+
 # ==========================================
 # CONFIGURATION & ASSETS
 # ==========================================
 WIDTH, HEIGHT = 1280, 720
-CURRENT_SCENE = "MENU"
-GAME_OVER = False
-FAIL_REASON = ""
-
-# COLORS (Industrial Palette)
-C_BG = (30, 30, 30)
-C_PANEL = (50, 60, 70)
-C_DANGER = (0, 0, 200)   # Red
-C_SAFE = (0, 200, 0)     # Green
-C_WARN = (0, 200, 255)   # Yellow
-C_TEXT = (255, 255, 255)
-C_ACCENT = (255, 100, 0) # Orange
-
-# AI SETUP
-mp_hands = mp.solutions.hands
-hands = mp_hands.Hands(max_num_hands=1, min_detection_confidence=0.8)
-mp_draw = mp.solutions.drawing_utils
+GRAB_DIST = 150 # Tip-to-wrist pixels below which the hand counts as a "Fist"
+
+# HAND TRACKING MODE (see HandTracker)
+TRACK_ROI = True   # Infer on a crop around the last hand instead of the full frame
+MAX_INFER_HZ = 0   # Cap model runs per second on slow laptops (0 = every frame)
+
+# AI SETUP (Built on first use by vision_kit.models, never at import)
+HANDS_OPTIONS = dict(max_num_hands=1, min_detection_confidence=0.8)
+ROI_HANDS_OPTIONS = dict(max_num_hands=1, min_detection_confidence=0.5, min_tracking_confidence=0.5)
+
+def hands():
+    return models.hands(**HANDS_OPTIONS)
+
+def make_tracker(private=False):
+    # private=True builds models of its own (one tracker per camera stream)
+    get = models.new if private else models.get
+    roi = get("hands", **ROI_HANDS_OPTIONS) if TRACK_ROI else None
+    return HandTracker(get("hands", **HANDS_OPTIONS), roi, MAX_INFER_HZ or None)
 
 # ==========================================
 # SYSTEM CLASSES (The "Engine")
 # ==========================================
+class Layer:
+    # Off-screen RGBA canvas for the static UI of a scene. It is painted once
+    # through the same Graphics calls as a frame, then blended in one pass.
+    def __init__(self, h, w):
+        # uint8 planes: cv2 text and shapes only draw into 8-bit images
+        self.color = np.zeros((h, w, 3), np.uint8) # Premultiplied BGR
+        self.alpha = np.zeros((h, w), np.uint8) # Coverage, 255 = opaque
+        self.origin = (0, 0)
+        self.premul = None
+        self.inv_alpha = None
+
+    @property
+    def shape(self):
+        return self.alpha.shape + (3,)
+
+    def ink(self, fn, *args, color, **kw):
+        # Opaque primitive: same stroke into colour and coverage
+        fn(self.color, *args, color=color, **kw)
+        fn(self.alpha, *args, color=255, **kw)
+
+    def box(self, box, color, alpha, filled):
+        x1, y1, x2, y2 = box
+        if filled:
+            h, w = self.alpha.shape
+            xa, ya, xb, yb = max(x1, 0), max(y1, 0), min(x2, w - 1) + 1, min(y2, h - 1) + 1
+            if xa < xb and ya < yb:
+                c = self.color[ya:yb, xa:xb]
+                a = self.alpha[ya:yb, xa:xb]
+                c[:] = cv2.addWeighted(np.full_like(c, color), alpha, c, 1 - alpha, 0)
+                a[:] = cv2.addWeighted(np.full_like(a, 255), alpha, a, 1 - alpha, 0)
+        self.ink(cv2.rectangle, (x1, y1), (x2, y2), color=(200, 200, 200), thickness=2)
+
+    def bake(self):
+        # Crop to the painted area and keep the blend terms:
+        # out = premul + img * inv_alpha / 255
+        rows = np.flatnonzero(self.alpha.any(axis=1))
+        cols = np.flatnonzero(self.alpha.any(axis=0))
+        if rows.size:
+            y0, y1, x0, x1 = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+            self.origin = (x0, y0)
+            self.premul = self.color[y0:y1, x0:x1].copy()
+            inv = 255 - self.alpha[y0:y1, x0:x1]
+            self.inv_alpha = cv2.merge([inv, inv, inv])
+        self.color = self.alpha = None # Full-frame planes are only needed while painting
+        return self
+
+    def apply(self, img):
+        if self.premul is None: return
+        x0, y0 = self.origin
+        h, w = self.premul.shape[:2]
+        roi = img[y0:y0+h, x0:x0+w]
+        img[y0:y0+h, x0:x0+w] = cv2.add(cv2.multiply(roi, self.inv_alpha, scale=1/255.0), self.premul)
+
+class Compositor:
+    # LRU cache of baked Layers keyed by scene + state. A scene is repainted
+    # only when its key changes (step, valve, selected tool, hovered slot...).
+    def __init__(self, capacity=16):
+        self.cache = OrderedDict()
+        self.capacity = capacity
+        self.builds = 0
+        self.lock = threading.Lock() # Sessions on other threads share the cache
+
+    def blend(self, img, key, paint):
+        h, w = img.shape[:2]
+        key = (h, w) + tuple(key)
+        with self.lock:
+            layer = self.cache.get(key)
+            if layer is not None: self.cache.move_to_end(key)
+        if layer is None:
+            layer = Layer(h, w)
+            paint(layer)
+            layer.bake()
+            with self.lock:
+                self.cache[key] = layer
+                self.builds += 1
+                if len(self.cache) > self.capacity: self.cache.popitem(last=False)
+        layer.apply(img)
+
+COMPOSITOR = Compositor()
+
 class Graphics:
+    @staticmethod
+    def ink(img, fn, *args, color, **kw):
+        # Route a cv2 primitive to a live frame or to a cached Layer
+        if isinstance(img, Layer): img.ink(fn, *args, color=color, **kw)
+        else: fn(img, *args, color=color, **kw)
+
     @staticmethod
     def draw_box(img, box, color, alpha=0.6, filled=True):
+        if isinstance(img, Layer):
+            img.box(box, color, alpha, filled)
+            return
         x1, y1, x2, y2 = box
-        overlay = img.copy()
         if filled:
-            cv2.rectangle(overlay, (x1, y1), (x2, y2), color, -1)
-            cv2.addWeighted(overlay, alpha, img, 1 - alpha, 0, img)
+            # Blend only the box region instead of copying the whole frame
+            h, w = img.shape[:2]
+            xa, ya, xb, yb = max(x1, 0), max(y1, 0), min(x2, w - 1) + 1, min(y2, h - 1) + 1
+            if xa < xb and ya < yb:
+                roi = img[ya:yb, xa:xb]
+                img[ya:yb, xa:xb] = cv2.addWeighted(np.full_like(roi, color), alpha, roi, 1 - alpha, 0)
         cv2.rectangle(img, (x1, y1), (x2, y2), (200, 200, 200), 2)
 
     @staticmethod
     def draw_text(img, text, x, y, size=0.8, color=C_TEXT):
-        cv2.putText(img, text, (x+2, y+2), cv2.FONT_HERSHEY_SIMPLEX, size, (0,0,0), 3)
-        cv2.putText(img, text, (x, y), cv2.FONT_HERSHEY_SIMPLEX, size, color, 2)
+        Graphics.ink(img, cv2.putText, text, (x+2, y+2), cv2.FONT_HERSHEY_SIMPLEX, size, color=(0,0,0), thickness=3)
+        Graphics.ink(img, cv2.putText, text, (x, y), cv2.FONT_HERSHEY_SIMPLEX, size, color=color, thickness=2)
 
     @staticmethod
     def draw_tool_icon(img, name, x, y):
         # Procedurally draw icons so no external files needed
+        ink = Graphics.ink
         c = (200, 200, 200)
         if name == "WRENCH":
-            cv2.line(img, (x+20, y+60), (x+60, y+20), c, 8)
-            cv2.circle(img, (x+60, y+20), 15, c, -1)
-            cv2.circle(img, (x+60, y+20), 8, (50,50,50), -1)
+            ink(img, cv2.line, (x+20, y+60), (x+60, y+20), color=c, thickness=8)
+            ink(img, cv2.circle, (x+60, y+20), 15, color=c, thickness=-1)
+            ink(img, cv2.circle, (x+60, y+20), 8, color=(50,50,50), thickness=-1)
         elif name == "MULTI":
-            cv2.rectangle(img, (x+25, y+15), (x+55, y+65), (0, 200, 255), -1)
-            cv2.rectangle(img, (x+30, y+20), (x+50, y+40), (0,0,0), -1)
+            ink(img, cv2.rectangle, (x+25, y+15), (x+55, y+65), color=(0, 200, 255), thickness=-1)
+            ink(img, cv2.rectangle, (x+30, y+20), (x+50, y+40), color=(0,0,0), thickness=-1)
         elif name == "TAG":
-            cv2.rectangle(img, (x+25, y+15), (x+55, y+65), (0, 0, 255), -1)
-            cv2.circle(img, (x+40, y+25), 5, (255,255,255), -1)
+            ink(img, cv2.rectangle, (x+25, y+15), (x+55, y+65), color=(0, 0, 255), thickness=-1)
+            ink(img, cv2.circle, (x+40, y+25), 5, color=(255,255,255), thickness=-1)
         elif name == "VALVE":
-            cv2.circle(img, (x+40, y+40), 25, (0, 0, 255), 3)
-            cv2.line(img, (x+15, y+40), (x+65, y+40), (0,0,255), 3)
+            ink(img, cv2.circle, (x+40, y+40), 25, color=(0, 0, 255), thickness=3)
+            ink(img, cv2.line, (x+15, y+40), (x+65, y+40), color=(0,0,255), thickness=3)
 
 class ToolBelt:
     def __init__(self):
@@ -72,55 +172,97 @@ class ToolBelt:
         self.tools = tool_names
         self.selected = None
 
-    def update(self, img, cursor, is_grabbing):
-        h, w, c = img.shape
-        Graphics.draw_box(img, [100, h-100, w-100, h], (20, 20, 20), 0.8)
-        
+    def slot(self, i, w, h):
         spacing = 150
         start_x = (w - (len(self.tools) * spacing)) // 2
-        
+        return start_x + (i * spacing), h - 90
+
+    def select(self, w, h, cursor, is_grabbing):
+        # Hover & Select Logic, returns the hovered slot (-1 for none)
         for i, name in enumerate(self.tools):
-            bx = start_x + (i * spacing)
-            by = h - 90
-            
-            # Hover & Select Logic
+            bx, by = self.slot(i, w, h)
             if bx < cursor[0] < bx+100 and by < cursor[1] < by+80:
-                cv2.rectangle(img, (bx, by), (bx+100, by+80), (100, 100, 100), -1)
                 if is_grabbing:
                     self.selected = name
-            
+                return i
+        return -1
+
+    def paint(self, img, hover):
+        h, w, c = img.shape
+        Graphics.draw_box(img, [100, h-100, w-100, h], (20, 20, 20), 0.8)
+
+        for i, name in enumerate(self.tools):
+            bx, by = self.slot(i, w, h)
+            if i == hover:
+                Graphics.ink(img, cv2.rectangle, (bx, by), (bx+100, by+80), color=(100, 100, 100), thickness=-1)
+
             # Draw Slot
             col = (0, 255, 0) if self.selected == name else (255, 255, 255)
-            cv2.rectangle(img, (bx, by), (bx+100, by+80), col, 2)
+            Graphics.ink(img, cv2.rectangle, (bx, by), (bx+100, by+80), color=col, thickness=2)
             Graphics.draw_tool_icon(img, name, bx+10, by)
             Graphics.draw_text(img, name, bx+10, by-10, 0.5)
 
+    def update(self, img, cursor, is_grabbing):
+        h, w, c = img.shape
+        hover = self.select(w, h, cursor, is_grabbing)
+        self.paint(img, hover)
+        return hover
+
+# ==========================================
+# SESSION STATE (One per trainee)
+# ==========================================
+LOADOUTS = {
+    "ELEC": ["TAG", "MULTI", "WRENCH", "FUSE"],
+    "PLUMB": ["VALVE", "WRENCH"],
+}
+
+class Session:
+    # Everything a single trainee owns: scene, job progress, tool belt and
+    # fail reason. One process can host many of these (see workbench_server).
+    def __init__(self, sid=0):
+        self.id = sid
+        self.scene = "MENU"
+        self.fail_reason = ""
+        self.belt = ToolBelt()
+        self.reset()
+
+    def reset(self):
+        self.game_over = False
+        self.elec = {"step": 0, "timer": 0}
+        self.plumb = {"pressure": 150, "valve": 0, "fixed": 0}
+
+    def fail(self, reason):
+        self.game_over = True
+        self.fail_reason = reason
+
+    def enter(self, scene):
+        self.scene = scene
+        if scene in LOADOUTS: self.belt.set_loadout(LOADOUTS[scene])
+
 # ==========================================
 # JOB 1: HV ELECTRICIAN (The "Death Trap")
 # ==========================================
 # Sequence: Lockout -> Test -> Open -> Replace -> Unlock
-elec = {"step": 0, "timer": 0}
+def paint_elec(img, s):
+    ink = Graphics.ink
 
-def run_elec(img, cursor, is_grab, tools):
-    global GAME_OVER, FAIL_REASON
-    
     # 1. DRAW SCENE (Industrial Panel)
     Graphics.draw_box(img, [300, 150, 900, 550], C_PANEL)
     
     # Main Breaker Handle
-    handle_col = C_SAFE if elec["step"] >= 1 else C_DANGER
-    handle_y = 250 if elec["step"] >= 1 else 350
-    cv2.rectangle(img, (200, 200), (280, 400), (30,30,30), -1) # Track
-    cv2.circle(img, (240, handle_y), 30, handle_col, -1) # Handle
+    handle_col = C_SAFE if s.elec["step"] >= 1 else C_DANGER
+    handle_y = 250 if s.elec["step"] >= 1 else 350
+    ink(img, cv2.rectangle, (200, 200), (280, 400), color=(30,30,30), thickness=-1) # Track
+    ink(img, cv2.circle, (240, handle_y), 30, color=handle_col, thickness=-1) # Handle
     Graphics.draw_text(img, "415V MAIN", 180, 430, 0.6)
 
     # Lockout Hole
-    cv2.circle(img, (240, 250), 10, (0,0,0), -1)
-    if elec["step"] >= 2:
+    ink(img, cv2.circle, (240, 250), 10, color=(0,0,0), thickness=-1)
+    if s.elec["step"] >= 2:
         Graphics.draw_tool_icon(img, "TAG", 215, 225) # Draw Tag applied
     
     # Panel Door
-    if elec["step"] < 4:
+    if s.elec["step"] < 4:
         Graphics.draw_box(img, [400, 200, 800, 500], (60, 70, 80)) # Closed
         Graphics.draw_text(img, "DANGER: HIGH VOLTAGE", 450, 350, 1.0, C_DANGER)
     else:
@@ -130,10 +272,14 @@ def run_elec(img, cursor, is_grab, tools):
         for i in range(3):
             fx = 450 + (i*120)
             col = (200, 200, 200)
-            if i == 1 and elec["step"] < 6: col = (50, 50, 50) # Burnt Middle Fuse
-            if i == 1 and elec["step"] == 5: col = (20, 20, 20) # Empty Slot
-            cv2.rectangle(img, (fx, 250), (fx+60, 450), col, -1)
-            cv2.putText(img, "HV", (fx+10, 350), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0,0,0), 1)
+            if i == 1 and s.elec["step"] < 6: col = (50, 50, 50) # Burnt Middle Fuse
+            if i == 1 and s.elec["step"] == 5: col = (20, 20, 20) # Empty Slot
+            ink(img, cv2.rectangle, (fx, 250), (fx+60, 450), color=col, thickness=-1)
+            ink(img, cv2.putText, "HV", (fx+10, 350), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color=(0,0,0), thickness=1)
+
+def run_elec(img, cursor, is_grab, s):
+    tools = s.belt
+    # The static panel is drawn by paint_elec through the Compositor
 
     # 2. INTERACTION LOGIC (The Hard Part)
     cx, cy = cursor
@@ -141,183 +287,457 @@ def run_elec(img, cursor, is_grab, tools):
     # BREAKER LOGIC
     if 200 < cx < 280 and 200 < cy < 400 and is_grab:
         if tools.selected == None: # Hand
-            if elec["step"] == 0: elec["step"] = 1 # Off
-            elif elec["step"] == 1: elec["step"] = 0 # On (Mistake)
+            if s.elec["step"] == 0: s.elec["step"] = 1 # Off
+            elif s.elec["step"] == 1: s.elec["step"] = 0 # On (Mistake)
         elif tools.selected == "TAG":
-            if elec["step"] == 1: elec["step"] = 2 # Locked
-            elif elec["step"] == 0: 
-                GAME_OVER = True; FAIL_REASON = "CANNOT LOCK LIVE BREAKER!"
+            if s.elec["step"] == 1: s.elec["step"] = 2 # Locked
+            elif s.elec["step"] == 0: 
+                s.fail("CANNOT LOCK LIVE BREAKER!")
 
     # DOOR LOGIC
-    if 400 < cx < 800 and 200 < cy < 500 and elec["step"] < 4:
+    if 400 < cx < 800 and 200 < cy < 500 and s.elec["step"] < 4:
         # If trying to open...
         if is_grab and tools.selected == None:
-            if elec["step"] == 0: # Live
-                GAME_OVER = True; FAIL_REASON = "ARC FLASH! FATAL SHOCK."
-            elif elec["step"] == 1: # Off but not locked
-                GAME_OVER = True; FAIL_REASON = "VIOLATION: NO LOCKOUT TAG."
-            elif elec["step"] == 2:
-                elec["step"] = 4 # Open Safe
+            if s.elec["step"] == 0: # Live
+                s.fail("ARC FLASH! FATAL SHOCK.")
+            elif s.elec["step"] == 1: # Off but not locked
+                s.fail("VIOLATION: NO LOCKOUT TAG.")
+            elif s.elec["step"] == 2:
+                s.elec["step"] = 4 # Open Safe
 
     # FUSE LOGIC (Middle Fuse)
-    if elec["step"] >= 4 and 570 < cx < 630 and 250 < cy < 450:
+    if s.elec["step"] >= 4 and 570 < cx < 630 and 250 < cy < 450:
         if tools.selected == "MULTI":
             Graphics.draw_text(img, "0.0V (DEAD)", cx, cy, 0.8, C_SAFE)
             # Just verify, don't change step yet
         elif tools.selected == "WRENCH": # Using wrench to pull fuse
             if is_grab:
-                elec["step"] = 5 # Pulled
-        elif tools.selected == "FUSE" and elec["step"] == 5:
+                s.elec["step"] = 5 # Pulled
+        elif tools.selected == "FUSE" and s.elec["step"] == 5:
             if is_grab:
-                elec["step"] = 6 # Fixed!
+                s.elec["step"] = 6 # Fixed!
                 Graphics.draw_text(img, "SYSTEM RESTORED", 400, 600, 1.5, C_SAFE)
 
 # ==========================================
 # JOB 2: INDUSTRIAL PLUMBER (Pressure Logic)
 # ==========================================
-plumb = {"pressure": 150, "valve": 0, "fixed": 0}
+def paint_plumb(img, s):
+    ink = Graphics.ink
 
-def run_plumb(img, cursor, is_grab, tools):
-    global GAME_OVER, FAIL_REASON
-    
     # 1. DRAW SCENE
     # Pressure Gauge
     cx, cy = 300, 300
-    cv2.circle(img, (cx, cy), 80, (220, 220, 220), -1)
+    ink(img, cv2.circle, (cx, cy), 80, color=(220, 220, 220), thickness=-1)
     
     # Needle Logic
-    angle = 180 if plumb["pressure"] > 0 else 0
+    angle = 180 if s.plumb["pressure"] > 0 else 0
     ex = int(cx + 60 * math.cos(math.radians(angle)))
     ey = int(cy - 60 * math.sin(math.radians(angle)))
-    cv2.line(img, (cx, cy), (ex, ey), C_DANGER, 4)
-    Graphics.draw_text(img, f"{plumb['pressure']} PSI", cx-40, cy+110, 0.8, C_DANGER if plumb["pressure"]>0 else C_SAFE)
+    ink(img, cv2.line, (cx, cy), (ex, ey), color=C_DANGER, thickness=4)
+    Graphics.draw_text(img, f"{s.plumb['pressure']} PSI", cx-40, cy+110, 0.8, C_DANGER if s.plumb["pressure"]>0 else C_SAFE)
 
     # Valve Wheel
     vx, vy = 600, 300
-    col = C_SAFE if plumb["valve"] == 1 else C_DANGER
-    cv2.circle(img, (vx, vy), 60, col, 8)
-    cv2.line(img, (vx-60, vy), (vx+60, vy), col, 8)
+    col = C_SAFE if s.plumb["valve"] == 1 else C_DANGER
+    ink(img, cv2.circle, (vx, vy), 60, color=col, thickness=8)
+    ink(img, cv2.line, (vx-60, vy), (vx+60, vy), color=col, thickness=8)
     Graphics.draw_text(img, "ISOLATION VALVE", vx-80, vy+90, 0.6)
 
     # The Pipe Leak
     lx, ly = 900, 300
     Graphics.draw_box(img, [800, 280, 1000, 320], (100, 100, 100))
-    if plumb["fixed"] == 0:
+    if s.plumb["fixed"] == 0:
         # Spray Animation
-        cv2.line(img, (lx, ly), (lx+40, ly-60), (255, 200, 0), 2)
-        cv2.line(img, (lx, ly), (lx-20, ly-80), (255, 200, 0), 2)
+        ink(img, cv2.line, (lx, ly), (lx+40, ly-60), color=(255, 200, 0), thickness=2)
+        ink(img, cv2.line, (lx, ly), (lx-20, ly-80), color=(255, 200, 0), thickness=2)
         Graphics.draw_text(img, "LEAK!", lx-30, ly-50, 1.0, C_DANGER)
     else:
         Graphics.draw_text(img, "SEALED", lx-30, ly-50, 1.0, C_SAFE)
 
+def run_plumb(img, cursor, is_grab, s):
+    tools = s.belt
+    # The static gauge, valve and pipe are drawn by paint_plumb through the Compositor
+
     # 2. LOGIC
     mx, my = cursor
     
     # Valve Interaction
     if 540 < mx < 660 and 240 < my < 360 and is_grab:
         if tools.selected == "VALVE": # Must use valve tool
-            plumb["valve"] = 1
-            plumb["pressure"] = 0
+            s.plumb["valve"] = 1
+            s.plumb["pressure"] = 0
     
     # Leak Interaction
     if 800 < mx < 1000 and 200 < my < 400 and is_grab:
         if tools.selected == "WRENCH":
-            if plumb["pressure"] > 0:
-                GAME_OVER = True; FAIL_REASON = "EXPLOSION! PRESSURE TOO HIGH."
+            if s.plumb["pressure"] > 0:
+                s.fail("EXPLOSION! PRESSURE TOO HIGH.")
             else:
-                plumb["fixed"] = 1
+                s.plumb["fixed"] = 1
 
 
 # ==========================================
-# MAIN LOOP
+# STATIC SCREENS (Painted once per state, see Compositor)
 # ==========================================
-cap = cv2.VideoCapture(0)
-cap.set(3, WIDTH)
-cap.set(4, HEIGHT)
+def paint_game_over(img, s):
+    Graphics.draw_box(img, [0, 0, WIDTH, HEIGHT], (0, 0, 0), 0.9)
+    Graphics.draw_text(img, "CERTIFICATION FAILED", 350, 300, 2.0, C_DANGER)
+    Graphics.draw_text(img, s.fail_reason, 400, 400, 1.0, C_TEXT)
+    Graphics.draw_text(img, "Grab to Retry", 550, 500, 1.0, C_WARN)
 
-belt = ToolBelt()
+def paint_menu(img):
+    Graphics.draw_text(img, "DAKSHYA ENTERPRISE", 400, 150, 1.5, C_ACCENT)
+    Graphics.draw_text(img, "Select Certification:", 500, 250, 0.8)
 
-while True:
-    success, img = cap.read()
-    if not success: continue
-    img = cv2.flip(img, 1)
-    
-    # HAND TRACKING
-    img_rgb = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
-    results = hands.process(img_rgb)
-    
-    cursor = (0, 0)
-    is_grab = False
-    
-    if results.multi_hand_landmarks:
-        lms = results.multi_hand_landmarks[0]
-        mp_draw.draw_landmarks(img, lms, mp_hands.HAND_CONNECTIONS)
-        
-        # Cursor is Index Finger Tip
-        ix, iy = int(lms.landmark[8].x * WIDTH), int(lms.landmark[8].y * HEIGHT)
-        cursor = (ix, iy)
-        
-        # Grab is Fist Check (Tip close to Wrist)
-        dist = math.hypot(ix - int(lms.landmark[0].x * WIDTH), iy - int(lms.landmark[0].y * HEIGHT))
-        is_grab = dist < 150 # Threshold for "Fist"
-        
-        # Draw Cursor
-        col = (0, 255, 0) if is_grab else (0, 255, 255)
-        cv2.circle(img, (ix, iy), 15, col, 2)
-        if is_grab: cv2.circle(img, (ix, iy), 10, col, -1)
+    # Buttons
+    Graphics.draw_box(img, [300, 300, 600, 450], C_PANEL)
+    Graphics.draw_text(img, "HV ELECTRICIAN", 340, 390, 0.8)
+
+    Graphics.draw_box(img, [700, 300, 1000, 450], C_PANEL)
+    Graphics.draw_text(img, "IND. PLUMBER", 760, 390, 0.8)
+
+def paint_job(img, paint_scene, s, hover):
+    paint_scene(img, s)
+    s.belt.paint(img, hover)
+    # Back Button
+    Graphics.draw_box(img, [1100, 20, 1250, 70], (50, 50, 50))
+    Graphics.draw_text(img, "MENU", 1140, 60, 0.8)
+
+# ==========================================
+# FRAME LOGIC (Shared by every runner)
+# ==========================================
+def hand_input(pts):
+    # pts: 21 normalised (x, y[, z]) hand landmarks -> (cursor, is_grab)
+    # Cursor is Index Finger Tip
+    ix, iy = int(pts[8][0] * WIDTH), int(pts[8][1] * HEIGHT)
+
+    # Grab is Fist Check (Tip close to Wrist)
+    dist = math.hypot(ix - int(pts[0][0] * WIDTH), iy - int(pts[0][1] * HEIGHT))
+    return (ix, iy), dist < GRAB_DIST
+
+def landmarks_to_array(lms):
+    return np.array([(p.x, p.y, p.z) for p in lms.landmark], np.float32)
+
+def read_hand(results):
+    # Returns (cursor, is_grab, landmarks) for the first detected hand
+    if not results.multi_hand_landmarks:
+        return (0, 0), False, None
+    lms = results.multi_hand_landmarks[0]
+    cursor, is_grab = hand_input(landmarks_to_array(lms))
+    return cursor, is_grab, lms
+
+def draw_hand(img, pts):
+    # Lightweight skeleton for landmark arrays (ROI tracking has no mp objects)
+    h, w = img.shape[:2]
+    px = (pts[:, :2] * (w, h)).astype(np.int32)
+    for a, b in models.solutions().hands.HAND_CONNECTIONS:
+        cv2.line(img, tuple(px[a]), tuple(px[b]), (255, 255, 255), 2)
+    for x, y in px:
+        cv2.circle(img, (x, y), 4, (0, 0, 255), -1)
+
+def draw_cursor(img, cursor, is_grab):
+    col = (0, 255, 0) if is_grab else (0, 255, 255)
+    cv2.circle(img, cursor, 15, col, 2)
+    if is_grab: cv2.circle(img, cursor, 10, col, -1)
+
+def render_frame(img, cursor, is_grab, s):
+    h, w = img.shape[:2]
+    belt = s.belt
 
     # GAME OVER SCREEN
-    if GAME_OVER:
-        Graphics.draw_box(img, [0, 0, WIDTH, HEIGHT], (0, 0, 0), 0.9)
-        Graphics.draw_text(img, "CERTIFICATION FAILED", 350, 300, 2.0, C_DANGER)
-        Graphics.draw_text(img, FAIL_REASON, 400, 400, 1.0, C_TEXT)
-        Graphics.draw_text(img, "Grab to Retry", 550, 500, 1.0, C_WARN)
-        if is_grab: 
-            GAME_OVER = False
-            elec["step"] = 0
-            plumb["pressure"] = 150
-            plumb["valve"] = 0
-            plumb["fixed"] = 0
-            CURRENT_SCENE = "MENU"
+    if s.game_over:
+        COMPOSITOR.blend(img, ("OVER", s.fail_reason), lambda layer: paint_game_over(layer, s))
+        if is_grab:
+            s.reset()
+            s.enter("MENU")
 
     # SCENE LOGIC
-    elif CURRENT_SCENE == "MENU":
-        Graphics.draw_text(img, "DAKSHYA ENTERPRISE", 400, 150, 1.5, C_ACCENT)
-        Graphics.draw_text(img, "Select Certification:", 500, 250, 0.8)
-        
-        # Buttons
-        Graphics.draw_box(img, [300, 300, 600, 450], C_PANEL)
-        Graphics.draw_text(img, "HV ELECTRICIAN", 340, 390, 0.8)
-        
-        Graphics.draw_box(img, [700, 300, 1000, 450], C_PANEL)
-        Graphics.draw_text(img, "IND. PLUMBER", 760, 390, 0.8)
-        
+    elif s.scene == "MENU":
+        COMPOSITOR.blend(img, ("MENU",), paint_menu)
+
         if is_grab:
             if 300 < cursor[0] < 600 and 300 < cursor[1] < 450:
-                CURRENT_SCENE = "ELEC"
-                belt.set_loadout(["TAG", "MULTI", "WRENCH", "FUSE"])
+                s.enter("ELEC")
             elif 700 < cursor[0] < 1000 and 300 < cursor[1] < 450:
-                CURRENT_SCENE = "PLUMB"
-                belt.set_loadout(["VALVE", "WRENCH"])
+                s.enter("PLUMB")
 
-    elif CURRENT_SCENE == "ELEC":
-        run_elec(img, cursor, is_grab, belt)
-        belt.update(img, cursor, is_grab)
-        # Back Button
-        Graphics.draw_box(img, [1100, 20, 1250, 70], (50, 50, 50))
-        Graphics.draw_text(img, "MENU", 1140, 60, 0.8)
-        if 1100 < cursor[0] < 1250 and 20 < cursor[1] < 70 and is_grab: CURRENT_SCENE = "MENU"
+    elif s.scene in ("ELEC", "PLUMB"):
+        hover = belt.select(w, h, cursor, is_grab)
+        if s.scene == "ELEC":
+            key = ("ELEC", s.elec["step"], tuple(belt.tools), belt.selected, hover)
+            COMPOSITOR.blend(img, key, lambda layer: paint_job(layer, paint_elec, s, hover))
+            run_elec(img, cursor, is_grab, s)
+        else:
+            key = ("PLUMB", s.plumb["pressure"], s.plumb["valve"], s.plumb["fixed"], tuple(belt.tools), belt.selected, hover)
+            COMPOSITOR.blend(img, key, lambda layer: paint_job(layer, paint_plumb, s, hover))
+            run_plumb(img, cursor, is_grab, s)
 
-    elif CURRENT_SCENE == "PLUMB":
-        run_plumb(img, cursor, is_grab, belt)
-        belt.update(img, cursor, is_grab)
         # Back Button
-        Graphics.draw_box(img, [1100, 20, 1250, 70], (50, 50, 50))
-        Graphics.draw_text(img, "MENU", 1140, 60, 0.8)
-        if 1100 < cursor[0] < 1250 and 20 < cursor[1] < 70 and is_grab: CURRENT_SCENE = "MENU"
+        if 1100 < cursor[0] < 1250 and 20 < cursor[1] < 70 and is_grab: s.enter("MENU")
+
+# ==========================================
+# HAND TRACKER (ROI crops + rate limit)
+# ==========================================
+# Full-frame detection finds the hand once; after that landmarks are inferred
+# only on a downscaled crop around the last hand box (skipped if roi_model is None). A lost hand or a low
+# handedness score falls back to full-frame detection. With max_hz set,
+# frames between inferences extrapolate the cursor (landmark 8) and the grab
+# distance from the last two results instead of running the model; the cap
+# also holds while no hand is in view, so full-frame searches are rate-limited.
+class HandTracker:
+    def __init__(self, full_model, roi_model, max_hz=None, roi_size=256, margin=0.35, min_score=0.6):
+        self.full_model = full_model
+        self.roi_model = roi_model
+        self.max_hz = max_hz
+        self.roi_size = roi_size
+        self.margin = margin
+        self.min_score = min_score
+        self.box = None # (x0, y0, x1, y1) pixels of the next crop
+        self.last = None # (t, cursor xy, grab dist) of the latest inference
+        self.last_run = None # Time of the latest inference, hand found or not
+        self.prev = None
+        self.started = None
+        self.frames = 0
+        self.inferences = 0
+        self.roi_hits = 0
+
+    def process(self, img, now=None):
+        # Returns (cursor, is_grab, pts); pts is None on extrapolated frames
+        now = time.perf_counter() if now is None else now
+        if self.started is None: self.started = now
+        self.frames += 1
+
+        if self.max_hz and self.last_run is not None and now - self.last_run < 1.0 / self.max_hz:
+            # No hand at the last run: stay "no hand" until the next full-frame search is due
+            return self._extrapolate(now) if self.last is not None else ((0, 0), False, None)
+
+        h, w = img.shape[:2]
+        pts = self._infer_roi(img) if self.box is not None and self.roi_model else None
+        if pts is not None: self.roi_hits += 1
+        else: pts = self._infer(self.full_model, img, 0.0)
+        self.inferences += 1
+        self.last_run = now
+
+        if pts is None:
+            self.box = self.last = self.prev = None
+            return (0, 0), False, None
+
+        self.box = self._next_box(pts, w, h)
+        tip = pts[8, :2] * (w, h)
+        dist = float(np.hypot(*(tip - pts[0, :2] * (w, h))))
+        self.prev, self.last = self.last, (now, tip, dist)
+        return (int(tip[0]), int(tip[1])), dist < GRAB_DIST, pts
+
+    def _infer(self, model, img, min_score):
+        results = model.process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+        if not results.multi_hand_landmarks: return None
+        if results.multi_handedness[0].classification[0].score < min_score: return None
+        return landmarks_to_array(results.multi_hand_landmarks[0])
+
+    def _infer_roi(self, img):
+        x0, y0, x1, y1 = self.box
+        scale = self.roi_size / max(x1 - x0, y1 - y0)
+        crop = cv2.resize(img[y0:y1, x0:x1], (max(1, round((x1 - x0) * scale)), max(1, round((y1 - y0) * scale))),
+                          interpolation=cv2.INTER_AREA)
+        pts = self._infer(self.roi_model, crop, self.min_score)
+        if pts is None: return None
+
+        # Crop-normalised -> frame-normalised
+        h, w = img.shape[:2]
+        pts[:, 0] = (pts[:, 0] * (x1 - x0) + x0) / w
+        pts[:, 1] = (pts[:, 1] * (y1 - y0) + y0) / h
+        return pts
+
+    def _next_box(self, pts, w, h):
+        xy = pts[:, :2] * (w, h)
+        (bx0, by0), (bx1, by1) = xy.min(axis=0), xy.max(axis=0)
+        side = max(bx1 - bx0, by1 - by0, 48) * (1 + 2 * self.margin)
+        cx, cy = (bx0 + bx1) / 2, (by0 + by1) / 2
+        x0, y0 = int(max(0, cx - side / 2)), int(max(0, cy - side / 2))
+        x1, y1 = int(min(w, cx + side / 2)), int(min(h, cy + side / 2))
+        return (x0, y0, x1, y1) if x1 - x0 > 8 and y1 - y0 > 8 else None
+
+    def _extrapolate(self, now):
+        t1, c1, d1 = self.last
+        c, d = c1, d1
+        if self.prev is not None and t1 > self.prev[0]:
+            t0, c0, d0 = self.prev
+            k = min((now - t1) / (t1 - t0), 1.0) # Never run ahead more than one interval
+            c = c1 + (c1 - c0) * k
+            d = d1 + (d1 - d0) * k
+        return (int(c[0]), int(c[1])), d < GRAB_DIST, None
+
+    def stats(self):
+        span = (self.last[0] if self.last else 0) - (self.started or 0)
+        return {
+            "frames": self.frames,
+            "inferences": self.inferences,
+            "roi_share": self.roi_hits / self.inferences if self.inferences else 0.0,
+            "inference_hz": self.inferences / span if span > 0 else 0.0,
+        }
+
+# ==========================================
+# PIPELINE ENGINE (Capture -> Inference -> Render)
+# ==========================================
+# Each stage runs on its own thread and hands frames over through small
+# queues that drop the oldest frame when full, so a slow stage never makes
+# the one before it wait. The render stage stays on the main thread because
+# cv2.imshow / cv2.waitKey must be called from there.
+class DropQueue:
+    def __init__(self, maxsize=2):
+        self.items = deque(maxlen=maxsize)
+        self.cond = threading.Condition()
+        self.dropped = 0
+
+    def put(self, item):
+        with self.cond:
+            if len(self.items) == self.items.maxlen:
+                self.dropped += 1 # deque(maxlen) evicts the oldest for us
+            self.items.append(item)
+            self.cond.notify()
+
+    def get(self, timeout=None):
+        with self.cond:
+            if not self.items:
+                self.cond.wait(timeout)
+            return self.items.popleft() if self.items else None
+
+    def __len__(self):
+        return len(self.items)
+
+class StageMeter:
+    # Frames per second over a sliding window of recent ticks
+    def __init__(self, window=30):
+        self.stamps = deque(maxlen=window)
+
+    def tick(self):
+        self.stamps.append(time.perf_counter())
+
+    @property
+    def fps(self):
+        if len(self.stamps) < 2: return 0.0
+        span = self.stamps[-1] - self.stamps[0]
+        return (len(self.stamps) - 1) / span if span > 0 else 0.0
+
+class CaptureThread(threading.Thread):
+    def __init__(self, cap, out_q):
+        super().__init__(daemon=True)
+        self.cap = cap
+        self.out_q = out_q
+        self.meter = StageMeter()
+        self.running = True
+
+    def run(self):
+        while self.running:
+            success, img = self.cap.read()
+            if not success:
+                time.sleep(0.005)
+                continue
+            self.out_q.put(cv2.flip(img, 1))
+            self.meter.tick()
+
+class InferenceWorker(threading.Thread):
+    def __init__(self, in_q, out_q, tracker=None):
+        super().__init__(daemon=True)
+        self.in_q = in_q
+        self.out_q = out_q
+        self.tracker = tracker
+        self.meter = StageMeter()
+        self.running = True
+
+    def run(self):
+        while self.running:
+            img = self.in_q.get(timeout=0.1)
+            if img is None: continue
+            if self.tracker is not None:
+                hand = self.tracker.process(img)
+            else:
+                cursor, is_grab, lms = read_hand(hands().process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB)))
+                hand = (cursor, is_grab, None if lms is None else landmarks_to_array(lms))
+            self.out_q.put((img, hand))
+            self.meter.tick()
+
+class Pipeline:
+    def __init__(self, cap, depth=2, tracker=None):
+        self.frames = DropQueue(depth) # capture -> inference
+        self.tracked = DropQueue(depth) # inference -> render
+        self.capture = CaptureThread(cap, self.frames)
+        self.inference = InferenceWorker(self.frames, self.tracked, tracker)
+        self.render = StageMeter()
+
+    def start(self):
+        self.capture.start()
+        self.inference.start()
+
+    def stop(self):
+        self.capture.running = False
+        self.inference.running = False
+        self.capture.join(timeout=1)
+        self.inference.join(timeout=1)
+
+    def next(self, timeout=0.01):
+        # Returns (img, (cursor, is_grab, landmark array)) or None if nothing new yet
+        return self.tracked.get(timeout)
+
+    def stats(self):
+        tracker = self.inference.tracker
+        return {
+            "infer_hz": tracker.stats()["inference_hz"] if tracker else self.inference.meter.fps,
+            "capture_fps": self.capture.meter.fps,
+            "inference_fps": self.inference.meter.fps,
+            "render_fps": self.render.fps,
+            "frames_depth": len(self.frames),
+            "tracked_depth": len(self.tracked),
+            "dropped": self.frames.dropped + self.tracked.dropped,
+        }
+
+    def draw_stats(self, img):
+        s = self.stats()
+        line = (f"CAP {s['capture_fps']:.0f}  INF {s['inference_fps']:.0f}  "
+                f"RND {s['render_fps']:.0f} FPS | MODEL {s['infer_hz']:.0f} Hz | Q {s['frames_depth']}/{s['tracked_depth']}")
+        cv2.putText(img, line, (10, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, C_TEXT, 1)
+
+# ==========================================
+# MAIN LOOP
+# ==========================================
+def main():
+    startup.mark("imports")
+
+    # Build the hand models while the camera opens (both take a while)
+    with ThreadPoolExecutor(1) as pool:
+        tracker = pool.submit(make_tracker)
+        cap = cv2.VideoCapture(0)
+        cap.set(3, WIDTH)
+        cap.set(4, HEIGHT)
+        startup.mark("camera")
+        tracker = tracker.result()
+    startup.mark("models")
+
+    session = Session()
+    pipe = Pipeline(cap, tracker=tracker)
+    pipe.start()
+
+    while True:
+        item = pipe.next()
+        if item is not None:
+            img, (cursor, is_grab, pts) = item
+
+            # HAND TRACKING (pts is None on extrapolated frames)
+            if pts is not None: draw_hand(img, pts)
+            if cursor != (0, 0): draw_cursor(img, cursor, is_grab)
+
+            render_frame(img, cursor, is_grab, session)
+            pipe.render.tick()
+            pipe.draw_stats(img)
+            cv2.imshow("Dakshya Enterprise", img)
+            startup.first_frame("workbench")
+
+        # Keep the window responsive even when no new frame arrived
+        if cv2.waitKey(1) & 0xFF == ord('q'): break
 
-    cv2.imshow("Dakshya Enterprise", img)
-    if cv2.waitKey(1) & 0xFF == ord('q'): break
+    pipe.stop()
+    cap.release()
+    cv2.destroyAllWindows()
 
-cap.release()
-cv2.destroyAllWindows()
\ No newline at end of file
+if __name__ == "__main__":
+    main()
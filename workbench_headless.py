@@ -0,0 +1,188 @@
+"""Headless replay mode for the Dakshya workbench.
+
+Feeds recorded video files (or synthetic frames) and recorded hand-landmark
+traces through the same render_frame / run_elec / run_plumb / ToolBelt logic
+as the live app, without a camera or a window, and reports throughput.
+
+Trace format: a .npy float32 array of shape (T, 21, 3) holding normalised
+MediaPipe hand landmarks per frame, NaN rows for frames without a hand.
+
+    python workbench_headless.py --video session.mp4 --record-trace session.npy
+    python workbench_headless.py --video session.mp4 --trace session.npy --scene ELEC
+"""
+import argparse
+import json
+import math
+import time
+
+import cv2
+import numpy as np
+
+import workbench
+from vision_kit.theme import C_BG
+
+SCENES = ("MENU", "ELEC", "PLUMB", "GAME_OVER")
+
+# ==========================================
+# FRAME SOURCES
+# ==========================================
+def video_frames(path, limit=None):
+    cap = cv2.VideoCapture(path)
+    count = 0
+    while limit is None or count < limit:
+        success, img = cap.read()
+        if not success: break
+        img = cv2.resize(img, (workbench.WIDTH, workbench.HEIGHT))
+        yield cv2.flip(img, 1)
+        count += 1
+    cap.release()
+
+def synthetic_frames(n, seed=0, variants=8):
+    # Noisy workshop-grey frames; a few are pre-generated and copied per frame
+    # because rendering draws into the frame in place.
+    rng = np.random.default_rng(seed)
+    base = np.full((workbench.HEIGHT, workbench.WIDTH, 3), C_BG, np.uint8)
+    pool = [cv2.add(base, rng.integers(0, 40, base.shape, dtype=np.uint8)) for _ in range(variants)]
+    for i in range(n):
+        yield pool[i % variants].copy()
+
+# ==========================================
+# LANDMARK TRACES
+# ==========================================
+def load_trace(path):
+    return np.load(path).astype(np.float32)
+
+def record_trace(frames, out_path=None):
+    # Runs MediaPipe once over the frames and keeps only the landmarks
+    rows = []
+    for img in frames:
+        results = workbench.hands().process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+        if results.multi_hand_landmarks:
+            rows.append(workbench.landmarks_to_array(results.multi_hand_landmarks[0]))
+        else:
+            rows.append(np.full((21, 3), np.nan, np.float32))
+    trace = np.stack(rows) if rows else np.zeros((0, 21, 3), np.float32)
+    if out_path: np.save(out_path, trace)
+    return trace
+
+def synthetic_trace(n, radius=0.15, grab=False):
+    # Open (or fisted) hand whose index tip circles the screen centre
+    t = np.linspace(0, 2 * math.pi, n, endpoint=False, dtype=np.float32)
+    tip = np.stack([0.5 + radius * np.cos(t), 0.5 + radius * np.sin(t)], axis=1)
+    reach = 0.05 if grab else 0.3 # Wrist distance in frame heights (fist < 150 px)
+    wrist = tip + np.array([0, reach], np.float32)
+
+    trace = np.zeros((n, 21, 3), np.float32)
+    w = np.linspace(0, 1, 21, dtype=np.float32)[None, :, None]
+    trace[:, :, :2] = wrist[:, None, :] * (1 - w) + tip[:, None, :] * w
+    trace[:, 0, :2] = wrist
+    trace[:, 8, :2] = tip
+    return trace
+
+# ==========================================
+# REPLAY ENGINE
+# ==========================================
+def set_scene(scene, session):
+    session.reset()
+    if scene == "GAME_OVER":
+        session.enter("MENU")
+        session.fail("ARC FLASH! FATAL SHOCK.")
+    else:
+        session.enter(scene)
+
+def replay(frames, trace=None, scene="MENU", setup=None, tracker=None, fps=30.0):
+    # Without a trace MediaPipe runs on every frame, so its cost is measured too.
+    # A HandTracker replaces plain full-frame detection and runs on a simulated
+    # clock at the given fps. setup() runs after the scene is entered, e.g. to
+    # jump to a later job step.
+    session = workbench.Session()
+    set_scene(scene, session)
+    if setup: setup(session)
+
+    infer_ms, draw_ms = [], []
+    start = time.perf_counter()
+    for i, img in enumerate(frames):
+        t0 = time.perf_counter()
+        if trace is not None:
+            pts = trace[i % len(trace)]
+            if np.isnan(pts[0, 0]): cursor, is_grab = (0, 0), False
+            else: cursor, is_grab = workbench.hand_input(pts)
+            lms = None
+        elif tracker is not None:
+            cursor, is_grab, pts = tracker.process(img, now=i / fps)
+            lms = None
+            if pts is not None: workbench.draw_hand(img, pts)
+        else:
+            results = workbench.hands().process(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+            cursor, is_grab, lms = workbench.read_hand(results)
+        t1 = time.perf_counter()
+
+        if lms is not None:
+            workbench.draw_hand(img, workbench.landmarks_to_array(lms))
+        if cursor != (0, 0):
+            workbench.draw_cursor(img, cursor, is_grab)
+        workbench.render_frame(img, cursor, is_grab, session)
+        t2 = time.perf_counter()
+
+        infer_ms.append((t1 - t0) * 1000)
+        draw_ms.append((t2 - t1) * 1000)
+
+    return summarize(infer_ms, draw_ms, time.perf_counter() - start)
+
+def summarize(infer_ms, draw_ms, wall_s):
+    infer = np.asarray(infer_ms)
+    draw = np.asarray(draw_ms)
+    total = infer + draw
+    if not total.size:
+        return {"frames": 0}
+    spent = total.sum()
+    return {
+        "frames": int(total.size),
+        "fps": total.size / wall_s if wall_s > 0 else 0.0,
+        "p50_ms": float(np.percentile(total, 50)),
+        "p99_ms": float(np.percentile(total, 99)),
+        "mediapipe_ms": float(infer.mean()),
+        "draw_ms": float(draw.mean()),
+        "mediapipe_share": float(infer.sum() / spent) if spent else 0.0,
+    }
+
+def format_report(name, r):
+    if not r.get("frames"): return f"{name:<10} no frames"
+    return (f"{name:<10} {r['frames']:>6} fr  {r['fps']:>8.1f} fps  "
+            f"p50 {r['p50_ms']:6.2f} ms  p99 {r['p99_ms']:6.2f} ms  "
+            f"mediapipe {r['mediapipe_ms']:6.2f} ms ({r['mediapipe_share']:.0%})  draw {r['draw_ms']:6.2f} ms")
+
+# ==========================================
+# CLI
+# ==========================================
+def main():
+    ap = argparse.ArgumentParser(description="Replay workbench scenes without a camera or window.")
+    ap.add_argument("--video", help="recorded video file (default: synthetic frames)")
+    ap.add_argument("--trace", help="landmark trace .npy to replay instead of running MediaPipe")
+    ap.add_argument("--record-trace", metavar="OUT", help="run MediaPipe over --video and save its trace")
+    ap.add_argument("--scene", choices=SCENES, default="MENU")
+    ap.add_argument("--frames", type=int, default=300, help="frame limit")
+    ap.add_argument("--track", action="store_true", help="use ROI hand tracking instead of full-frame detection")
+    ap.add_argument("--max-hz", type=float, default=0, help="cap tracker inference rate (0 = every frame)")
+    ap.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = ap.parse_args()
+
+    if args.video: frames = video_frames(args.video, args.frames)
+    else: frames = synthetic_frames(args.frames)
+
+    if args.record_trace:
+        trace = record_trace(frames, args.record_trace)
+        print(f"Saved {len(trace)} frames of landmarks to {args.record_trace}")
+        return
+
+    trace = load_trace(args.trace) if args.trace else None
+    tracker = None
+    if args.track:
+        workbench.MAX_INFER_HZ = args.max_hz
+        tracker = workbench.make_tracker()
+    report = replay(frames, trace, args.scene, tracker=tracker)
+    if tracker is not None: report.update(tracker.stats())
+    print(json.dumps(report) if args.json else format_report(args.scene, report))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""Multi-station session server for workbench certification days.
+
+One process hosts many trainees. Each station is a capture source bound to
+its own workbench.Session, HandTracker and MediaPipe models (MediaPipe keeps
+per-stream tracking state, so models are never shared between stations).
+Stations are sharded across worker processes. Every worker ticks over all of
+its stations at once: it gathers the newest frame from each, runs hand
+inference on that batch, then updates and renders each scene. Throughput
+scales with --workers instead of one process per webcam.
+
+Sources:
+    0, 1, ...             local webcams
+    path/to/video.mp4     recorded footage
+    unix:/tmp/st3.sock    thin client streaming frames over a local socket
+                          (4-byte big-endian length + JPEG; the rendered
+                          frame is sent back the same way)
+
+    python workbench_server.py --workers 4 --source 0 --source 1 --source unix:/tmp/st3.sock --show
+    python workbench_server.py --client unix:/tmp/st3.sock
+"""
+import argparse
+import multiprocessing
+import os
+import queue
+import socket
+import struct
+import threading
+import time
+
+import cv2
+import numpy as np
+
+import workbench
+
+HEADER = struct.Struct(">I")
+
+# ==========================================
+# WIRE PROTOCOL (Thin client <-> server)
+# ==========================================
+def send_frame(sock, img, quality=80):
+    ok, buf = cv2.imencode(".jpg", img, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    sock.sendall(HEADER.pack(len(buf)) + buf.tobytes())
+
+def recv_exact(sock, n):
+    data = bytearray()
+    while len(data) < n:
+        chunk = sock.recv(n - len(data))
+        if not chunk: raise ConnectionError("station disconnected")
+        data += chunk
+    return bytes(data)
+
+def recv_frame(sock):
+    (n,) = HEADER.unpack(recv_exact(sock, HEADER.size))
+    return cv2.imdecode(np.frombuffer(recv_exact(sock, n), np.uint8), cv2.IMREAD_COLOR)
+
+class SocketSource:
+    # cv2.VideoCapture-like source fed by one thin client over a UNIX socket
+    def __init__(self, path):
+        if os.path.exists(path): os.unlink(path)
+        self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.server.bind(path)
+        self.server.listen(1)
+        self.frames = workbench.DropQueue(1)
+        self.conn = None
+        self.send_lock = threading.Lock()
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try: conn, _ = self.server.accept()
+            except OSError: return # Closed by release()
+            self.conn = conn
+            try:
+                while True: self.frames.put(recv_frame(conn))
+            except (ConnectionError, OSError):
+                pass
+            finally:
+                self.conn = None
+                conn.close()
+
+    def read(self):
+        img = self.frames.get(timeout=0.1)
+        return img is not None, img
+
+    def reply(self, img):
+        conn = self.conn
+        if conn is None: return
+        with self.send_lock:
+            try: send_frame(conn, img)
+            except OSError: pass
+
+    def release(self):
+        self.server.close()
+
+def open_source(spec):
+    if spec.startswith("unix:"): return SocketSource(spec[len("unix:"):])
+    cap = cv2.VideoCapture(int(spec) if spec.isdigit() else spec)
+    cap.set(3, workbench.WIDTH)
+    cap.set(4, workbench.HEIGHT)
+    return cap
+
+# ==========================================
+# STATIONS & WORKERS
+# ==========================================
+class Station:
+    def __init__(self, sid, spec):
+        self.session = workbench.Session(sid)
+        self.spec = spec
+        self.source = open_source(spec)
+        self.frames = workbench.DropQueue(1)
+        self.capture = workbench.CaptureThread(self.source, self.frames)
+        self.tracker = workbench.make_tracker(private=True)
+        self.meter = workbench.StageMeter()
+        self.last = None
+
+    def status(self, preview_scale):
+        s = self.session
+        preview = None
+        if preview_scale and self.last is not None:
+            preview = cv2.resize(self.last, None, fx=preview_scale, fy=preview_scale, interpolation=cv2.INTER_AREA)
+        return {
+            "id": s.id, "source": self.spec, "pid": os.getpid(),
+            "scene": "GAME_OVER" if s.game_over else s.scene,
+            "fail_reason": s.fail_reason if s.game_over else "",
+            "fps": self.meter.fps, "preview": preview,
+        }
+
+def run_worker(shard, status_q, stop, preview_scale=0.0, report_every=0.5):
+    stations = [Station(sid, spec) for sid, spec in shard]
+    for st in stations: st.capture.start()
+
+    last_report = 0.0
+    while not stop.is_set():
+        # 1. Batch: the newest frame of every station that has one
+        batch = [(st, st.frames.get(timeout=0)) for st in stations]
+        batch = [(st, img) for st, img in batch if img is not None]
+        if not batch:
+            time.sleep(0.002)
+            continue
+
+        # 2. Hand inference over the whole batch
+        hands = [st.tracker.process(img) for st, img in batch]
+
+        # 3. Scene updates and rendering
+        for (st, img), (cursor, is_grab, pts) in zip(batch, hands):
+            if pts is not None: workbench.draw_hand(img, pts)
+            if cursor != (0, 0): workbench.draw_cursor(img, cursor, is_grab)
+            workbench.render_frame(img, cursor, is_grab, st.session)
+            if isinstance(st.source, SocketSource): st.source.reply(img)
+            st.last = img
+            st.meter.tick()
+
+        # 4. Status for the supervisor (never block the tick on it)
+        now = time.perf_counter()
+        if now - last_report > report_every:
+            last_report = now
+            for st in stations:
+                try: status_q.put_nowait(st.status(preview_scale))
+                except queue.Full: break
+
+    for st in stations:
+        st.capture.running = False
+        st.source.release()
+
+# ==========================================
+# SUPERVISOR
+# ==========================================
+def mosaic(status, cols=4, tile=(320, 180)):
+    ids = sorted(status)
+    rows = max(1, (len(ids) + cols - 1) // cols)
+    board = np.zeros((rows * tile[1], cols * tile[0], 3), np.uint8)
+    for n, sid in enumerate(ids):
+        st = status[sid]
+        x, y = (n % cols) * tile[0], (n // cols) * tile[1]
+        if st["preview"] is not None:
+            board[y:y+tile[1], x:x+tile[0]] = cv2.resize(st["preview"], tile)
+        col = workbench.C_DANGER if st["scene"] == "GAME_OVER" else workbench.C_SAFE
+        cv2.putText(board, f"#{sid} {st['scene']} {st['fps']:.0f}fps", (x+8, y+20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, col, 1)
+    return board
+
+def serve(specs, workers=1, show=False):
+    shards = [[] for _ in range(max(1, workers))]
+    for sid, spec in enumerate(specs): shards[sid % len(shards)].append((sid, spec))
+
+    ctx = multiprocessing.get_context("spawn")
+    status_q = ctx.Queue(maxsize=1024)
+    stop = ctx.Event()
+    procs = [ctx.Process(target=run_worker, args=(shard, status_q, stop, 0.25 if show else 0.0), daemon=True)
+             for shard in shards if shard]
+    for p in procs: p.start()
+    print(f"Serving {len(specs)} stations on {len(procs)} worker processes")
+
+    status = {}
+    last_print = 0.0
+    try:
+        while any(p.is_alive() for p in procs):
+            try:
+                while True:
+                    st = status_q.get(timeout=0.05)
+                    status[st["id"]] = st
+            except queue.Empty:
+                pass
+
+            if show:
+                if status: cv2.imshow("Dakshya Stations", mosaic(status))
+                if cv2.waitKey(1) & 0xFF == ord('q'): break
+            elif time.time() - last_print > 2:
+                last_print = time.time()
+                for sid in sorted(status):
+                    st = status[sid]
+                    print(f"#{sid:<3} pid {st['pid']:<6} {st['scene']:<10} {st['fps']:5.1f} fps  {st['fail_reason']}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop.set()
+        for p in procs: p.join(timeout=2)
+        cv2.destroyAllWindows()
+
+def run_client(spec, camera=0):
+    # Thin station: stream the webcam to the server and show what it renders
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(spec[len("unix:"):] if spec.startswith("unix:") else spec)
+    cap = cv2.VideoCapture(camera)
+    cap.set(3, workbench.WIDTH)
+    cap.set(4, workbench.HEIGHT)
+    while True:
+        success, img = cap.read()
+        if not success: continue
+        send_frame(sock, img)
+        cv2.imshow("Dakshya Station", recv_frame(sock))
+        if cv2.waitKey(1) & 0xFF == ord('q'): break
+    cap.release()
+    sock.close()
+    cv2.destroyAllWindows()
+
+def main():
+    ap = argparse.ArgumentParser(description="Host many workbench trainees in one server.")
+    ap.add_argument("--source", action="append", default=[], help="webcam index, video path or unix:/socket/path")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    ap.add_argument("--show", action="store_true", help="show a mosaic of all stations")
+    ap.add_argument("--client", metavar="SOCKET", help="run as a thin station client instead")
+    ap.add_argument("--camera", type=int, default=0, help="webcam index for --client")
+    args = ap.parse_args()
+
+    if args.client: run_client(args.client, args.camera)
+    elif args.source: serve(args.source, min(args.workers, len(args.source)), args.show)
+    else: ap.error("give at least one --source (or --client)")
+
+if __name__ == "__main__":
+    main()